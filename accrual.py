@@ -0,0 +1,197 @@
+# accrual.py — month-end interest accrual over ACCOUNTS, in parallel key ranges
+"""
+Usage:
+    python accrual.py                          accrue the last completed month
+    python accrual.py --period 2025-06-30      accrue (or finish accruing) one month end
+    python accrual.py --workers 8 --chunk 5000
+
+Interest is computed in SQL from each account's month-end checkpoint
+(checkpoints.py builds any that are missing first). The accno keyspace is
+cut into --chunk-sized ranges, handed out as contiguous runs to --workers
+threads, and each range is posted by sp_accrue_interest_chunk in its own
+short transaction (migration 0008). Postings carry a per-period reference,
+so an interrupted run is resumed by running the same period again. Runs
+hold a named lock, since the reference is no longer a unique key once the
+ledger is partitioned (migration 0011).
+"""
+import sys
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+import db
+import checkpoints
+
+log = logging.getLogger("financehub.accrual")
+
+DEFAULT_CHUNK = 5000
+DEFAULT_WORKERS = min(4, db.DB_POOL_SIZE + db.DB_POOL_MAX_OVERFLOW - 1)
+LOCK_NAME = "financehub_accrual"
+
+# Every chunk-th accno, in key order: the upper bounds of the ranges.
+BOUNDARIES_SQL = """
+    SELECT accno FROM (
+        SELECT accno, ROW_NUMBER() OVER (ORDER BY accno) AS rn FROM ACCOUNTS
+    ) AS numbered
+    WHERE rn %% %s = 0
+    ORDER BY accno
+"""
+
+
+class AccrualReport:
+    def __init__(self, period_end, workers):
+        self.period_end = period_end
+        self.workers = workers
+        self.chunks = 0
+        self.done_chunks = 0
+        self.accounts = 0
+        self.interest = Decimal("0")
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, accounts, interest):
+        with self._lock:
+            self.done_chunks += 1
+            self.accounts += accounts or 0
+            self.interest += Decimal(interest or 0)
+            self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def accounts_per_sec(self):
+        return self.accounts / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f"{self.period_end}: {self.accounts:,} accounts credited ₹{self.interest:,.2f} "
+                f"in {self.elapsed:.2f}s ({self.accounts_per_sec:,.0f} accounts/sec, "
+                f"{self.chunks} chunks on {self.workers} workers)")
+
+
+def ranges(chunk):
+    """``(after, upto)`` accno ranges of about ``chunk`` accounts covering ACCOUNTS."""
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(BOUNDARIES_SQL, (chunk,))
+            bounds = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT MAX(accno) FROM ACCOUNTS")
+            last = cur.fetchone()[0]
+        conn.rollback()
+    if last is None:
+        return []
+    if not bounds or bounds[-1] != last:
+        bounds.append(last)
+    return list(zip([""] + bounds[:-1], bounds))
+
+
+def _accrue_ranges(period_end, work, report, progress):
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            for after, upto in work:
+                result = cur.callproc("sp_accrue_interest_chunk", (period_end, after, upto, 0, 0))
+                report.add(result[3], result[4])
+                if progress:
+                    progress(report)
+
+
+def _split(items, parts):
+    """``parts`` contiguous slices of ``items``, as even as possible."""
+    size, extra = divmod(len(items), parts)
+    out, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            out.append(items[start:end])
+        start = end
+    return out
+
+
+def _record_run(period_end, status, report=None):
+    if report is None:
+        db.exec_write(
+            "INSERT INTO ACCRUAL_RUNS (period_end, status) VALUES (%s, %s) "
+            "ON DUPLICATE KEY UPDATE status = VALUES(status), started_at = CURRENT_TIMESTAMP, finished_at = NULL",
+            (period_end, status))
+    else:
+        # accounts/interest accumulate over resumed runs of the same period.
+        db.exec_write(
+            "UPDATE ACCRUAL_RUNS SET status=%s, accounts = accounts + %s, interest = interest + %s, "
+            "workers=%s, finished_at = CURRENT_TIMESTAMP WHERE period_end=%s",
+            (status, report.accounts, report.interest, report.workers, period_end))
+
+
+def accrue(period_end, workers=DEFAULT_WORKERS, chunk=DEFAULT_CHUNK, progress=None):
+    """Credit interest for ``period_end`` to every account not yet credited; returns an AccrualReport."""
+    if period_end >= date.today():
+        raise ValueError(f"{period_end} has not ended yet")
+    checkpoints.build_through(period_end, progress=lambda message: log.info(message))
+    # Two runs at once could both find an account not yet credited.
+    with db.get_pool().connection() as lock_conn:
+        with lock_conn.cursor() as cur:
+            cur.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+            if cur.fetchone()[0] != 1:
+                raise RuntimeError("Another accrual run is in progress")
+            try:
+                return _accrue(period_end, workers, chunk, progress)
+            finally:
+                cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                cur.fetchall()
+
+
+def _accrue(period_end, workers, chunk, progress):
+    report = AccrualReport(period_end, workers)
+    work = ranges(chunk)
+    report.chunks = len(work)
+    _record_run(period_end, "RUNNING")
+    status = "FAILED"
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="accrual") as pool:
+            futures = [pool.submit(_accrue_ranges, period_end, part, report, progress)
+                       for part in _split(work, workers)]
+            for future in futures:
+                future.result()
+        status = "DONE"
+    finally:
+        report.elapsed = time.perf_counter() - report.started
+        _record_run(period_end, status, report)
+        db.query_cache.invalidate(db.PROC_TABLES["sp_accrue_interest_chunk"])
+    return report
+
+
+def runs(limit=12):
+    return db.fetch_all("SELECT * FROM ACCRUAL_RUNS ORDER BY period_end DESC LIMIT %s", (limit,), cache=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Credit month-end interest to interest-bearing accounts")
+    parser.add_argument("--period", type=date.fromisoformat, help="month end to accrue (default: last completed)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel key-range workers")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="accounts per transaction")
+    parser.add_argument("--status", action="store_true", help="list recent runs and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.status:
+        for run in runs():
+            print(f"{run['period_end']}  {run['status']:<8} {run['accounts']:>10,} accounts  "
+                  f"₹{run['interest']:>16,.2f}  {run['started_at']} → {run['finished_at'] or '-'}")
+        return
+
+    period_end = args.period or checkpoints.last_completed_month_end()
+    if period_end != checkpoints.month_end(period_end):
+        parser.error(f"{period_end} is not a month end")
+
+    def progress(report):
+        if report.done_chunks % max(1, report.chunks // 20) == 0 or report.done_chunks == report.chunks:
+            print(f"  {report.done_chunks:>6}/{report.chunks} chunks, {report.accounts:,} accounts, "
+                  f"{report.accounts_per_sec:,.0f} accounts/sec", file=sys.stderr)
+
+    report = accrue(period_end, args.workers, args.chunk, progress)
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# amortization.py — vectorized interest, EMI, amortization schedules and loan-book projections
+"""
+Usage:
+    python amortization.py L001                      print one loan's schedule
+    python amortization.py --project --horizon 24    cash flows of the approved book, month by month
+    python amortization.py --verify                  compare simple_interest() with fn_calculate_interest
+    python amortization.py --bench 1000000           time the projection on synthetic loans
+
+Amounts are held as int64 paise, so every figure is exact and rounds the
+way MySQL's ROUND() does on DECIMAL (half away from zero). EMI is the
+reducing-balance instalment P*i*(1+i)^n / ((1+i)^n - 1) for the monthly
+rate i, rounded to the paisa; each month's interest is charged on the
+opening balance and the last instalment clears whatever remains. All
+functions take scalars or equal-length arrays: a whole loan book is
+amortized one instalment at a time across every loan at once.
+"""
+import sys
+import time
+import argparse
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import db
+
+RATE_SCALE = 100                       # rates are DECIMAL(5,2) percentages
+MONTHLY_DIVISOR = 1200 * RATE_SCALE    # paise * rate units / MONTHLY_DIVISOR = one month's interest
+
+LOANS_SQL = """
+    SELECT loan_id, loan_amount, IFNULL(interest_rate, 0), IFNULL(tenure_months, 0), approval_date
+    FROM LOANS WHERE status = %s
+"""
+LOAN_COLUMNS = ("loan_id", "loan_amount", "interest_rate", "tenure_months", "approval_date")
+
+
+# ---------- Fixed-point helpers ----------
+def _paise(rupees):
+    return np.rint(np.asarray(rupees, dtype=np.float64) * 100).astype(np.int64)
+
+
+def _rate_units(rate):
+    return np.rint(np.asarray(rate, dtype=np.float64) * RATE_SCALE).astype(np.int64)
+
+
+def _months(months):
+    return np.asarray(months, dtype=np.int64)
+
+
+def _mul_div(a, b, den):
+    """round(a * b / den) half away from zero for a, b >= 0, without overflowing int64."""
+    q, rem = np.divmod(a, den)
+    return q * b + (rem * b * 2 + den) // (2 * den)
+
+
+def _rupees(paise):
+    result = np.asarray(paise) / 100
+    return result.item() if result.ndim == 0 else result
+
+
+def _emi_paise(principal, rate, months):
+    i = rate / MONTHLY_DIVISOR
+    n = np.maximum(months, 1)
+    growth = np.power(1 + i, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = np.where(i > 0, principal * i * growth / (growth - 1), principal / n)
+    return np.floor(emi + 0.5).astype(np.int64)
+
+
+def _amortize(principal, rate, months, emi):
+    """Step through instalments 1..max(months) of loans sorted by tenure, longest first.
+
+    Yields ``(k, m, interest, repaid, balance)`` where the arrays cover the
+    first ``m`` loans (those still running at instalment ``k``) and
+    ``balance`` is what each owes after paying it.
+    """
+    balance = principal.copy()
+    order_desc = -months
+    for k in range(1, int(months.max(initial=0)) + 1):
+        m = int(np.searchsorted(order_desc, -k, side="right"))
+        if not m:
+            break
+        open_ = balance[:m]
+        # DECIMAL(12,2) balances times DECIMAL(5,2) rates stay far below 2**63.
+        interest = (open_ * rate[:m] * 2 + MONTHLY_DIVISOR) // (2 * MONTHLY_DIVISOR)
+        repaid = np.where(months[:m] == k, open_, np.minimum(np.maximum(emi[:m] - interest, 0), open_))
+        balance[:m] = open_ - repaid
+        yield k, m, interest, repaid, balance[:m]
+
+
+def _by_tenure(*arrays, months):
+    order = np.argsort(-months, kind="stable")
+    return order, [a[order] for a in arrays]
+
+
+# ---------- Per-loan figures ----------
+def simple_interest(principal, rate, months):
+    """principal * rate% * months / 1200, to the paisa; the same as fn_calculate_interest."""
+    p = _paise(principal)
+    return _rupees(_mul_div(p, _rate_units(rate) * _months(months), MONTHLY_DIVISOR))
+
+
+def emi(principal, rate, months):
+    """Monthly instalment of a reducing-balance loan."""
+    return _rupees(_emi_paise(_paise(principal), _rate_units(rate), _months(months)))
+
+
+def outstanding(principal, rate, months, paid):
+    """Principal still owed after ``paid`` instalments (clipped to the tenure)."""
+    p = np.atleast_1d(_paise(principal))
+    r = np.broadcast_to(_rate_units(rate), p.shape)
+    n = np.broadcast_to(_months(months), p.shape)
+    paid = np.clip(np.broadcast_to(_months(paid), p.shape), 0, n)
+    order, (p, r, n, paid) = _by_tenure(p, r, n, paid, months=n)
+    result = p.copy()
+    limit = int(paid.max(initial=0))
+    for k, m, _, _, balance in _amortize(p, r, n, _emi_paise(p, r, n)):
+        if k > limit:
+            break
+        done = paid[:m] == k
+        result[:m][done] = balance[done]
+    unsorted = np.empty_like(result)
+    unsorted[order] = result
+    return _rupees(unsorted if np.ndim(principal) else unsorted[0])
+
+
+def schedule(principal, rate, months, approval_date=None):
+    """Full amortization table for one loan, one row per instalment."""
+    p = _paise([principal])
+    r = _rate_units([rate])
+    n = _months([months])
+    instalment = _emi_paise(p, r, n)
+    rows = []
+    opening = int(p[0])
+    for k, _, interest, repaid, balance in _amortize(p, r, n, instalment):
+        rows.append((k, opening, int(interest[0] + repaid[0]), int(interest[0]), int(repaid[0]), int(balance[0])))
+        opening = int(balance[0])
+    frame = pd.DataFrame(rows, columns=["instalment", "opening", "payment", "interest", "principal", "closing"])
+    for column in ("opening", "payment", "interest", "principal", "closing"):
+        frame[column] = frame[column] / 100
+    if approval_date is not None:
+        first = pd.Period(approval_date, "M") + 1
+        frame.insert(1, "due_month", [str(first + i) for i in range(len(frame))])
+    return frame
+
+
+def instalments_paid(approval_date, months, as_of=None):
+    """Instalments due by ``as_of``: one per month end after the approval month."""
+    as_of = as_of or date.today()
+    if approval_date is None:
+        return 0
+    elapsed = (as_of.year - approval_date.year) * 12 + as_of.month - approval_date.month - 1
+    return max(0, min(int(months or 0), elapsed))
+
+
+# ---------- Portfolio ----------
+def load_loans(status="APPROVED"):
+    """LOANS rows with ``status`` as a DataFrame (one round trip, no read cache)."""
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(LOANS_SQL, (status,))
+            rows = cur.fetchall()
+        conn.rollback()
+    return pd.DataFrame(rows, columns=LOAN_COLUMNS)
+
+
+def project(loans, as_of=None, horizon=12):
+    """Month-by-month cash flows of a loan book from ``as_of``'s month on.
+
+    ``loans`` needs loan_amount, interest_rate, tenure_months and
+    approval_date; the first instalment falls due in the month after
+    approval. Returns one row per month: instalments due, payment,
+    interest, principal and the principal outstanding at month end.
+    """
+    as_of = pd.Timestamp(as_of or date.today())
+    now = as_of.year * 12 + as_of.month - 1
+    approved = pd.to_datetime(loans["approval_date"]).fillna(as_of)
+    base = (approved.dt.year * 12 + approved.dt.month - 1).to_numpy(np.int64) - now
+
+    n = _months(loans["tenure_months"].to_numpy())
+    p = _paise(loans["loan_amount"].to_numpy())
+    r = _rate_units(loans["interest_rate"].to_numpy())
+    keep = n > 0
+    _, (p, r, n, base) = _by_tenure(p[keep], r[keep], n[keep], base[keep], months=n[keep])
+
+    counts = np.zeros(horizon, dtype=np.int64)
+    interest_due = np.zeros(horizon)
+    principal_due = np.zeros(horizon)
+    repaid_before = 0
+    for k, m, interest, repaid, _ in _amortize(p, r, n, _emi_paise(p, r, n)):
+        offset = base[:m] + k
+        past = offset < 0
+        if past.any():
+            repaid_before += int(repaid[past].sum())
+        window = ~past & (offset < horizon)
+        if window.any():
+            slot = offset[window]
+            counts += np.bincount(slot, minlength=horizon)
+            interest_due += np.bincount(slot, weights=interest[window], minlength=horizon)
+            principal_due += np.bincount(slot, weights=repaid[window], minlength=horizon)
+
+    interest_due = np.rint(interest_due).astype(np.int64)
+    principal_due = np.rint(principal_due).astype(np.int64)
+    remaining = int(p.sum()) - repaid_before - np.cumsum(principal_due)
+    months = pd.period_range(pd.Period(as_of, "M"), periods=horizon, freq="M")
+    return pd.DataFrame({
+        "month": months.astype(str),
+        "instalments": counts,
+        "payment": (interest_due + principal_due) / 100,
+        "interest": interest_due / 100,
+        "principal": principal_due / 100,
+        "outstanding": remaining / 100,
+    })
+
+
+def synthetic_loans(count, seed=42, as_of=None):
+    """Random loan book for benchmarks: ``count`` loans approved over the last ten years."""
+    rng = np.random.default_rng(seed)
+    as_of = pd.Timestamp(as_of or date.today())
+    return pd.DataFrame({
+        "loan_amount": np.round(rng.lognormal(12.5, 1.0, count), 2),
+        "interest_rate": rng.choice([7.0, 8.5, 9.0, 9.5, 11.25, 14.0], count),
+        "tenure_months": rng.choice([12, 24, 36, 60, 120, 180, 240, 360], count),
+        "approval_date": as_of - pd.to_timedelta(rng.integers(0, 3650, count), unit="D"),
+    })
+
+
+# ---------- CLI ----------
+def verify():
+    """Compare simple_interest() with fn_calculate_interest over every loan; returns mismatches."""
+    rows = db.fetch_all(
+        "SELECT loan_id, loan_amount, IFNULL(interest_rate, 0) AS interest_rate, "
+        "IFNULL(tenure_months, 0) AS tenure_months, "
+        "fn_calculate_interest(loan_amount, IFNULL(interest_rate, 0), IFNULL(tenure_months, 0)) AS expected "
+        "FROM LOANS", cache=False)
+    if not rows:
+        return []
+    frame = pd.DataFrame(rows)
+    got = _paise(np.atleast_1d(simple_interest(frame["loan_amount"].to_numpy(), frame["interest_rate"].to_numpy(),
+                                               frame["tenure_months"].to_numpy())))
+    expected = _paise(frame["expected"].to_numpy())
+    return list(frame["loan_id"][got != expected])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Loan amortization and portfolio projections")
+    parser.add_argument("loan_id", nargs="?", help="print this loan's schedule")
+    parser.add_argument("--project", action="store_true", help="project the approved loan book")
+    parser.add_argument("--horizon", type=int, default=12, help="months to project")
+    parser.add_argument("--verify", action="store_true", help="check against fn_calculate_interest")
+    parser.add_argument("--bench", type=int, metavar="LOANS", help="project this many synthetic loans")
+    args = parser.parse_args(argv)
+
+    pd.set_option("display.width", 140)
+    if args.loan_id:
+        loan = db.fetch_one("SELECT loan_amount, interest_rate, tenure_months, approval_date FROM LOANS "
+                            "WHERE loan_id=%s", (args.loan_id,), cache=False)
+        if not loan:
+            sys.exit(f"Loan {args.loan_id} not found")
+        print(schedule(loan["loan_amount"], loan["interest_rate"] or 0, loan["tenure_months"] or 0,
+                       loan["approval_date"]).to_string(index=False))
+    if args.verify:
+        mismatches = verify()
+        print(f"{len(mismatches)} loans differ from fn_calculate_interest" +
+              (": " + ", ".join(mismatches[:20]) if mismatches else ""))
+        if mismatches:
+            sys.exit(1)
+    if args.project:
+        started = time.perf_counter()
+        loans = load_loans()
+        loaded = time.perf_counter()
+        print(project(loans, horizon=args.horizon).to_string(index=False))
+        print(f"{len(loans)} loans: loaded in {loaded - started:.2f}s, "
+              f"projected in {time.perf_counter() - loaded:.2f}s")
+    if args.bench:
+        loans = synthetic_loans(args.bench)
+        started = time.perf_counter()
+        result = project(loans, horizon=args.horizon)
+        print(f"{args.bench:,} loans, {int(loans['tenure_months'].max())} instalments max: "
+              f"projected in {time.perf_counter() - started:.2f}s")
+        print(result.head(args.horizon).to_string(index=False))
+    if not (args.loan_id or args.verify or args.project or args.bench):
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
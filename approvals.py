@@ -0,0 +1,147 @@
+# approvals.py — bulk loan approval in set-based chunks
+"""
+Usage:
+    python approvals.py --admin E001                        approve every PENDING loan
+    python approvals.py --admin E001 --loan-type HOME --max-amount 500000 --limit 5000
+    python approvals.py --admin E001 --chunk 200 --dry-run
+
+approve() hands the chosen loan ids to sp_approve_loans_chunk (migration
+0013) --chunk at a time. Each chunk is one transaction: loans no longer
+PENDING are skipped, the rest are approved and their accounts credited
+with one UPDATE ... JOIN. A chunk that hits a deadlock or lock-wait
+timeout is retried like a transfer; one that fails otherwise is rolled
+back, counted as failed and the run moves on. The Loans page's approval
+queue uses the same path.
+"""
+import sys
+import time
+import json
+import random
+import argparse
+from decimal import Decimal
+
+from mysql.connector import Error
+
+import db
+from transfers import RETRYABLE_ERRORS, MAX_RETRIES, BACKOFF_BASE, BACKOFF_MAX
+
+DEFAULT_CHUNK = 500
+
+PENDING_IDS_SQL = """
+    SELECT loan_id FROM LOANS
+    WHERE status = 'PENDING' {filters}
+    ORDER BY loan_id
+    LIMIT %s
+"""
+
+
+class ApprovalReport:
+    def __init__(self, requested):
+        self.requested = requested
+        self.chunks = 0
+        self.approved = 0
+        self.skipped = 0
+        self.failed = 0
+        self.amount = Decimal("0")
+        self.failures = []  # (first loan id of the chunk, chunk size, error)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def loans_per_sec(self):
+        return (self.approved + self.skipped) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f"{self.approved:,} approved (₹{self.amount:,.2f}), {self.skipped:,} skipped, "
+                f"{self.failed:,} failed of {self.requested:,} in {self.elapsed:.2f}s "
+                f"({self.loans_per_sec:,.0f} loans/sec, {self.chunks} chunks)")
+
+
+def pending_ids(loan_type=None, max_amount=None, limit=10_000):
+    """Ids of PENDING loans in loan_id order, optionally of one type and up to an amount."""
+    filters, args = "", []
+    if loan_type:
+        filters += " AND loan_type = %s"
+        args.append(loan_type)
+    if max_amount is not None:
+        filters += " AND loan_amount <= %s"
+        args.append(max_amount)
+    rows = db.fetch_all(PENDING_IDS_SQL.format(filters=filters), args + [limit], cache=False, primary=True)
+    return [row["loan_id"] for row in rows]
+
+
+def _approve_chunk(loan_ids, admin_id):
+    """``(approved, skipped, amount)`` of one chunk, retrying deadlocks and lock-wait timeouts."""
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with db.get_pool().connection() as conn:
+                with conn.cursor() as cur:
+                    result = cur.callproc("sp_approve_loans_chunk", (json.dumps(loan_ids), admin_id, 0, 0, 0))
+                conn.commit()
+                db.record_write(conn)
+            return result[2], result[3], Decimal(result[4] or 0)
+        except Error as e:
+            if e.errno not in RETRYABLE_ERRORS or attempt > MAX_RETRIES:
+                raise
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.5))
+
+
+def approve(loan_ids, admin_id, chunk=DEFAULT_CHUNK, progress=None):
+    """Approve ``loan_ids`` as ``admin_id``, ``chunk`` loans per transaction; returns an ApprovalReport."""
+    if chunk < 1:
+        raise ValueError("Chunk size must be at least 1")
+    loan_ids = list(dict.fromkeys(loan_ids))
+    report = ApprovalReport(len(loan_ids))
+    try:
+        for start in range(0, len(loan_ids), chunk):
+            part = loan_ids[start:start + chunk]
+            report.chunks += 1
+            try:
+                approved, skipped, amount = _approve_chunk(part, admin_id)
+            except Error as e:
+                report.failed += len(part)
+                report.failures.append((part[0], len(part), str(e)))
+            else:
+                report.approved += approved
+                report.skipped += skipped
+                report.amount += amount
+            report.elapsed = time.perf_counter() - report.started
+            if progress:
+                progress(report)
+    finally:
+        report.elapsed = time.perf_counter() - report.started
+        db.query_cache.invalidate(db.PROC_TABLES["sp_approve_loans_chunk"])
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Approve PENDING loans in bulk")
+    parser.add_argument("--admin", required=True, help="PF number recorded as approved_by")
+    parser.add_argument("--loan-type", help="only loans of this type (HOME, AUTO, PERSONAL)")
+    parser.add_argument("--max-amount", type=Decimal, help="only loans up to this amount")
+    parser.add_argument("--limit", type=int, default=10_000, help="most loans to approve in this run")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="loans per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="only count the matching loans")
+    args = parser.parse_args(argv)
+
+    loan_ids = pending_ids(args.loan_type, args.max_amount, args.limit)
+    if args.dry_run:
+        print(f"{len(loan_ids):,} PENDING loans match")
+        return
+
+    def progress(report):
+        print(f"  {report.chunks} chunks, {report.approved:,} approved, {report.skipped:,} skipped, "
+              f"{report.failed:,} failed", file=sys.stderr)
+
+    report = approve(loan_ids, args.admin, args.chunk, progress)
+    print(report.summary())
+    for first, size, error in report.failures:
+        print(f"  chunk from {first} ({size} loans): {error}", file=sys.stderr)
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# assistant.py — intent routing and answers for the Banking Assistant page
+"""
+Every intent's keywords and phrases are compiled into one regular
+expression, rebuilt whenever an intent is registered, so a message is
+routed by a single scan in the regex engine (overlapping matches
+included) plus one dict lookup per hit, however many intents exist.
+Keywords match whole words, with an optional plural "s".
+
+The earliest-registered matching intent wins, so specific intents (live
+balance, recent activity, loan status) are registered before the general
+ones they overlap with. Live intents read the customer's rows through the
+shared read cache in db.py, which is keyed by CIF and dropped on writes;
+static answers are rendered once and memoized.
+
+Answers are shown as HTML (see chat_history.render), so any text that
+users or staff typed is escaped before it goes into one.
+"""
+import re
+import html
+from functools import lru_cache
+
+import db
+import queries
+import amortization
+
+def normalize(keyword):
+    return " ".join(keyword.lower().split())
+
+
+class Intent:
+    __slots__ = ("name", "priority", "handler", "roles")
+
+    def __init__(self, name, priority, handler, roles):
+        self.name = name
+        self.priority = priority
+        self.handler = handler
+        self.roles = roles
+
+    def allows(self, role):
+        return self.roles is None or role in self.roles
+
+
+class IntentRouter:
+    """Keyword and phrase matcher over registered intents."""
+
+    def __init__(self):
+        self.intents = []
+        self.keywords = {}  # normalized keyword -> [Intent], in priority order
+        self.fallback = None
+        self._pattern = None
+
+    def intent(self, name, keywords=(), roles=None):
+        """Register the decorated ``handler(message, user)`` for any of ``keywords``."""
+        def register(handler):
+            intent = Intent(name, len(self.intents), handler, set(roles) if roles else None)
+            self.intents.append(intent)
+            for keyword in keywords:
+                self.keywords.setdefault(normalize(keyword), []).append(intent)
+            self._pattern = None
+            return handler
+        return register
+
+    def default(self, handler):
+        self.fallback = handler
+        return handler
+
+    def pattern(self):
+        if self._pattern is None:
+            # Longest first, so a phrase wins over a keyword it starts with;
+            # the lookahead lets matches overlap ("my loan status").
+            # Words of three letters or fewer take no plural ("hi" is not "his").
+            alternatives = sorted(self.keywords, key=len, reverse=True)
+            body = "|".join(re.escape(k).replace(r"\ ", r"\s+") + ("s?" if len(k) > 3 else "")
+                            for k in alternatives)
+            self._pattern = re.compile(rf"\b(?=({body})\b)")
+        return self._pattern
+
+    def match(self, message, role=None):
+        """The highest-priority intent allowed for ``role`` that ``message`` mentions, or None."""
+        best = None
+        keywords = self.keywords
+        for hit in self.pattern().findall(message.lower()):
+            # Only the longest alternative matches at a position, so a phrase
+            # also counts for the keywords it contains ("loan" in "loan status").
+            for term in (hit,) if hit.isalnum() else (normalize(hit), *hit.split()):
+                intents = keywords.get(term) or keywords.get(term[:-1], ())
+                for intent in intents:
+                    if best is not None and intent.priority >= best.priority:
+                        break
+                    if intent.allows(role):
+                        best = intent
+                        break
+        return best
+
+    def respond(self, message, role=None, user=None):
+        intent = self.match(message, role)
+        if intent is None:
+            return self.fallback(message, user or {})
+        return intent.handler(message, user or {})
+
+
+router = IntentRouter()
+
+
+def respond(message, role=None, user=None):
+    return router.respond(message, role, user)
+
+
+# ---------- Live intents (customers) ----------
+@router.intent("balance", ["balance", "how much money", "how much do i have", "my account"], roles=["customer"])
+def balance_answer(message, user):
+    accounts = db.fetch_all(queries.CUSTOMER_ACCOUNTS, (user["id"],))
+    if not accounts:
+        return "You don't have any accounts yet. Please visit your branch to open one."
+    lines = [f"- **{html.escape(a['accno'])}** ({a['accttype']}): ₹{a['balance'] or 0:,.2f}" for a in accounts]
+    total = sum(a["balance"] or 0 for a in accounts)
+    return "**Your balances:**\n" + "\n".join(lines) + f"\n\n**Total:** ₹{total:,.2f}"
+
+
+@router.intent("recent_transactions",
+               ["recent transaction", "last transaction", "transaction history", "recent activity",
+                "history", "statement", "latest transaction", "my transaction"],
+               roles=["customer"])
+def recent_transactions_answer(message, user, limit=5):
+    rows = db.fetch_all(queries.CUSTOMER_RECENT_TRANSACTIONS, (queries.recent_since(), user["id"]))[:limit]
+    if not rows:
+        return f"There are no transactions on your accounts in the last {queries.RECENT_DAYS} days."
+    lines = [f"- {r['transactiondate']:%d %b %Y} · {html.escape(r['accno'])} · {r['transactiontype']} ₹{r['amount']:,.2f}"
+             for r in rows]
+    return (f"**Your last {len(rows)} transactions:**\n" + "\n".join(lines) +
+            "\n\nThe full history and statements are under 'My Accounts'.")
+
+
+@router.intent("loan_status",
+               ["loan status", "my loan", "loan approved", "loan application", "application status", "my emi"],
+               roles=["customer"])
+def loan_status_answer(message, user):
+    loans = db.fetch_all(queries.CUSTOMER_LOANS, (user["id"],))
+    if not loans:
+        return "You have no loan applications. You can apply from the 'Loans' section."
+    lines = []
+    for loan in loans:
+        line = f"- **{html.escape(loan['loan_id'])}** {html.escape(loan['loan_type'] or '')} ₹{loan['loan_amount']:,.2f}: {loan['status']}"
+        if loan["status"] == "APPROVED" and loan["tenure_months"]:
+            instalment = amortization.emi(loan["loan_amount"], loan["interest_rate"] or 0, loan["tenure_months"])
+            line += f" since {loan['approval_date']}, EMI ₹{instalment:,.2f}"
+        lines.append(line)
+    return "**Your loans:**\n" + "\n".join(lines)
+
+
+# ---------- Static intents ----------
+def static_intent(name, keywords):
+    """Register ``render(first_name)``; answers are memoized per first name."""
+    def register(render):
+        cached = lru_cache(maxsize=1024)(render)
+        router.intent(name, keywords)(lambda message, user: cached(html.escape(user.get("fname") or "Customer")))
+        return cached
+    return register
+
+
+@static_intent("accounts", ["account", "balance", "open account", "account type"])
+def accounts_text(first_name):
+    return """I can help you with account-related questions! Here's what you need to know:
+
+**Account Types:**
+- Savings Account: For regular savings with interest
+- Current Account: For business transactions
+- Recurring Account: For regular monthly deposits
+
+**To check your balance:** Go to the 'My Accounts' section in the dashboard.
+**To open a new account:** Please visit your branch or contact a bank representative."""
+
+
+@static_intent("transactions", ["transaction", "deposit", "withdraw", "withdrawal", "transfer"])
+def transactions_text(first_name):
+    return """For transactions, here's what you can do:
+
+**Deposits & Withdrawals:** Visit the 'Transactions' page to deposit or withdraw money from your accounts.
+
+**Transfers:** Use the 'Transfers' page to move money between accounts. You'll need the recipient's account number.
+
+All transactions are processed securely and appear in your transaction history immediately."""
+
+
+@static_intent("loans", ["loan", "borrow", "credit", "emi"])
+def loans_text(first_name):
+    return """I can help you with loan information:
+
+**Loan Types Available:**
+- Home Loan: For purchasing property
+- Auto Loan: For vehicle purchases
+- Personal Loan: For personal needs
+
+**To apply:** Go to the 'Loans' section and fill out the application form. You'll need to link it to one of your accounts. Your application will be reviewed by our team.
+
+**Interest rates** vary by loan type and tenure. Typical rates range from 8-12% annually."""
+
+
+@static_intent("interest", ["interest", "rate", "calculate"])
+def interest_text(first_name):
+    return """Interest rates vary by account type:
+
+**Savings Account:** Typically 3.5% - 4% per annum
+**Fixed Deposits:** 5% - 7% per annum
+**Loan Interest:** 8% - 12% depending on loan type
+
+You can use the interest calculator in the 'Reports' section to estimate interest for different amounts and tenures."""
+
+
+@static_intent("greeting", ["hello", "hi", "hey", "good morning", "good afternoon"])
+def greeting_text(first_name):
+    return f"""Hello {first_name}! 👋 Welcome to our banking assistant.
+
+I can help you with:
+- Account information and services
+- Transaction guidance
+- Loan applications and information
+- Interest rate calculations
+- General banking queries
+
+What would you like to know about today?"""
+
+
+@static_intent("help", ["help", "what can you", "how can you", "assist"])
+def help_text(first_name):
+    return """I'm here to help you with:
+
+✅ **Accounts** - Information about account types, opening accounts, checking balances
+✅ **Transactions** - How to deposit, withdraw, and transfer money
+✅ **Loans** - Loan types, application process, interest rates
+✅ **Interest Rates** - Current rates and calculations
+✅ **Security** - Account security and best practices
+✅ **Services** - Available banking services and features
+
+Just ask me any question about banking!"""
+
+
+@static_intent("security", ["security", "safe", "secure", "password", "protect"])
+def security_text(first_name):
+    return """Your account security is our top priority:
+
+🔒 **Security Tips:**
+- Never share your password or CIF with anyone
+- Log out after each session
+- Regularly check your transaction history
+- Report any suspicious activity immediately
+- Use strong, unique passwords
+
+**All transactions** are encrypted and monitored for fraud. If you notice any unauthorized activity, please contact us immediately."""
+
+
+@static_intent("about", ["name", "who are you", "what are you"])
+def about_text(first_name):
+    return """I'm your banking assistant! I'm here to help you navigate our bank management system and answer any questions you have about:
+
+- Your accounts and balances
+- Making transactions
+- Applying for loans
+- Understanding our services
+- Banking best practices
+
+Feel free to ask me anything about banking!"""
+
+
+@router.default
+def fallback_answer(message, user):
+    return f"""Thanks for your question! While I can provide general banking information, for specific details about "{html.escape(message)}", I recommend:
+
+1. Checking the relevant section in your dashboard
+2. Contacting a bank representative
+3. Visiting your nearest branch
+
+I can help with:
+- Account information
+- Transaction guidance
+- Loan applications
+- Interest calculations
+- General banking queries
+
+Is there anything else I can help you with?"""
@@ -0,0 +1,55 @@
+# audit_writer.py — flush staged audit rows into AUDIT_LOGS
+"""
+Usage:
+    python audit_writer.py               flush continuously every --interval seconds
+    python audit_writer.py --once        flush what is staged now and exit
+
+Migration 0002 schedules the same flush as a MySQL event. Run this instead
+on servers where event_scheduler is OFF, or with --once before reading
+AUDIT_LOGS in a report that must include the last few seconds.
+"""
+import time
+import logging
+import argparse
+
+from mysql.connector import Error
+
+import db
+
+log = logging.getLogger("financehub.audit_writer")
+
+
+def flush(batch_size=5000):
+    """Move all currently staged audit rows; returns how many were written."""
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            result = cur.callproc("sp_flush_audit_logs", (batch_size, 0))
+            conn.commit()
+    flushed = result[1] or 0
+    if flushed:
+        db.query_cache.invalidate({"AUDIT_LOGS"})
+    return flushed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flush AUDIT_STAGING into AUDIT_LOGS")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between flushes")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows moved per transaction")
+    parser.add_argument("--once", action="store_true", help="flush once and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    while True:
+        try:
+            flushed = flush(args.batch_size)
+            if flushed:
+                log.info("flushed %d audit rows", flushed)
+        except Error as e:
+            log.error("audit flush failed: %s", e)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# auth.py — password hashing and login, with verification on a bounded worker pool
+"""
+Passwords are stored as ``scrypt$<n>$<r>$<p>$<salt>$<hash>`` (base64 salt
+and hash). Rows that still hold a plaintext password from before hashing
+are accepted once and rewritten as a hash, as are hashes made with other
+parameters than the current AUTH_SCRYPT_* settings.
+
+hashlib's scrypt releases the GIL, so verifications run in parallel on a
+thread pool of AUTH_WORKERS threads instead of stalling the Streamlit
+server; callers wait at most AUTH_TIMEOUT seconds for a slot.
+"""
+import os
+import hmac
+import base64
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from mysql.connector import Error
+
+import db
+import queries
+
+log = logging.getLogger("financehub.auth")
+
+# Cost parameters: memory is 128 * n * r bytes per verification (16 MiB at
+# the defaults), time grows linearly with n.
+AUTH_SCRYPT_N = int(os.getenv("AUTH_SCRYPT_N", str(2 ** 14)))
+AUTH_SCRYPT_R = int(os.getenv("AUTH_SCRYPT_R", "8"))
+AUTH_SCRYPT_P = int(os.getenv("AUTH_SCRYPT_P", "1"))
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", str(min(8, os.cpu_count() or 2))))
+AUTH_TIMEOUT = float(os.getenv("AUTH_TIMEOUT", "10"))
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class AuthBusy(Exception):
+    """Raised when no verification slot frees up within AUTH_TIMEOUT."""
+
+
+# ---------- Hashing ----------
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r * p, dklen=KEY_BYTES)
+
+
+def hash_password(password, n=None, r=None, p=None):
+    n, r, p = n or AUTH_SCRYPT_N, r or AUTH_SCRYPT_R, p or AUTH_SCRYPT_P
+    salt = os.urandom(SALT_BYTES)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+
+def is_hashed(stored):
+    return bool(stored) and stored.startswith(SCHEME + "$")
+
+
+def verify_password(password, stored):
+    """Return ``(ok, needs_rehash)`` for a password against a stored value."""
+    if not stored:
+        return False, False
+    if not is_hashed(stored):
+        # Legacy plaintext row: compare in constant time, then upgrade.
+        ok = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        return ok, ok
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), n, r, p)
+    except (ValueError, TypeError):
+        log.warning("Malformed password hash")
+        return False, False
+    ok = hmac.compare_digest(actual, expected)
+    return ok, ok and (n, r, p) != (AUTH_SCRYPT_N, AUTH_SCRYPT_R, AUTH_SCRYPT_P)
+
+
+# ---------- Worker Pool ----------
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+    return _executor
+
+
+def configure(workers=None, n=None, r=None, p=None):
+    """Resize the pool and/or change the cost parameters (benchmarks, tests)."""
+    global _executor, AUTH_WORKERS, AUTH_SCRYPT_N, AUTH_SCRYPT_R, AUTH_SCRYPT_P
+    AUTH_SCRYPT_N, AUTH_SCRYPT_R, AUTH_SCRYPT_P = n or AUTH_SCRYPT_N, r or AUTH_SCRYPT_R, p or AUTH_SCRYPT_P
+    if workers:
+        with _executor_lock:
+            old, _executor = _executor, None
+            AUTH_WORKERS = workers
+        if old is not None:
+            old.shutdown(wait=False)
+
+
+def _run(fn, *args):
+    future = executor().submit(fn, *args)
+    try:
+        return future.result(timeout=AUTH_TIMEOUT)
+    except FutureTimeout:
+        future.cancel()
+        raise AuthBusy("Login service is busy, please try again")
+
+
+def make_hash(password):
+    """Hash a new password on the worker pool."""
+    return _run(hash_password, password)
+
+
+# ---------- Login ----------
+PRINCIPAL_TABLES = {"employee": ("EMPLOYEE", "pfno"), "customer": ("CUSTOMER", "cif")}
+_dummy_hash = None
+
+
+def _dummy():
+    """A hash to verify against for unknown ids, so they cost as much as known ones."""
+    global _dummy_hash
+    if _dummy_hash is None or not _dummy_hash.startswith(f"{SCHEME}${AUTH_SCRYPT_N}${AUTH_SCRYPT_R}${AUTH_SCRYPT_P}$"):
+        _dummy_hash = hash_password(os.urandom(8).hex())
+    return _dummy_hash
+
+
+def _upgrade(kind, user_id, password, old_hash):
+    """Replace a plaintext or weak hash; skipped if the row changed meanwhile."""
+    table, key = PRINCIPAL_TABLES[kind]
+    try:
+        db.exec_write(
+            f"UPDATE {table} SET password_hash=%s WHERE {key}=%s AND password_hash=%s",
+            (hash_password(password), user_id, old_hash),
+        )
+    except Error as e:
+        log.warning("Password rehash for %s %s failed: %s", kind, user_id, e)
+
+
+def authenticate(user_id, password):
+    """Return ``(role, profile)`` for valid credentials, ``(None, None)`` otherwise.
+
+    One round trip fetches the employee and the customer row with this id;
+    as before, an employee id never falls through to a customer login.
+    """
+    # From the primary: a profile or password changed moments ago must count.
+    rows = db.fetch_all(queries.PRINCIPAL_LOOKUP, (user_id, user_id), cache=False, primary=True)
+    if not rows:
+        _run(verify_password, password, _dummy())
+        return None, None
+    principal = min(rows, key=lambda row: row["kind"] != "employee")
+    stored = principal.pop("password_hash")
+    ok, needs_rehash = _run(verify_password, password, stored)
+    if not ok:
+        return None, None
+    if needs_rehash:
+        executor().submit(_upgrade, principal["kind"], user_id, password, stored)
+    return profile(principal)
+
+
+def profile(principal):
+    """``(role, profile)`` as kept in the session, for a ``queries.PRINCIPAL_LOOKUP`` row."""
+    if principal["kind"] == "employee":
+        role = "admin" if (principal["designation"] or "").lower() == "manager" else "employee"
+        return role, {k: principal[k] for k in ("id", "name", "designation")}
+    return "customer", {k: principal[k] for k in ("id", "fname", "lname")}
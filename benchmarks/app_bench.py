@@ -0,0 +1,160 @@
+# benchmarks/app_bench.py — cold start and warm rerun time of every page of the Streamlit app
+"""
+Usage (from the repository root, against a seeded database):
+    python -m benchmarks.app_bench --user E001
+    python -m benchmarks.app_bench --user C001 --reruns 50
+    python -m benchmarks.app_bench --user E001 --ref HEAD~1 --pages "📊 Dashboard,📈 Reports"
+
+Drives app.py headlessly with Streamlit's AppTest, logged in as --user (an
+employee PF number or a customer CIF; no password needed). Every page of
+that user's navigation gets a fresh Python process, in which the bench
+times:
+
+    first run   the first script run, which lands on the Dashboard:
+                importing the app and rendering one page
+    cold        the first visit to the page in that process, including
+                importing its module
+    warm        --reruns further reruns of the page (p50 and max), i.e.
+                what every click on it costs from then on
+
+With --ref, app.py at that git revision (e.g. HEAD~1, the single-file
+app) is measured the same way and shown beside the current tree. Each
+revision runs against the modules of the working tree, so only the app
+layer is compared. Database reads are served from the read cache on warm
+reruns, as they are in the running app.
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def login_as(user_id):
+    """``[role, profile]`` of ``user_id``, as show_login() would store them."""
+    import db
+    import auth
+    import queries
+
+    rows = db.fetch_all(queries.PRINCIPAL_LOOKUP, (user_id, user_id), cache=False, primary=True)
+    if not rows:
+        raise SystemExit(f"No employee or customer {user_id!r}")
+    return list(auth.profile(min(rows, key=lambda row: row["kind"] != "employee")))
+
+
+# ---------- Worker (one fresh process per page) ----------
+def measure(script, session, label, reruns, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    role, profile = session
+    app = AppTest.from_file(script, default_timeout=timeout)
+    app.session_state["role"] = role
+    app.session_state["user"] = profile
+
+    started = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - started
+    nav = app.sidebar.radio[0]
+    if label is None:
+        return {"pages": list(nav.options)}
+    if label not in nav.options:
+        raise SystemExit(f"{label!r} is not in the {role} navigation")
+
+    started = time.perf_counter()
+    nav.set_value(label).run()
+    cold = time.perf_counter() - started
+
+    warm = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        warm.append(time.perf_counter() - started)
+    return {
+        "first_run_ms": first_run * 1000, "cold_ms": cold * 1000,
+        "warm_ms": sorted(w * 1000 for w in warm),
+        "errors": [str(getattr(e, "message", e)) for e in app.exception],
+    }
+
+
+def run_worker(script, session, label, reruns, timeout):
+    """Run ``measure`` in a fresh interpreter, so the first run pays every import."""
+    command = [sys.executable, "-m", "benchmarks.app_bench", "--worker", script, "--session", json.dumps(session),
+               "--reruns", str(reruns), "--timeout", str(timeout)]
+    if label is not None:
+        command += ["--page", label]
+    done = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if done.returncode != 0:
+        raise SystemExit(f"{os.path.basename(script)} {label or ''}: {done.stderr.strip() or done.stdout.strip()}")
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+# ---------- Report ----------
+def git_script(ref):
+    """app.py at ``ref``, written to a temporary file."""
+    source = subprocess.run(["git", "show", f"{ref}:app.py"], cwd=ROOT, capture_output=True, text=True, check=True)
+    f = tempfile.NamedTemporaryFile("w", suffix=".py", prefix="app_", delete=False, encoding="utf-8")
+    with f:
+        f.write(source.stdout)
+    return f.name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold start and rerun time per page of the app")
+    parser.add_argument("--user", help="employee PF number or customer CIF to log in as")
+    parser.add_argument("--session", type=json.loads, help=argparse.SUPPRESS)
+    parser.add_argument("--reruns", type=int, default=20, help="warm reruns per page")
+    parser.add_argument("--pages", help="comma-separated nav labels (default: the user's whole navigation)")
+    parser.add_argument("--ref", help="also measure app.py at this git revision")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds one script run may take")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--page", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.session, args.page, args.reruns, args.timeout)))
+        return
+    if not args.user:
+        parser.error("--user is required")
+    session = login_as(args.user)
+
+    scripts = [("current", os.path.join(ROOT, "app.py"))]
+    if args.ref:
+        scripts.insert(0, (args.ref, git_script(args.ref)))
+    try:
+        if args.pages:
+            pages = [p.strip() for p in args.pages.split(",") if p.strip()]
+        else:
+            pages = run_worker(scripts[-1][1], session, None, 0, args.timeout)["pages"]
+
+        results = {}
+        for name, script in scripts:
+            for label in pages:
+                results[name, label] = r = run_worker(script, session, label, args.reruns, args.timeout)
+                for error in r["errors"]:
+                    print(f"  {name} {label}: {error}")
+    finally:
+        if args.ref:
+            os.unlink(scripts[0][1])
+
+    print(f"\n{'page':<22}{'app.py':<12}{'first run ms':>14}{'cold ms':>10}{'warm p50 ms':>13}{'warm max ms':>13}")
+    for label in pages:
+        for name, _ in scripts:
+            r = results[name, label]
+            warm = r["warm_ms"]
+            print(f"{label:<22}{name:<12}{r['first_run_ms']:>14,.1f}{r['cold_ms']:>10,.1f}"
+                  f"{percentile(warm, 50):>13,.1f}{max(warm, default=0.0):>13,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/assistant_bench.py — intent matching throughput of the Banking Assistant
+"""
+Usage (from the repository root; no database needed):
+    python -m benchmarks.assistant_bench --messages 200000
+    python -m benchmarks.assistant_bench --corpus messages.txt --repeat 5
+
+Routes a corpus of messages (one per line with --corpus, otherwise a seeded
+mix of typical questions, small talk and noise) through assistant.router
+and, for reference, through a substring scan over the same keywords in the
+same priority order, the way the assistant used to match. Reports
+messages/sec and microseconds per message for both, and how many messages
+each routed to every intent.
+"""
+import time
+import random
+import argparse
+from collections import Counter
+
+from assistant import router
+
+TEMPLATES = [
+    "what's my balance", "how much money do I have in my savings account", "show my recent transactions",
+    "I want to see my transaction history please", "is my loan approved yet", "what is my loan status",
+    "how do I transfer money to my friend", "can I withdraw cash today", "what are the deposit rates",
+    "hi", "hello there, good morning!", "what can you do for me", "who are you exactly",
+    "how do I keep my password secure", "calculate interest on 50000 for 12 months",
+    "I would like to open an account", "what EMI will I pay on a home loan",
+    "the app crashed when I clicked the button", "thanks, that's all",
+]
+FILLER = ("please", "quickly", "today", "again", "for my wife", "from last week", "urgently", "asap")
+
+
+def synthetic_corpus(count, seed):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        message = rng.choice(TEMPLATES)
+        if rng.random() < 0.5:
+            message = f"{message} {' '.join(rng.sample(FILLER, rng.randint(1, 3)))}"
+        if rng.random() < 0.3:
+            message = message.upper() if rng.random() < 0.5 else message.capitalize()
+        corpus.append(message)
+    return corpus
+
+
+def substring_matcher():
+    """The old matching strategy over the router's own keywords: one scan per keyword, in order."""
+    chain = []
+    for intent in router.intents:
+        chain.append((intent, [k for k, intents in router.keywords.items() if intent in intents]))
+
+    def match(message, role):
+        text = message.lower()
+        for intent, keywords in chain:
+            if intent.allows(role) and any(word in text for word in keywords):
+                return intent
+        return None
+    return match
+
+
+def run(match, corpus, role, repeat):
+    counts = Counter()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for message in corpus:
+            intent = match(message, role)
+            counts[intent.name if intent else "(fallback)"] += 1
+    return time.perf_counter() - started, counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark assistant intent matching")
+    parser.add_argument("--messages", type=int, default=100000, help="size of the synthetic corpus")
+    parser.add_argument("--corpus", help="file with one message per line instead")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--role", default="customer")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = [line.strip() for line in f if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.messages, args.seed)
+    total = len(corpus) * args.repeat
+
+    results = {}
+    for name, match in (("router", router.match), ("substring", substring_matcher())):
+        elapsed, counts = run(match, corpus, args.role, args.repeat)
+        results[name] = counts
+        print(f"{name:<10} {total:,} messages in {elapsed:.2f}s = {total / elapsed:,.0f}/s "
+              f"({elapsed / total * 1e6:.2f} µs/message)")
+
+    print(f"\n{'intent':<22}{'router':>10}{'substring':>12}")
+    for intent in sorted(set(results["router"]) | set(results["substring"])):
+        print(f"{intent:<22}{results['router'][intent]:>10,}{results['substring'][intent]:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# benchmarks/key_bench.py — insert throughput of random string keys vs time-ordered binary keys
+"""
+Usage (from the repository root, against a scratch database):
+    python -m benchmarks.key_bench --rows 10000000 --threads 4
+    python -m benchmarks.key_bench --rows 20000000 --schemes uuid7 --keep
+
+Creates one table per key scheme shaped like TRANSACTION (the key, accno,
+type, amount, date, and the same two secondary indexes) and fills it with
+--rows rows from --threads writers in --batch-row multi-row INSERTs:
+
+    uuid4   str(uuid.uuid4()) in VARCHAR(36), the old TRANSACTION/TRANSFERS keys
+    uuid7   ids.uuid7() in BINARY(16), the keys since migration 0010
+
+Prints rows/sec for every --report-every rows, so the slowdown once the
+uuid4 index outgrows the buffer pool shows up, then the final table and
+index sizes, buffer-pool reads and pages written during the load, and
+index page splits when innodb_monitor_enable covers index_page_splits.
+The tables are dropped afterwards unless --keep is given.
+"""
+import time
+import uuid
+import random
+import argparse
+import threading
+from datetime import datetime
+
+import db
+import ids
+
+SCHEMES = {
+    "uuid4": ("VARCHAR(36)", lambda: str(uuid.uuid4())),
+    "uuid7": ("BINARY(16)", ids.uuid7),
+}
+TABLE_DDL = """
+    CREATE TABLE {table} (
+      id {key_type} PRIMARY KEY,
+      accno VARCHAR(20) NOT NULL,
+      transactiontype VARCHAR(20) NOT NULL,
+      amount DECIMAL(12,2) NOT NULL,
+      transactiondate TIMESTAMP NOT NULL,
+      KEY idx_acc_date (accno, transactiondate),
+      KEY idx_date (transactiondate)
+    )
+"""
+COUNTERS = ("Innodb_buffer_pool_reads", "Innodb_pages_written")
+
+
+def server_counters(cur):
+    cur.execute("SHOW GLOBAL STATUS WHERE Variable_name IN (%s, %s)", COUNTERS)
+    values = {name: int(value) for name, value in cur.fetchall()}
+    cur.execute("SELECT `COUNT` FROM information_schema.INNODB_METRICS "
+                "WHERE NAME = 'index_page_splits' AND STATUS = 'enabled'")
+    row = cur.fetchone()
+    values["index_page_splits"] = int(row[0]) if row else None
+    return values
+
+
+def load(table, make_key, rows, threads, batch, accounts, report_every):
+    """Insert ``rows`` rows; returns ``(elapsed, [(rows_so_far, interval rows/sec)])``."""
+    sql = (f"INSERT INTO {table} (id, accno, transactiontype, amount, transactiondate) "
+           "VALUES (%s,%s,%s,%s,%s)")
+    lock = threading.Lock()
+    state = {"next": 0, "done": 0, "mark": 0, "mark_at": time.perf_counter()}
+    intervals = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        with db.get_pool().connection() as conn:
+            with conn.cursor() as cur:
+                while True:
+                    with lock:
+                        start = state["next"]
+                        if start >= rows:
+                            return
+                        state["next"] = count = min(rows, start + batch)
+                    values = [(make_key(), f"A{rng.randrange(accounts):07d}",
+                               "DEPOSIT" if rng.random() < 0.55 else "WITHDRAW",
+                               f"{rng.randint(100, 5_000_000) / 100:.2f}", datetime.now())
+                              for _ in range(count - start)]
+                    cur.executemany(sql, values)
+                    conn.commit()
+                    with lock:
+                        state["done"] += len(values)
+                        if state["done"] - state["mark"] >= report_every or state["done"] == rows:
+                            now = time.perf_counter()
+                            rate = (state["done"] - state["mark"]) / (now - state["mark_at"])
+                            intervals.append((state["done"], rate))
+                            print(f"  {state['done']:>12,} rows  {rate:>10,.0f} rows/sec", flush=True)
+                            state["mark"], state["mark_at"] = state["done"], now
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - started, intervals
+
+
+def table_size(cur, table):
+    cur.execute(f"ANALYZE TABLE {table}")
+    cur.fetchall()
+    cur.execute("SELECT data_length, index_length FROM information_schema.TABLES "
+                "WHERE table_schema = DATABASE() AND table_name = %s", (table,))
+    return cur.fetchone()
+
+
+def run_scheme(name, args):
+    key_type, make_key = SCHEMES[name]
+    table = f"bench_keys_{name}"
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {table}")
+            cur.execute(TABLE_DDL.format(table=table, key_type=key_type))
+            before = server_counters(cur)
+
+    print(f"{name}: {key_type} keys, {args.rows:,} rows, {args.threads} writers")
+    elapsed, intervals = load(table, make_key, args.rows, args.threads, args.batch,
+                              args.accounts, args.report_every)
+
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            after = server_counters(cur)
+            data, index = table_size(cur, table)
+            if not args.keep:
+                cur.execute(f"DROP TABLE {table}")
+    delta = {k: (after[k] - before[k]) if after[k] is not None and before[k] is not None else None
+             for k in after}
+    return {
+        "scheme": name, "elapsed": elapsed, "rate": args.rows / elapsed,
+        "last_rate": intervals[-1][1] if intervals else 0.0,
+        "data_mb": data / 2**20, "index_mb": index / 2**20, **delta,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark insert throughput per primary-key scheme")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--threads", type=int, default=4, help="concurrent writers")
+    parser.add_argument("--batch", type=int, default=1000, help="rows per INSERT and commit")
+    parser.add_argument("--accounts", type=int, default=100_000, help="distinct accno values")
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    parser.add_argument("--schemes", default="uuid4,uuid7", help="comma-separated: " + ", ".join(SCHEMES))
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark tables")
+    args = parser.parse_args(argv)
+
+    schemes = [s.strip() for s in args.schemes.split(",") if s.strip()]
+    for name in schemes:
+        if name not in SCHEMES:
+            parser.error(f"unknown scheme {name!r}")
+    db.configure_pool(size=args.threads + 1, max_overflow=0)
+
+    results = [run_scheme(name, args) for name in schemes]
+    print(f"\n{'scheme':<8}{'seconds':>10}{'rows/sec':>12}{'last rows/sec':>15}{'data MB':>10}"
+          f"{'index MB':>10}{'pool reads':>12}{'pages written':>15}{'page splits':>13}")
+    for r in results:
+        splits = "n/a" if r["index_page_splits"] is None else f"{r['index_page_splits']:,}"
+        print(f"{r['scheme']:<8}{r['elapsed']:>10.1f}{r['rate']:>12,.0f}{r['last_rate']:>15,.0f}"
+              f"{r['data_mb']:>10,.0f}{r['index_mb']:>10,.0f}{r['Innodb_buffer_pool_reads']:>12,}"
+              f"{r['Innodb_pages_written']:>15,}{splits:>13}")
+
+
+if __name__ == "__main__":
+    main()
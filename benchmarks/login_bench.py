@@ -0,0 +1,97 @@
+# benchmarks/login_bench.py — logins per second at a given password hashing cost
+"""
+Usage (from the repository root):
+    python -m benchmarks.login_bench --threads 32 --logins 400
+    python -m benchmarks.login_bench --threads 32 --workers 4 --n 32768
+    python -m benchmarks.login_bench --user E001 --password 1234 --threads 16
+
+Without --user only password verification is measured (no database): a
+hash is made once at the chosen cost and --threads callers verify against
+it through the auth worker pool. With --user each login goes through
+auth.authenticate(), i.e. the principal lookup plus verification; the
+first login upgrades a plaintext password, so the rest measure the hash.
+Reports logins/sec, latency percentiles and AuthBusy refusals.
+"""
+import time
+import argparse
+import threading
+
+import auth
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(threads, logins, attempt):
+    latencies, busy, failed = [], [0], [0]
+    lock = threading.Lock()
+    remaining = [logins]
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            started = time.perf_counter()
+            try:
+                ok = attempt()
+            except auth.AuthBusy:
+                with lock:
+                    busy[0] += 1
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    failed[0] += 1
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - started, sorted(latencies), busy[0], failed[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark login throughput")
+    parser.add_argument("--threads", type=int, default=16, help="concurrent callers")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, help="auth worker pool size (default AUTH_WORKERS)")
+    parser.add_argument("--n", type=int, help="scrypt n (default AUTH_SCRYPT_N)")
+    parser.add_argument("--r", type=int, help="scrypt r (default AUTH_SCRYPT_R)")
+    parser.add_argument("--p", type=int, help="scrypt p (default AUTH_SCRYPT_P)")
+    parser.add_argument("--user", help="log in as this user through the database")
+    parser.add_argument("--password", default="bench-password")
+    args = parser.parse_args(argv)
+
+    auth.configure(args.workers, args.n, args.r, args.p)
+    if args.user:
+        def attempt():
+            return auth.authenticate(args.user, args.password)[0] is not None
+        if not attempt():
+            parser.error(f"login as {args.user} failed")
+    else:
+        stored = auth.hash_password(args.password)
+
+        def attempt():
+            return auth._run(auth.verify_password, args.password, stored)[0]
+
+    print(f"scrypt n={auth.AUTH_SCRYPT_N} r={auth.AUTH_SCRYPT_R} p={auth.AUTH_SCRYPT_P}, "
+          f"{auth.AUTH_WORKERS} workers, {args.threads} callers")
+    elapsed, latencies, busy, failed = run(args.threads, args.logins, attempt)
+    done = len(latencies)
+    print(f"{done} logins in {elapsed:.2f}s = {done / elapsed:.1f}/s")
+    print(f"latency ms p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+          f"p99={percentile(latencies, 99):.1f} max={latencies[-1] if latencies else 0:.1f}")
+    print(f"refused (AuthBusy): {busy}, rejected: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# benchmarks/query_bench.py — latency and rows examined for every page's queries
+"""
+Usage (from the repository root, against a scratch database):
+    python -m benchmarks.query_bench --output baseline.json
+    python -m benchmarks.query_bench --sizes tiny,small,medium --output baseline.json
+    python -m benchmarks.query_bench --compare baseline.json --threshold 1.25
+
+Runs the queries behind the dashboard, customer history, transactions,
+reports and audit log pages straight against MySQL (no read cache), each
+--iterations times after a warm-up, and records p50/p95/p99 latency, rows
+returned and rows examined (the session's Handler_read_* counters). With
+--sizes the database is reloaded with datagen.py at each scale first;
+without it the current data is measured under --label. Results are merged
+into the --output JSON by label, so one file holds a baseline per size.
+--compare diffs a run against such a file and exits 1 on a regression.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+import db
+import queries
+import datagen
+
+HANDLER_READS = ("Handler_read_first", "Handler_read_key", "Handler_read_last", "Handler_read_next",
+                 "Handler_read_prev", "Handler_read_rnd", "Handler_read_rnd_next")
+
+
+def _grid(source, columns, key, **options):
+    """First page of a paged_grid listing, as ui.widgets.paged_grid requests it."""
+    return db.page_query(source, columns, key, **options)
+
+
+# page -> [(name, sql, params)]; "cif", "user_id", "since" and "recent" params are sampled per iteration.
+PAGES = {
+    "dashboard": [
+        ("bank_summary", queries.DASHBOARD_SUMMARY, ()),
+        ("accounts_grid", *_grid("ACCOUNTS", {c: c for c in ("accno", "cif", "accttype", "balance")}, "accno")),
+        ("customer_accounts", queries.CUSTOMER_ACCOUNTS, ("cif",)),
+    ],
+    "customer_history": [
+        ("recent_transactions", queries.CUSTOMER_RECENT_TRANSACTIONS, ("recent", "cif")),
+        ("recent_transfers", queries.CUSTOMER_RECENT_TRANSFERS, ("recent", "recent", "cif")),
+        ("loans", queries.CUSTOMER_LOANS, ("cif",)),
+    ],
+    "transactions": [
+        ("recent_transactions", queries.RECENT_TRANSACTIONS, ("recent",)),
+        ("recent_transfers", queries.RECENT_TRANSFERS, ("recent",)),
+    ],
+    "reports": [
+        ("customer_account_join", *_grid(
+            "CUSTOMER c JOIN ACCOUNTS a ON c.cif = a.cif",
+            {"cif": "c.cif", "fname": "c.fname", "accno": "a.accno", "balance": "a.balance"}, "accno")),
+        ("high_value_customers", *_grid(
+            "CUSTOMER", {c: c for c in ("cif", "fname", "lname", "contact_no", "homebranch", "opening_date")},
+            "cif", where=queries.HIGH_VALUE_CUSTOMERS)),
+        ("rollup_freshness", queries.ROLLUP_FRESHNESS, ()),
+        ("account_totals", *_grid("ACCOUNT_LEDGER_TOTALS", queries.ACCOUNT_TOTALS_COLUMNS, "accno")),
+        ("customer_totals", *_grid("CUSTOMER_LEDGER_TOTALS t JOIN CUSTOMER c ON c.cif = t.cif",
+                                   queries.CUSTOMER_TOTALS_COLUMNS, "cif", descending=True)),
+        ("daily_activity", queries.DAILY_ACTIVITY, ("since",)),
+    ],
+    "audit_logs": [
+        ("latest", *_grid("AUDIT_LOGS", queries.AUDIT_LOG_COLUMNS, "logid", sort="timestamp",
+                          descending=True, limit=200, where=queries.AUDIT_RECENT, params=("recent",))),
+        ("by_user", *_grid("AUDIT_LOGS", queries.AUDIT_LOG_COLUMNS, "logid", sort="timestamp",
+                           descending=True, limit=200, where=queries.AUDIT_RECENT, params=("recent",),
+                           filters={"user_id": ("=", "user_id")})),
+    ],
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def handler_reads(cur):
+    cur.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(value) for name, value in cur.fetchall() if name in HANDLER_READS)
+
+
+def samples(cur, seed, count=50):
+    """Customers and audit users to rotate through: the busiest plus a random spread."""
+    cur.execute("""
+        SELECT a.cif FROM ACCOUNTS a JOIN `TRANSACTION` t ON t.accno = a.accno
+        GROUP BY a.cif ORDER BY COUNT(*) DESC LIMIT 5
+    """)
+    cifs = [row[0] for row in cur.fetchall()]
+    cur.execute(f"SELECT cif FROM CUSTOMER ORDER BY RAND({int(seed)}) LIMIT {count}")
+    cifs += [row[0] for row in cur.fetchall()]
+    cur.execute(f"SELECT DISTINCT user_id FROM AUDIT_LOGS ORDER BY timestamp DESC LIMIT {count}")
+    users = [row[0] for row in cur.fetchall()]
+    since = (datetime.now() - timedelta(days=30)).date()
+    return {"cif": cifs or [""], "user_id": users or [""], "since": [since], "recent": [queries.recent_since()]}
+
+
+def table_rows(cur):
+    counts = {}
+    for table in db.TABLES:
+        cur.execute(f"SELECT COUNT(*) FROM `{table}`")
+        counts[table] = cur.fetchone()[0]
+    return counts
+
+
+def measure(iterations=20, warmup=2, seed=42, pages=None):
+    rng = random.Random(seed)
+    results = {}
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            pool = samples(cur, seed)
+            rows = table_rows(cur)
+            before = handler_reads(cur)
+            overhead = handler_reads(cur) - before  # reads caused by SHOW STATUS itself
+            for page, page_queries in PAGES.items():
+                if pages and page not in pages:
+                    continue
+                for name, sql, params in page_queries:
+                    timings, examined, returned = [], [], 0
+                    for i in range(warmup + iterations):
+                        args = [rng.choice(pool[p]) if p in pool else p for p in params]
+                        before = handler_reads(cur)
+                        started = time.perf_counter()
+                        cur.execute(sql, args)
+                        returned = len(cur.fetchall())
+                        elapsed = time.perf_counter() - started
+                        reads = handler_reads(cur) - before - overhead
+                        conn.rollback()
+                        if i >= warmup:
+                            timings.append(elapsed * 1000)
+                            examined.append(max(0, reads))
+                    timings.sort()
+                    examined.sort()
+                    result = results[f"{page}.{name}"] = {
+                        "p50_ms": round(percentile(timings, 50), 3),
+                        "p95_ms": round(percentile(timings, 95), 3),
+                        "p99_ms": round(percentile(timings, 99), 3),
+                        "rows_examined_p50": percentile(examined, 50),
+                        "rows_examined_max": examined[-1] if examined else 0,
+                        "rows_returned": returned,
+                        "iterations": iterations,
+                    }
+                    print(f"{page + '.' + name:<42} p50={result['p50_ms']:>9.2f}ms "
+                          f"p95={result['p95_ms']:>9.2f}ms examined={result['rows_examined_p50']:>10,}")
+            cur.execute("SELECT VERSION()")
+            version = cur.fetchone()[0]
+    return {"server": version, "table_rows": rows, "queries": results,
+            "measured_at": datetime.now().isoformat(timespec="seconds")}
+
+
+def compare(current, baseline, threshold):
+    """Print per-query ratios against a baseline run; returns the regressed query names."""
+    regressions = []
+    for name, now in sorted(current["queries"].items()):
+        then = baseline["queries"].get(name)
+        if not then:
+            print(f"new   {name}")
+            continue
+        ratio = now["p95_ms"] / then["p95_ms"] if then["p95_ms"] else 1.0
+        rows_ratio = (now["rows_examined_p50"] + 1) / (then["rows_examined_p50"] + 1)
+        worse = ratio > threshold or rows_ratio > threshold
+        if worse:
+            regressions.append(name)
+        print(f"{'SLOWER' if worse else 'ok':<6} {name:<42} p95 x{ratio:.2f}  rows examined x{rows_ratio:.2f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the page queries")
+    parser.add_argument("--sizes", help="comma-separated datagen scales to load and measure in turn")
+    parser.add_argument("--label", default="current", help="name of this run when --sizes is not given")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--pages", help="comma-separated subset of: " + ", ".join(PAGES))
+    parser.add_argument("--output", help="merge results into this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio counted as a regression")
+    args = parser.parse_args(argv)
+    pages = set(args.pages.split(",")) if args.pages else None
+
+    runs = {}
+    if args.sizes:
+        for scale in args.sizes.split(","):
+            print(f"== loading {scale} ==")
+            datagen.reset()
+            sizes = datagen.SCALES[scale]
+            datagen.generate(sizes["customers"], sizes["transactions"], seed=args.seed)
+            print(f"== measuring {scale} ==")
+            runs[scale] = measure(args.iterations, args.warmup, args.seed, pages)
+    else:
+        runs[args.label] = measure(args.iterations, args.warmup, args.seed, pages)
+
+    if args.output:
+        try:
+            with open(args.output) as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            document = {"runs": {}}
+        document["runs"].update(runs)
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["runs"]
+        regressions = []
+        for label, run in runs.items():
+            if label not in baseline:
+                print(f"{label}: not in {args.compare}, nothing to compare")
+                continue
+            print(f"== {label} vs {args.compare} ==")
+            regressions += compare(run, baseline[label], args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# benchmarks/transfer_stress.py — hammer a few hot accounts with concurrent transfers
+"""
+Usage (from the repository root, against a scratch database):
+    python -m benchmarks.transfer_stress --threads 16 --transfers 20000 --accounts 4
+
+Creates a throwaway customer with --accounts accounts, runs --transfers
+random transfers between them from --threads workers through
+transfers.transfer(), then checks that no money was created or destroyed
+and no balance went negative. Reports transfers/sec, latency percentiles,
+refusals and deadlock retries. The benchmark customer and everything
+hanging off it are deleted afterwards unless --keep is given.
+"""
+import sys
+import time
+import random
+import argparse
+import threading
+from decimal import Decimal
+
+from mysql.connector import Error
+
+import db
+from transfers import transfer, TransferError
+
+BENCH_CIF = "BENCH_XFER"
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def setup(accounts, opening_balance):
+    accnos = [f"BX{i:06d}" for i in range(accounts)]
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM CUSTOMER WHERE cif=%s", (BENCH_CIF,))
+            cur.execute(
+                "INSERT INTO CUSTOMER (cif, fname, lname, password_hash) VALUES (%s,'Bench','Transfers','-')",
+                (BENCH_CIF,),
+            )
+            cur.executemany(
+                "INSERT INTO ACCOUNTS (accno, cif, accttype, balance, interest_rate) VALUES (%s,%s,'CURRENT',%s,0)",
+                [(accno, BENCH_CIF, opening_balance) for accno in accnos],
+            )
+        conn.commit()
+    return accnos
+
+
+def balances(accnos):
+    placeholders = ",".join(["%s"] * len(accnos))
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT accno, balance FROM ACCOUNTS WHERE accno IN ({placeholders})", accnos)
+            return dict(cur.fetchall())
+
+
+def teardown():
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM CUSTOMER WHERE cif=%s", (BENCH_CIF,))
+        conn.commit()
+
+
+def run(threads, total, accnos, max_amount, seed):
+    latencies, refused, errors, retries = [], [0], [0], [0]
+    lock = threading.Lock()
+    remaining = [total]
+
+    def worker(worker_id):
+        rng = random.Random(seed + worker_id)
+        local_lat, local_refused, local_errors, local_retries = [], 0, 0, 0
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            src, dst = rng.sample(accnos, 2)
+            amount = Decimal(rng.randint(1, max_amount * 100)) / 100
+            start = time.perf_counter()
+            try:
+                result = transfer(src, dst, amount)
+                local_retries += result.attempts - 1
+            except TransferError:
+                local_refused += 1
+            except Error:
+                local_errors += 1
+            local_lat.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local_lat)
+            refused[0] += local_refused
+            errors[0] += local_errors
+            retries[0] += local_retries
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - started, sorted(latencies), refused[0], errors[0], retries[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent transfer stress benchmark")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--transfers", type=int, default=10000)
+    parser.add_argument("--accounts", type=int, default=4, help="size of the hot account set")
+    parser.add_argument("--opening-balance", type=int, default=100000)
+    parser.add_argument("--max-amount", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="leave the benchmark rows in place")
+    args = parser.parse_args(argv)
+    if args.accounts < 2:
+        parser.error("--accounts must be at least 2")
+
+    db.configure_pool(size=args.threads, max_overflow=2)
+    accnos = setup(args.accounts, args.opening_balance)
+    try:
+        before = balances(accnos)
+        elapsed, lat, refused, errors, retries = run(
+            args.threads, args.transfers, accnos, args.max_amount, args.seed)
+        after = balances(accnos)
+    finally:
+        if not args.keep:
+            teardown()
+
+    done = len(lat)
+    print(f"threads={args.threads} hot_accounts={args.accounts} transfers={done}")
+    print(f"throughput : {done / elapsed:,.0f} transfers/sec ({elapsed:.2f}s)")
+    print(f"latency ms : p50={percentile(lat, 50) * 1000:.1f} "
+          f"p95={percentile(lat, 95) * 1000:.1f} p99={percentile(lat, 99) * 1000:.1f} "
+          f"max={lat[-1] * 1000 if lat else 0:.1f}")
+    print(f"refused    : {refused} (insufficient funds)")
+    print(f"retries    : {retries} (deadlock / lock wait)")
+    print(f"errors     : {errors}")
+
+    total_before, total_after = sum(before.values()), sum(after.values())
+    negative = [a for a, b in after.items() if b < 0]
+    ok = total_before == total_after and not negative and not errors
+    print(f"conserved  : {total_before} -> {total_after} {'OK' if total_before == total_after else 'MISMATCH'}")
+    if negative:
+        print(f"negative balances: {', '.join(negative)}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# bulk_ingest.py — post deposits and withdrawals from a CSV file in chunked transactions
+"""
+Usage:
+    python bulk_ingest.py FILE.csv [--batch-size 1000] [--maker E001] [--errors failed.csv]
+
+The file needs the columns accno, type (DEPOSIT or WITHDRAW) and amount;
+checkerid is optional. Rows are streamed, never loaded all at once. Each
+chunk locks its accounts in one SELECT ... FOR UPDATE, rejects unknown
+accounts and overdrafts up front against the locked balances, and inserts
+the rest with one executemany, so a bad row is reported without aborting
+the batch. Chunks shrink below --batch-size when one takes longer than
+BULK_MAX_CHUNK_SECONDS, so no transaction holds its account locks (or the
+rollup high-water mark) for long.
+"""
+import io
+import os
+import csv
+import sys
+import time
+import argparse
+from decimal import Decimal, InvalidOperation
+
+from mysql.connector import Error
+
+import db
+import ids
+
+DEFAULT_BATCH_SIZE = 1000
+# Longest a chunk's transaction should stay open; later chunks are sized
+# from the rows/sec of the last one to take about half of it.
+MAX_CHUNK_SECONDS = float(os.getenv("BULK_MAX_CHUNK_SECONDS", "10"))
+TYPE_ALIASES = {"DEPOSIT": "DEPOSIT", "WITHDRAW": "WITHDRAW", "WITHDRAWAL": "WITHDRAW"}
+
+INSERT_SQL = (
+    "INSERT INTO `TRANSACTION` (transactionid, accno, transactiontype, amount, makerid, checkerid) "
+    "VALUES (%s,%s,%s,%s,%s,%s)"
+)
+
+
+class IngestReport:
+    def __init__(self):
+        self.total = 0
+        self.inserted = 0
+        self.failures = []  # (line, accno, reason)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def failed(self):
+        return len(self.failures)
+
+    @property
+    def rows_per_sec(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def fail(self, line, accno, reason):
+        self.failures.append((line, accno, reason))
+
+    def summary(self):
+        return (f"{self.total} rows: {self.inserted} inserted, {self.failed} failed "
+                f"in {self.elapsed:.2f}s ({self.rows_per_sec:,.0f} rows/sec)")
+
+
+def parse_rows(fileobj, report):
+    """Yield ``(line, accno, type, amount, checkerid)`` for well-formed rows."""
+    reader = csv.DictReader(fileobj)
+    missing = {"accno", "type", "amount"} - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+    for line, row in enumerate(reader, start=2):
+        report.total += 1
+        accno = (row.get("accno") or "").strip()
+        ttype = TYPE_ALIASES.get((row.get("type") or "").strip().upper())
+        try:
+            amount = Decimal((row.get("amount") or "").strip())
+        except InvalidOperation:
+            amount = None
+        if not accno:
+            report.fail(line, accno, "missing accno")
+        elif ttype is None:
+            report.fail(line, accno, f"unknown type {row.get('type')!r}")
+        elif amount is None or amount <= 0:
+            report.fail(line, accno, f"invalid amount {row.get('amount')!r}")
+        else:
+            yield line, accno, ttype, amount.quantize(Decimal("0.01")), (row.get("checkerid") or "").strip() or None
+
+
+def _chunks(rows, size):
+    """Group ``rows`` into lists of ``size()`` rows, asking again after each one."""
+    chunk, limit = [], size()
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= limit:
+            yield chunk
+            chunk, limit = [], size()
+    if chunk:
+        yield chunk
+
+
+def _post_chunk(conn, chunk, maker_id, report):
+    accnos = sorted({accno for _, accno, _, _, _ in chunk})
+    placeholders = ",".join(["%s"] * len(accnos))
+    with conn.cursor() as cur:
+        # Lock in accno order so concurrent ingests cannot deadlock each other.
+        cur.execute(
+            f"SELECT accno, balance FROM ACCOUNTS WHERE accno IN ({placeholders}) ORDER BY accno FOR UPDATE",
+            accnos,
+        )
+        balances = {accno: balance or Decimal("0") for accno, balance in cur.fetchall()}
+
+        accepted = []
+        for line, accno, ttype, amount, checker in chunk:
+            if accno not in balances:
+                report.fail(line, accno, "account not found")
+            elif ttype == "WITHDRAW" and balances[accno] < amount:
+                report.fail(line, accno, "Insufficient funds for withdrawal")
+            else:
+                balances[accno] += amount if ttype == "DEPOSIT" else -amount
+                accepted.append((line, (ids.uuid7(), accno, ttype, amount, maker_id, checker)))
+
+        if not accepted:
+            conn.commit()
+            return
+        try:
+            cur.executemany(INSERT_SQL, [values for _, values in accepted])
+            conn.commit()
+            report.inserted += len(accepted)
+            return
+        except Error:
+            conn.rollback()
+
+    # Something the pre-checks could not see (e.g. a bad checkerid): retry
+    # the chunk row by row so only the offending rows are rejected.
+    with conn.cursor() as cur:
+        for line, values in accepted:
+            try:
+                cur.execute(INSERT_SQL, values)
+                conn.commit()
+                report.inserted += 1
+            except Error as e:
+                conn.rollback()
+                report.fail(line, values[1], getattr(e, "msg", None) or str(e))
+
+
+def ingest(fileobj, batch_size=DEFAULT_BATCH_SIZE, maker_id=None, progress=None,
+           max_chunk_seconds=MAX_CHUNK_SECONDS):
+    """Post every row of a CSV text stream; returns an ``IngestReport``.
+
+    ``batch_size`` is the largest chunk; smaller ones are used while a
+    chunk of that size would stay open longer than ``max_chunk_seconds``.
+    """
+    report = IngestReport()
+    size = batch_size
+    with db.get_pool().connection() as conn:
+        for chunk in _chunks(parse_rows(fileobj, report), lambda: size):
+            started = time.perf_counter()
+            _post_chunk(conn, chunk, maker_id, report)
+            took = time.perf_counter() - started
+            if took > 0:
+                size = max(1, min(batch_size, int(len(chunk) * max_chunk_seconds / (2 * took))))
+            report.elapsed = time.perf_counter() - report.started
+            if progress:
+                progress(report)
+        db.record_write(conn)
+    report.elapsed = time.perf_counter() - report.started
+    db.query_cache.invalidate(db.written_tables("INSERT INTO `TRANSACTION`"))
+    return report
+
+
+def ingest_upload(data, **kwargs):
+    """Ingest an uploaded file's bytes (Streamlit's UploadedFile)."""
+    return ingest(io.TextIOWrapper(data, encoding="utf-8-sig", newline=""), **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-post deposits and withdrawals from CSV")
+    parser.add_argument("file", help="CSV with accno,type,amount[,checkerid] ('-' for stdin)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--maker", help="PF number recorded as makerid")
+    parser.add_argument("--errors", help="write failed rows to this CSV")
+    args = parser.parse_args(argv)
+
+    def progress(report):
+        print(f"  {report.total:>10,} rows read, {report.inserted:,} inserted, "
+              f"{report.failed:,} failed, {report.rows_per_sec:,.0f} rows/sec", file=sys.stderr)
+
+    if args.file == "-":
+        report = ingest(sys.stdin, args.batch_size, args.maker, progress)
+    else:
+        with open(args.file, encoding="utf-8-sig", newline="") as f:
+            report = ingest(f, args.batch_size, args.maker, progress)
+
+    print(report.summary())
+    if args.errors and report.failures:
+        with open(args.errors, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["line", "accno", "reason"])
+            writer.writerows(report.failures)
+    sys.exit(1 if report.failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# chat_history.py — bounded in-session chat window, persisted to CHAT_HISTORY in batches
+"""
+A ChatHistory lives in st.session_state for one customer. It holds at most
+CHAT_WINDOW recent turns in a ring buffer plus up to CHAT_EARLIER_MAX turns
+paged back in with "show earlier", so memory per session and the work per
+rerun stay constant however long the conversation runs. New turns are
+written to CHAT_HISTORY CHAT_FLUSH_BATCH at a time (one executemany), and
+whatever is still pending on logout or clear is flushed then.
+"""
+import os
+import html
+from collections import deque
+from datetime import datetime, timedelta
+
+import db
+
+CHAT_WINDOW = int(os.getenv("CHAT_WINDOW", "40"))
+CHAT_FLUSH_BATCH = int(os.getenv("CHAT_FLUSH_BATCH", "10"))
+CHAT_PAGE = int(os.getenv("CHAT_PAGE", "20"))
+CHAT_EARLIER_MAX = int(os.getenv("CHAT_EARLIER_MAX", "200"))
+
+INSERT_SQL = "INSERT INTO CHAT_HISTORY (cif, role, content, created_at) VALUES (%s,%s,%s,%s)"
+EARLIER_SQL = """
+    SELECT role, content, created_at
+    FROM CHAT_HISTORY
+    WHERE cif = %s AND created_at < %s
+    ORDER BY created_at DESC
+    LIMIT %s
+"""
+
+
+def render(role, content):
+    """One turn as the chat bubble markup; user text is escaped here, answers by assistant.py."""
+    if role == "user":
+        return f"<div class='chat-message user-message'><b>You:</b> {html.escape(content)}</div>"
+    return f"<div class='chat-message bot-message'><b>🤖:</b> {content}</div>"
+
+
+class ChatHistory:
+    def __init__(self, cif, window=CHAT_WINDOW, batch=CHAT_FLUSH_BATCH):
+        self.cif = cif
+        self.batch = batch
+        self.recent = deque(maxlen=window)            # (created_at, markup)
+        self.earlier = deque(maxlen=CHAT_EARLIER_MAX)  # oldest first
+        self.pending = []                              # INSERT_SQL rows not yet stored
+        self.exhausted = False
+        self._last = None
+
+    def __len__(self):
+        return len(self.earlier) + len(self.recent)
+
+    @property
+    def full(self):
+        return len(self.earlier) >= self.earlier.maxlen
+
+    def append(self, role, content):
+        created_at = datetime.now()
+        if self._last is not None and created_at <= self._last:
+            created_at = self._last + timedelta(microseconds=1)
+        self._last = created_at
+        if self.earlier and len(self.recent) == self.recent.maxlen:
+            # Keep the paged-in turns contiguous with the window.
+            self.earlier.append(self.recent[0])
+        self.recent.append((created_at, render(role, content)))
+        self.pending.append((self.cif, role, content, created_at))
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        """Write pending turns in one batch; returns how many were written."""
+        if not self.pending:
+            return 0
+        rows, self.pending = self.pending, []
+        try:
+            db.exec_many(INSERT_SQL, rows)
+        except Exception:
+            # Keep the turns for the next flush.
+            self.pending = rows + self.pending
+            raise
+        return len(rows)
+
+    def oldest(self):
+        if self.earlier:
+            return self.earlier[0][0]
+        if self.recent:
+            return self.recent[0][0]
+        return datetime.now()
+
+    def load_earlier(self, count=CHAT_PAGE):
+        """Page up to ``count`` stored turns in before the oldest one shown; returns how many.
+
+        Nothing more is loaded once CHAT_EARLIER_MAX turns are paged in.
+        """
+        self.flush()
+        count = min(count, self.earlier.maxlen - len(self.earlier))
+        if count <= 0:
+            return 0
+        rows = db.fetch_all(EARLIER_SQL, (self.cif, self.oldest(), count), cache=False)
+        for row in rows:
+            self.earlier.appendleft((row["created_at"], render(row["role"], row["content"])))
+        self.exhausted = len(rows) < count
+        return len(rows)
+
+    def clear(self, forget=False):
+        """Empty the window; ``forget`` also deletes the customer's stored history."""
+        if forget:
+            self.pending = []
+            db.exec_write("DELETE FROM CHAT_HISTORY WHERE cif=%s", (self.cif,))
+        else:
+            self.flush()
+        self.recent.clear()
+        self.earlier.clear()
+        self.exhausted = forget
+
+    def markup(self):
+        """The whole visible conversation as one HTML block."""
+        turns = [m for _, m in self.earlier] + [m for _, m in self.recent]
+        return "<div class='chat-container'>" + "".join(turns) + "</div>"
@@ -0,0 +1,107 @@
+# checkpoints.py — build month-end balance checkpoints incrementally
+"""
+Usage:
+    python checkpoints.py                     build every missing month end up to last month
+    python checkpoints.py --through 2025-06-30
+    python checkpoints.py --rebuild 2025-06-30   recompute one period end
+
+Run it from cron shortly after each month end. Each period end is built by
+sp_build_balance_checkpoints in its own transaction, rolling the previous
+checkpoint forward by that month's ledger rows only. The first run anchors
+every account on its live balance at the latest completed month end;
+history before that is answered by walking back from the first checkpoint.
+"""
+import sys
+import time
+import argparse
+from datetime import date, datetime, timedelta
+
+import db
+
+
+def month_end(day):
+    """Last day of the month ``day`` falls in."""
+    first_of_next = (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return first_of_next - timedelta(days=1)
+
+
+def last_completed_month_end(today=None):
+    today = today or date.today()
+    return today.replace(day=1) - timedelta(days=1)
+
+
+def pending_periods(last_built, through):
+    """Month ends after ``last_built`` up to ``through``; just ``through`` on a first build."""
+    if last_built is None:
+        return [through]
+    periods, current = [], month_end(last_built + timedelta(days=1))
+    while current <= through:
+        periods.append(current)
+        current = month_end(current + timedelta(days=1))
+    return periods
+
+
+def build(period_end):
+    """Build the checkpoints for one period end; returns the number of accounts written."""
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            # Consistent, non-locking reads: the builder must not hold up postings.
+            cur.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            try:
+                result = cur.callproc("sp_build_balance_checkpoints", (period_end, 0))
+                conn.commit()
+            finally:
+                cur.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+    return result[1]
+
+
+def build_through(through=None, progress=print):
+    through = through or last_completed_month_end()
+    last_built = db.fetch_one("SELECT MAX(period_end) AS last FROM BALANCE_CHECKPOINTS", cache=False)
+    periods = pending_periods(last_built["last"] if last_built else None, through)
+    if not periods:
+        progress(f"Checkpoints are up to date through {through}.")
+    for period_end in periods:
+        started = time.perf_counter()
+        accounts = build(period_end)
+        progress(f"{period_end}: {accounts} accounts in {time.perf_counter() - started:.2f}s")
+    return periods
+
+
+# ---------- Lookups ----------
+def balance_asof(accno, when):
+    """Balance of ``accno`` including every movement up to ``when`` (date or datetime)."""
+    if not isinstance(when, datetime):
+        when = datetime.combine(when, datetime.max.time().replace(microsecond=0))
+    return db.call_scalar_function("SELECT fn_get_balance_asof(%s, %s)", (accno, when))
+
+
+def statement_balances(accno, start, end):
+    """Opening balance (before ``start``) and closing balance (end of ``end``) for a statement."""
+    opening = balance_asof(accno, datetime.combine(start, datetime.min.time()) - timedelta(seconds=1))
+    return opening, balance_asof(accno, end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build month-end balance checkpoints")
+    parser.add_argument("--through", type=date.fromisoformat,
+                        help="last period end to build (default: end of last month)")
+    parser.add_argument("--rebuild", type=date.fromisoformat, metavar="PERIOD_END",
+                        help="recompute the checkpoints of one period end")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        if args.rebuild != month_end(args.rebuild):
+            parser.error("--rebuild takes a month-end date")
+        print(f"{args.rebuild}: {build(args.rebuild)} accounts")
+        return
+    through = args.through or last_completed_month_end()
+    if through != month_end(through):
+        through = last_completed_month_end(through)
+    if through >= date.today():
+        sys.exit(f"{through} has not ended yet")
+    build_through(through)
+
+
+if __name__ == "__main__":
+    main()
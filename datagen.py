@@ -0,0 +1,410 @@
+# datagen.py — deterministic synthetic bank data at production scale
+"""
+Usage:
+    python datagen.py --scale medium [--seed 42] [--end 2025-06-30]
+    python datagen.py --customers 50000 --transactions 5000000 [--transfers 1500000]
+    python datagen.py --drop
+
+Fills CUSTOMER, EMPLOYEE, ACCOUNTS, TRANSACTION, TRANSFERS, LOANS and
+AUDIT_LOGS. The same seed, sizes and --end always produce the same rows.
+Activity per account follows a power law (a handful of accounts carry a
+large share of the ledger), amounts are log-normal, and the history is
+spread over --years up to --end and replayed in time order, so no balance
+ever goes negative.
+
+Generated keys carry a G prefix (GC..., GA..., GT...) so they sit next to
+the DBMSmini.sql seed rows; ledger rows carry it in `reference` and get a
+UUIDv7 key dated like the row. --drop deletes them again, archived ones
+too. Monthly partitions are created back to the start of the history
+first. Rows are written as multi-row INSERTs with foreign-key checks and
+the per-row triggers switched off for the session (migrations/0005), and
+ACCOUNTS are written last with their final balances; BANK_SUMMARY, table
+statistics and balance checkpoints are then brought up to date in one pass.
+"""
+import math
+import time
+import random
+import argparse
+from bisect import bisect
+from itertools import accumulate
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import db
+import ids
+import partitions
+import checkpoints
+
+SCALES = {
+    "tiny": {"customers": 1_000, "transactions": 50_000},
+    "small": {"customers": 10_000, "transactions": 1_000_000},
+    "medium": {"customers": 100_000, "transactions": 10_000_000},
+    "large": {"customers": 1_000_000, "transactions": 50_000_000},
+}
+TRANSFER_RATIO = 0.3      # TRANSFERS rows per TRANSACTION row
+LOAN_RATIO = 0.15         # LOANS rows per customer
+CUSTOMERS_PER_EMPLOYEE = 2000
+BATCH_ROWS = 5000
+DELETE_CHUNK = 50000
+
+FIRST_NAMES = ["Ajay", "Megha", "Rahul", "Sneha", "Kiran", "Priya", "Vikram", "Aman", "Nikita", "Arjun",
+               "Divya", "Rohan", "Ananya", "Suresh", "Lakshmi", "Farhan", "Isha", "Manoj", "Pooja", "Tarun"]
+LAST_NAMES = ["Venkatesh", "Rao", "Shetty", "Patil", "Naik", "Sharma", "Singh", "Gupta", "Menon", "Iyer",
+              "Reddy", "Kulkarni", "Hegde", "Khan", "Das", "Joshi", "Nair", "Pillai", "Bhat", "Kamath"]
+CITIES = ["Bangalore", "Mysore", "Mangalore", "Hubli", "Belgaum", "Udupi", "Delhi", "Mumbai", "Chennai", "Pune"]
+BRANCHES = ["Indiranagar", "Jayanagar", "HSR", "Malleshwaram", "Koramangala", "Whitefield", "Basavanagudi"]
+ACCOUNT_TYPES = [("SAVINGS", 3.5, 0.70), ("CURRENT", 2.5, 0.25), ("RECURRING", 6.0, 0.05)]
+LOAN_TYPES = [("HOME", 8.5, 240), ("PERSONAL", 12.0, 36), ("AUTO", 9.5, 60), ("EDUCATION", 10.0, 120)]
+DESIGNATIONS = ["Clerk", "Cashier", "Clerk", "Cashier", "Loan Officer", "Auditor", "Clerk", "Cashier",
+                "Loan Officer", "Manager"]
+
+# (table, key column, generated key prefix), children before parents.
+GENERATED = [
+    ("AUDIT_LOGS", "logid", "LGG"),
+    ("AUDIT_LOGS_ARCHIVE", "logid", "LGG"),
+    ("BALANCE_CHECKPOINTS", "accno", "GA"),
+    ("LOANS", "loan_id", "GL"),
+    ("TRANSFERS", "reference", "GX"),
+    ("TRANSFERS_ARCHIVE", "reference", "GX"),
+    ("TRANSACTION", "reference", "GT"),
+    ("TRANSACTION_ARCHIVE", "reference", "GT"),
+    ("ACCOUNTS", "accno", "GA"),
+    ("CUSTOMER", "cif", "GC"),
+    ("EMPLOYEE", "pfno", "GE"),
+]
+
+INSERTS = {
+    "CUSTOMER": ("cif", "fname", "lname", "address", "contact_no", "identification_no", "birthdate",
+                 "gender", "password_hash", "homebranch", "opening_date"),
+    "EMPLOYEE": ("pfno", "empname", "designation", "password_hash", "joining_date", "address"),
+    "ACCOUNTS": ("accno", "cif", "accttype", "balance", "interest_rate", "opening_date", "facility"),
+    "TRANSACTION": ("transactionid", "reference", "accno", "transactiontype", "amount", "transactiondate",
+                    "makerid", "checkerid"),
+    "TRANSFERS": ("transferid", "reference", "from_accno", "to_accno", "amount", "transferdate"),
+    "LOANS": ("loan_id", "cif", "accno", "loan_amount", "loan_type", "interest_rate", "tenure_months",
+              "approval_date", "status", "approved_by"),
+    "AUDIT_LOGS": ("logid", "user_id", "user_type", "action", "ip_address", "user_agent", "timestamp",
+                   "status_code"),
+}
+
+
+def money(cents):
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+class BulkWriter:
+    """Buffers rows per table and writes them as multi-row INSERTs, one commit per batch."""
+
+    def __init__(self, conn, batch_rows=BATCH_ROWS):
+        self.conn = conn
+        self.batch_rows = batch_rows
+        self.buffers = {table: [] for table in INSERTS}
+        self.counts = Counter()
+
+    def add(self, table, row):
+        buf = self.buffers[table]
+        buf.append(row)
+        if len(buf) >= self.batch_rows:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for name in [table] if table else list(self.buffers):
+            rows = self.buffers[name]
+            if not rows:
+                continue
+            columns = INSERTS[name]
+            sql = (f"INSERT INTO `{name}` ({', '.join(columns)}) "
+                   f"VALUES ({', '.join(['%s'] * len(columns))})")
+            with self.conn.cursor() as cur:
+                cur.executemany(sql, rows)
+            self.conn.commit()
+            self.counts[name] += len(rows)
+            self.buffers[name] = []
+
+
+class Generator:
+    def __init__(self, customers, transactions, transfers, seed=42, end=None, years=3,
+                 skew=1.1, audit_ratio=1.0):
+        self.rng = random.Random(seed)
+        self.customers = customers
+        self.transactions = transactions
+        self.transfers = transfers
+        self.end = datetime.combine(end or date.today(), datetime.min.time())
+        self.start = self.end - timedelta(days=365 * years)
+        self.skew = skew
+        self.audit_ratio = audit_ratio
+        self.log_seq = 0
+
+    def audit(self, out, user_id, user_type, action, when):
+        if self.audit_ratio >= 1 or self.rng.random() < self.audit_ratio:
+            self.log_seq += 1
+            out.add("AUDIT_LOGS", (f"LGG{self.log_seq:017d}", user_id, user_type, action,
+                                   "127.0.0.1", "System", when, "200"))
+
+    def amount(self, median, sigma=1.0, cap=10_000_000):
+        """Log-normal amount in cents around ``median`` rupees."""
+        return max(100, min(cap * 100, int(self.rng.lognormvariate(math.log(median * 100), sigma))))
+
+    # ---------- People ----------
+    def make_employees(self, out):
+        rng = self.rng
+        count = max(10, self.customers // CUSTOMERS_PER_EMPLOYEE)
+        self.makers, self.approvers = [], []
+        for i in range(count):
+            pfno = f"GE{i:06d}"
+            designation = DESIGNATIONS[i % len(DESIGNATIONS)]
+            joined = (self.start - timedelta(days=rng.randint(0, 3650))).date()
+            out.add("EMPLOYEE", (pfno, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                                 designation, "abcd", joined, rng.choice(CITIES)))
+            (self.approvers if designation in ("Manager", "Loan Officer") else self.makers).append(pfno)
+
+    def make_customers(self, out):
+        rng = self.rng
+        self.accounts = []  # (accno, cif, accttype, rate, opening_date, facility)
+        for i in range(self.customers):
+            cif = f"GC{i:08d}"
+            opened = (self.start - timedelta(days=rng.randint(0, 5 * 365))).date()
+            out.add("CUSTOMER", (
+                cif, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(CITIES),
+                f"9{rng.randint(0, 999_999_999):09d}", f"GID{i:08d}",
+                date(rng.randint(1950, 2005), rng.randint(1, 12), rng.randint(1, 28)),
+                rng.choice("MF"), "1234", rng.choice(BRANCHES), opened,
+            ))
+            for _ in range(1 + (rng.random() < 0.45) + (rng.random() < 0.15)):
+                roll, acc_type = rng.random(), ACCOUNT_TYPES[-1]
+                for candidate in ACCOUNT_TYPES:
+                    if roll < candidate[2]:
+                        acc_type = candidate
+                        break
+                    roll -= candidate[2]
+                acc_opened = opened + timedelta(days=rng.randint(0, max(0, (self.start.date() - opened).days)))
+                self.accounts.append((f"GA{len(self.accounts):09d}", cif, acc_type[0], acc_type[1],
+                                      acc_opened, rng.choice(["ATM", "NetBanking"])))
+
+    # ---------- Ledger ----------
+    def make_loans(self):
+        """Loan rows plus the time-ordered credits of the approved ones."""
+        rng = self.rng
+        span = (self.end - self.start).total_seconds()
+        loans, credits = [], []
+        for i in range(int(self.customers * LOAN_RATIO)):
+            index = rng.randrange(len(self.accounts))
+            accno, cif = self.accounts[index][:2]
+            loan_type, rate, tenure = rng.choice(LOAN_TYPES)
+            amount = self.amount(300_000, 0.8)
+            roll = rng.random()
+            status = "APPROVED" if roll < 0.7 else "PENDING" if roll < 0.9 else "REJECTED"
+            approved_on = approver = None
+            if status == "APPROVED":
+                approved_on = (self.start + timedelta(seconds=rng.random() * span)).date()
+                approver = rng.choice(self.approvers)
+                credits.append((approved_on, index, amount, f"GL{i:08d}", approver))
+            loans.append((f"GL{i:08d}", cif, accno, money(amount), loan_type, rate, tenure,
+                          approved_on, status, approver))
+        credits.sort()
+        return loans, credits
+
+    def make_ledger(self, out, balances, credits, progress):
+        rng = self.rng
+        n_accounts = len(self.accounts)
+        ranks = list(range(1, n_accounts + 1))
+        rng.shuffle(ranks)
+        cum = list(accumulate(r ** -self.skew for r in ranks))
+        total_weight = cum[-1]
+
+        def pick():
+            return min(bisect(cum, rng.random() * total_weight), n_accounts - 1)
+
+        txn_seq = 0
+
+        def post(index, kind, cents, when):
+            nonlocal txn_seq
+            txn_seq += 1
+            accno = self.accounts[index][0]
+            checker = rng.choice(self.makers) if rng.random() < 0.5 else None
+            out.add("TRANSACTION", (ids.uuid7_at(when, rng.getrandbits(80)), f"GT{txn_seq:012d}", accno,
+                                    kind, money(cents), when, rng.choice(self.makers), checker))
+            self.audit(out, accno, "Customer", f"Transaction {kind} of amount {money(cents)}", when)
+
+        # Every account opens with a deposit on its opening date.
+        for index, account in enumerate(self.accounts):
+            cents = self.amount(20_000)
+            balances[index] = cents
+            post(index, "DEPOSIT", cents, datetime.combine(account[4], datetime.min.time())
+                 + timedelta(seconds=rng.randint(9 * 3600, 17 * 3600)))
+
+        remaining_txn = max(0, self.transactions - n_accounts)
+        events = remaining_txn + self.transfers
+        span = (self.end - self.start).total_seconds()
+        next_credit, xfer_seq = 0, 0
+        for i in range(events):
+            when = self.start + timedelta(seconds=span * (i + rng.random()) / events)
+            while next_credit < len(credits) and credits[next_credit][0] <= when.date():
+                approved_on, index, cents, loan_id, approver = credits[next_credit]
+                balances[index] += cents
+                self.audit(out, approver, "Employee", f"Approved loan {loan_id}",
+                           datetime.combine(approved_on, datetime.min.time()))
+                next_credit += 1
+
+            src = pick()
+            is_transfer = rng.random() * events < self.transfers
+            if is_transfer and balances[src] >= 100:
+                dst = pick()
+                while dst == src:
+                    dst = rng.randrange(n_accounts)
+                cents = min(self.amount(3_000), balances[src])
+                balances[src] -= cents
+                balances[dst] += cents
+                xfer_seq += 1
+                from_accno, to_accno = self.accounts[src][0], self.accounts[dst][0]
+                out.add("TRANSFERS", (ids.uuid7_at(when, rng.getrandbits(80)), f"GX{xfer_seq:012d}",
+                                      from_accno, to_accno, money(cents), when))
+                self.audit(out, from_accno, "Customer",
+                           f"Transferred ₹{money(cents)} from {from_accno} to {to_accno}", when)
+            else:
+                cents = self.amount(2_500)
+                if rng.random() < 0.45 and balances[src] >= cents:
+                    balances[src] -= cents
+                    post(src, "WITHDRAW", cents, when)
+                else:
+                    balances[src] += cents
+                    post(src, "DEPOSIT", cents, when)
+            if progress and i % 1_000_000 == 0 and i:
+                progress(f"  {i:>12,} / {events:,} ledger events")
+
+        for approved_on, index, cents, _, _ in credits[next_credit:]:
+            balances[index] += cents
+
+    def run(self, conn, progress=print):
+        out = BulkWriter(conn)
+        started = time.perf_counter()
+        self.make_employees(out)
+        self.make_customers(out)
+        out.flush()
+        progress(f"people: {out.counts['CUSTOMER']:,} customers, {out.counts['EMPLOYEE']:,} employees, "
+                 f"{len(self.accounts):,} accounts")
+
+        loans, credits = self.make_loans()
+        balances = [0] * len(self.accounts)
+        self.make_ledger(out, balances, credits, progress)
+        out.flush()
+
+        for index, (accno, cif, accttype, rate, opened, facility) in enumerate(self.accounts):
+            out.add("ACCOUNTS", (accno, cif, accttype, money(balances[index]), rate, opened, facility))
+        for loan in loans:
+            out.add("LOANS", loan)
+        out.flush()
+
+        elapsed = time.perf_counter() - started
+        rows = sum(out.counts.values())
+        progress(", ".join(f"{table} {count:,}" for table, count in out.counts.items()))
+        progress(f"{rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/sec)")
+        return out.counts
+
+
+# ---------- Session ----------
+def bulk_session(conn, enable, skip_checks=True):
+    """Switch the per-row triggers (and, for loading, key checks) off or back on.
+
+    Pooled connections are reused, so callers must switch back in a finally.
+    """
+    with conn.cursor() as cur:
+        if not enable:
+            cur.execute("SET @financehub_bulk_load = NULL, foreign_key_checks = 1, unique_checks = 1")
+        elif skip_checks:
+            cur.execute("SET @financehub_bulk_load = 1, foreign_key_checks = 0, unique_checks = 0")
+        else:
+            cur.execute("SET @financehub_bulk_load = 1")
+
+
+def reconcile(conn, progress=print):
+    """Rebuild what the switched-off triggers would have maintained."""
+    with conn.cursor() as cur:
+        cur.execute("CALL sp_rebuild_bank_summary()")
+        cur.execute("CALL sp_rebuild_daily_rollups()")
+        for table in db.TABLES:
+            cur.execute(f"ANALYZE TABLE `{table}`")
+            cur.fetchall()
+    conn.commit()
+    db.query_cache.clear()
+    progress("BANK_SUMMARY and rollups rebuilt, statistics refreshed")
+
+
+def generated_rows_exist(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM CUSTOMER WHERE cif LIKE 'GC%' LIMIT 1")
+        return cur.fetchone() is not None
+
+
+def drop(conn, progress=print):
+    for table, column, prefix in GENERATED:
+        deleted = 0
+        with conn.cursor() as cur:
+            while True:
+                cur.execute(f"DELETE FROM `{table}` WHERE {column} LIKE %s LIMIT {DELETE_CHUNK}", (prefix + "%",))
+                conn.commit()
+                deleted += cur.rowcount
+                if cur.rowcount < DELETE_CHUNK:
+                    break
+        progress(f"{table}: {deleted:,} generated rows deleted")
+
+
+def generate(customers, transactions, transfers=None, seed=42, end=None, years=3, skew=1.1,
+             audit_ratio=1.0, progress=print):
+    """Load one data set; returns the per-table row counts."""
+    if transfers is None:
+        transfers = int(transactions * TRANSFER_RATIO)
+    gen = Generator(customers, transactions, transfers, seed=seed, end=end, years=years,
+                    skew=skew, audit_ratio=audit_ratio)
+    with db.get_pool().connection() as conn:
+        if generated_rows_exist(conn):
+            raise SystemExit("Generated rows already present; run python datagen.py --drop first.")
+        # Backdated history gets a monthly partition per month, not one big first partition.
+        partitions.ensure(since=gen.start.date(), progress=progress)
+        bulk_session(conn, True)
+        try:
+            counts = gen.run(conn, progress)
+        finally:
+            bulk_session(conn, False)
+        reconcile(conn, progress)
+    checkpoints.build_through(progress=progress)
+    return counts
+
+
+def reset(progress=print):
+    # Foreign keys stay on so app-created rows hanging off generated
+    # accounts are cascaded away rather than orphaned.
+    with db.get_pool().connection() as conn:
+        bulk_session(conn, True, skip_checks=False)
+        try:
+            drop(conn, progress)
+        finally:
+            bulk_session(conn, False)
+        reconcile(conn, progress)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic FinanceHub data")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--customers", type=int, help="override the scale's customer count")
+    parser.add_argument("--transactions", type=int, help="override the scale's TRANSACTION row count")
+    parser.add_argument("--transfers", type=int, help=f"TRANSFERS rows (default {TRANSFER_RATIO} x transactions)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, help="last day of history (default today)")
+    parser.add_argument("--years", type=int, default=3, help="length of the history")
+    parser.add_argument("--skew", type=float, default=1.1, help="power-law exponent of account activity")
+    parser.add_argument("--audit-ratio", type=float, default=1.0, help="AUDIT_LOGS rows per ledger event")
+    parser.add_argument("--drop", action="store_true", help="delete all generated rows and exit")
+    args = parser.parse_args(argv)
+
+    if args.drop:
+        reset()
+        return
+    sizes = SCALES[args.scale]
+    generate(args.customers or sizes["customers"], args.transactions or sizes["transactions"],
+             args.transfers, seed=args.seed, end=args.end, years=args.years, skew=args.skew,
+             audit_ratio=args.audit_ratio)
+
+
+if __name__ == "__main__":
+    main()
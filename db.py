@@ -0,0 +1,1042 @@
+# db.py — pooled MySQL access shared by the Streamlit app and batch tools
+import os
+import re
+import time
+import logging
+import threading
+from itertools import count
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+import mysql.connector
+from mysql.connector import Error
+
+from instrument import metrics, timed
+
+log = logging.getLogger("financehub.db")
+
+# ---------- DB Config ----------
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_USER = os.getenv("DB_USER", "root")
+DB_PASS = os.getenv("DB_PASS", "1234")
+DB_NAME = os.getenv("DB_NAME", "mybank")
+
+# Pool sizing: DB_POOL_SIZE connections are kept open, up to DB_POOL_MAX_OVERFLOW
+# extra ones are opened under load and closed again when returned.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PING_AFTER = int(os.getenv("DB_POOL_PING_AFTER", "30"))
+
+# Read replicas ("host[:port],..."): fetch_one/fetch_all are spread over the
+# healthy ones, writes always go to DB_HOST. A replica is used while its
+# replication threads run and it lags at most DB_REPLICA_MAX_LAG seconds
+# (checked every DB_REPLICA_CHECK_INTERVAL). After a session writes, its
+# reads go to a replica that has applied the write's GTIDs, or wait up to
+# DB_GTID_WAIT seconds for one to, or else stay on the primary.
+DB_REPLICA_HOSTS = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()]
+DB_REPLICA_USER = os.getenv("DB_REPLICA_USER", DB_USER)
+DB_REPLICA_PASS = os.getenv("DB_REPLICA_PASS", DB_PASS)
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+DB_GTID_WAIT = float(os.getenv("DB_GTID_WAIT", "0.5"))
+
+# Read cache: entries live at most QUERY_CACHE_TTL seconds (0 disables the
+# cache) and the least recently used ones are evicted past QUERY_CACHE_SIZE.
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "15"))
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+
+# Fan-out: a page's independent reads run concurrently on DB_FANOUT_WORKERS
+# threads (shared by all sessions); each is given up after DB_READ_TIMEOUT
+# seconds, and the server stops the statement at the same point.
+DB_FANOUT_WORKERS = int(os.getenv("DB_FANOUT_WORKERS", "8"))
+DB_READ_TIMEOUT = float(os.getenv("DB_READ_TIMEOUT", "5"))
+
+
+class PoolExhausted(Error):
+    """Raised when no connection could be checked out within the pool timeout."""
+
+
+class QueryTimeout(Error):
+    """Raised when a read did not finish within its timeout."""
+
+
+# ---------- Connection Pool ----------
+class ConnectionPool:
+    """Thread-safe pool of MySQL connections with bounded overflow.
+
+    Idle connections are reused LIFO so the busiest ones stay warm. A
+    connection that sat idle longer than ``ping_after`` seconds is pinged
+    before it is handed out, and one older than ``recycle`` seconds is
+    replaced, so callers never receive a connection the server already
+    dropped.
+    """
+
+    def __init__(self, size=DB_POOL_SIZE, max_overflow=DB_POOL_MAX_OVERFLOW,
+                 timeout=DB_POOL_TIMEOUT, recycle=DB_POOL_RECYCLE,
+                 ping_after=DB_POOL_PING_AFTER, name="primary", **connect_args):
+        self.name = name
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self._connect_args = connect_args
+        self._idle = deque()  # (conn, created_at, last_used)
+        self._born = {}       # id(conn) -> created_at for checked-out connections
+        self._open = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "connects": 0,
+            "reconnects": 0,
+            "discarded": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "exhausted": 0,
+        }
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self._connect_args)
+        with self._cond:
+            self._stats["connects"] += 1
+        return conn
+
+    def acquire(self):
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        entry = None
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._open < self.size + self.max_overflow:
+                    self._open += 1
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats["exhausted"] += 1
+                    raise PoolExhausted(
+                        msg=f"Connection pool '{self.name}' exhausted "
+                            f"({self._open} open, waited {self.timeout:.1f}s)"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+        now = time.monotonic()
+        try:
+            if entry is None:
+                conn, created = self._connect(), now
+            else:
+                conn, created, last_used = entry
+                if now - created > self.recycle:
+                    self._close_quietly(conn)
+                    conn, created = self._connect(), now
+                elif now - last_used > self.ping_after:
+                    try:
+                        conn.ping(reconnect=False)
+                    except Error:
+                        self._close_quietly(conn)
+                        conn, created = self._connect(), now
+                        with self._cond:
+                            self._stats["reconnects"] += 1
+        except Error:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        waited_for = time.perf_counter() - start
+        with self._cond:
+            self._born[id(conn)] = created
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+            self._stats["wait_time_total"] += waited_for
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited_for)
+        return conn
+
+    def release(self, conn, discard=False):
+        if not discard:
+            try:
+                # Never hand a connection with an open transaction (and its
+                # REPEATABLE READ snapshot) to the next caller.
+                if conn.in_transaction:
+                    conn.rollback()
+            except Error:
+                discard = True
+        with self._cond:
+            created = self._born.pop(id(conn), time.monotonic())
+            if discard or len(self._idle) >= self.size:
+                self._open -= 1
+                if discard:
+                    self._stats["discarded"] += 1
+                close = True
+            else:
+                self._idle.append((conn, created, time.monotonic()))
+                close = False
+            self._cond.notify()
+        if close:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check a connection out for the duration of a ``with`` block."""
+        conn = self.acquire()
+        with self.lease(conn):
+            yield conn
+
+    @contextmanager
+    def lease(self, conn):
+        """Return an already acquired connection to the pool when the block exits."""
+        try:
+            yield conn
+        except Exception as e:
+            # A failed statement (or a caller's own error) leaves the
+            # connection usable unless the session itself is gone; only
+            # throw away broken connections.
+            broken = isinstance(e, (mysql.connector.errors.OperationalError,
+                                    mysql.connector.errors.InterfaceError))
+            if not broken:
+                try:
+                    conn.rollback()
+                except Error:
+                    broken = True
+            self.release(conn, discard=broken)
+            raise
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        else:
+            self.release(conn)
+
+    def dispose(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                name=self.name,
+                size=self.size,
+                max_overflow=self.max_overflow,
+                open=self._open,
+                idle=len(self._idle),
+                in_use=self._open - len(self._idle),
+            )
+        checkouts = stats["checkouts"] or 1
+        stats["wait_time_avg_ms"] = stats["wait_time_total"] * 1000 / checkouts
+        return stats
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Error:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    host=DB_HOST, user=DB_USER, password=DB_PASS, database=DB_NAME
+                )
+    return _pool
+
+
+def configure_pool(**options):
+    """Replace the process-wide pool, e.g. to size it for a batch job's workers.
+
+    ``options`` override the DB_POOL_* defaults and connection arguments.
+    """
+    global _pool
+    settings = dict(host=DB_HOST, user=DB_USER, password=DB_PASS, database=DB_NAME)
+    settings.update(options)
+    with _pool_lock:
+        old, _pool = _pool, ConnectionPool(**settings)
+    if old is not None:
+        old.dispose()
+    return _pool
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+# ---------- Read Cache ----------
+TABLES = ("CUSTOMER", "EMPLOYEE", "ACCOUNTS", "TRANSACTION", "TRANSFERS", "LOANS", "AUDIT_LOGS",
+          "BANK_SUMMARY", "DAILY_ACCOUNT_ROLLUP", "ACCOUNT_LEDGER_TOTALS", "CUSTOMER_LEDGER_TOTALS",
+          "ROLLUP_STATE", "CHAT_HISTORY", "TRANSACTION_ARCHIVE", "TRANSFERS_ARCHIVE", "AUDIT_LOGS_ARCHIVE",
+          "ARCHIVE_LOG")
+ROLLUP_TABLES = {"DAILY_ACCOUNT_ROLLUP", "ACCOUNT_LEDGER_TOTALS", "CUSTOMER_LEDGER_TOTALS", "ROLLUP_STATE"}
+
+# Tables an INSERT or UPDATE of the key table changes besides itself,
+# through its triggers: ledger rows move balances (and so BANK_SUMMARY)
+# and write audit rows. Applied one level; chains are listed in full.
+TRIGGER_SIDE_EFFECTS = {
+    "CUSTOMER": {"BANK_SUMMARY"},
+    "ACCOUNTS": {"BANK_SUMMARY"},
+    "TRANSACTION": {"ACCOUNTS", "AUDIT_LOGS", "BANK_SUMMARY"},
+    "TRANSFERS": {"ACCOUNTS", "AUDIT_LOGS", "BANK_SUMMARY"},
+}
+
+# Tables a DELETE from the key table also removes rows from (ON DELETE
+# CASCADE and the ledger delete triggers) or updates (BANK_SUMMARY).
+# Followed transitively, for DELETE (and REPLACE) statements only.
+DELETE_SIDE_EFFECTS = {
+    "CUSTOMER": {"ACCOUNTS", "TRANSACTION", "TRANSFERS", "LOANS", "BANK_SUMMARY", "CUSTOMER_LEDGER_TOTALS",
+                 "CHAT_HISTORY"},
+    "ACCOUNTS": {"TRANSACTION", "TRANSFERS", "LOANS", "BANK_SUMMARY", "DAILY_ACCOUNT_ROLLUP",
+                 "ACCOUNT_LEDGER_TOTALS"},
+}
+
+# Tables each stored procedure writes; unknown procedures flush everything.
+PROC_TABLES = {
+    "sp_approve_loan": {"LOANS", "ACCOUNTS", "AUDIT_LOGS", "BANK_SUMMARY"},
+    "sp_approve_loans_chunk": {"LOANS", "ACCOUNTS", "AUDIT_LOGS", "BANK_SUMMARY"},
+    "sp_transfer_amount": {"ACCOUNTS", "TRANSFERS", "AUDIT_LOGS", "BANK_SUMMARY"},
+    "sp_rebuild_bank_summary": {"BANK_SUMMARY"},
+    "sp_flush_audit_logs": {"AUDIT_LOGS"},
+    "sp_refresh_daily_rollups": ROLLUP_TABLES,
+    "sp_rebuild_daily_rollups": ROLLUP_TABLES,
+    "sp_accrue_interest_chunk": {"TRANSACTION", "ACCOUNTS", "BANK_SUMMARY"},
+}
+
+_TABLE_RE = re.compile(r"`?\b(" + "|".join(TABLES) + r")\b`?", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+_VERB_RE = re.compile(r"\s*(\w+)")
+
+
+def normalize_sql(query):
+    return _WS_RE.sub(" ", query).strip()
+
+
+def tables_in(query):
+    return {name.upper() for name in _TABLE_RE.findall(query)}
+
+
+def written_tables(query):
+    """Tables a write statement can change, keyed off its verb (see the side-effect maps)."""
+    named = tables_in(query)
+    verb = _VERB_RE.match(query)
+    if verb and verb.group(1).upper() in ("DELETE", "REPLACE"):
+        tables, pending = set(), set(named)
+        while pending:
+            table = pending.pop()
+            tables.add(table)
+            pending |= DELETE_SIDE_EFFECTS.get(table, set()) - tables
+        return tables
+    tables = set(named)
+    for table in named:
+        tables |= TRIGGER_SIDE_EFFECTS.get(table, set())
+    return tables
+
+
+class QueryCache:
+    """Process-wide LRU cache of SELECT results, invalidated per table.
+
+    Keys are the normalized SQL text plus the bound parameters, so rows
+    read for one customer (``WHERE cif=%s``) are only ever served to a
+    caller asking for that same CIF. Every table carries a version number
+    that writes bump; a result is only stored if none of its tables changed
+    while the query ran, so a read racing a write cannot re-cache stale
+    rows.
+    """
+
+    def __init__(self, ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, expires_at, tables)
+        self._versions = {table: 0 for table in TABLES}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_entries > 0
+
+    def key(self, kind, query, params):
+        try:
+            params = tuple(params or ())
+            hash(params)
+        except TypeError:
+            return None
+        return kind, normalize_sql(query), params
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def versions(self, tables):
+        with self._lock:
+            return tuple(self._versions[t] for t in tables)
+
+    def put(self, key, value, tables, versions):
+        with self._lock:
+            if tuple(self._versions[t] for t in tables) != versions:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl, tables)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, tables=None):
+        with self._lock:
+            tables = set(TABLES) if tables is None else set(tables) & set(TABLES)
+            for table in tables:
+                self._versions[table] += 1
+            stale = [k for k, (_, _, deps) in self._entries.items() if deps & tables]
+            for k in stale:
+                del self._entries[k]
+            self._stats["invalidations"] += len(stale)
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries),
+                         max_entries=self.max_entries, ttl=self.ttl)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+query_cache = QueryCache()
+
+
+def cache_stats():
+    return query_cache.stats()
+
+
+def _cached_read(kind, query, params, cache, run):
+    """Serve ``run()`` through the read cache when the query is cacheable.
+
+    ``run`` returns ``(value, ok)``; results fetched while the database was
+    unreachable (``ok`` false) are passed through but never cached.
+    """
+    tables = frozenset(tables_in(query)) if cache and query_cache.enabled else None
+    key = query_cache.key(kind, query, params) if tables else None
+    if key is None:
+        return run()[0]
+    entry = query_cache.get(key)
+    if entry is not None:
+        metrics.record_cache_hit(kind, normalize_sql(query))
+        value = entry[0]
+        return list(value) if isinstance(value, list) else value
+    ordered = tuple(sorted(tables))
+    versions = query_cache.versions(ordered)
+    value, ok = run()
+    if ok:
+        query_cache.put(key, list(value) if isinstance(value, list) else value,
+                        frozenset(ordered), versions)
+    return value
+
+
+# ---------- Replicas ----------
+class GtidSet:
+    """A parsed GTID set (``uuid:1-5:7,uuid2:1-3``), enough to test containment.
+
+    ``a <= b`` is true when every transaction in ``a`` is also in ``b``.
+    Sets read from one server's gtid_executed only ever grow, so of two
+    such snapshots the larger one contains the other.
+    """
+    __slots__ = ("text", "intervals", "size")
+
+    def __init__(self, text=""):
+        self.text = "".join((text or "").split())
+        self.intervals = {}  # source uuid (and tag) -> [(first, last)]
+        self.size = 0
+        for part in filter(None, self.text.split(",")):
+            uuid, *ranges = part.lower().split(":")
+            source = uuid
+            for r in ranges:
+                if not r[0].isdigit():  # a tag (8.3+) starts its own sequence
+                    source = f"{uuid}:{r}"
+                    continue
+                first, _, last = r.partition("-")
+                first, last = int(first), int(last or first)
+                self.intervals.setdefault(source, []).append((first, last))
+                self.size += last - first + 1
+
+    def __bool__(self):
+        return self.size > 0
+
+    def __le__(self, other):
+        for source, intervals in self.intervals.items():
+            have = other.intervals.get(source, ())
+            for first, last in intervals:
+                if not any(a <= first and last <= b for a, b in have):
+                    return False
+        return True
+
+    def __repr__(self):
+        return f"GtidSet({self.text!r})"
+
+
+class SessionWrites:
+    """What one user session last wrote: the primary's GTIDs after the write, and when.
+
+    Kept in the session (st.session_state) and bound to each rerun with
+    ``bind_session`` so its reads can be routed to a replica that has them.
+    """
+
+    def __init__(self):
+        self.gtids = GtidSet()
+        self.at = None
+
+    def note(self, gtids):
+        if not gtids or gtids.size >= self.gtids.size:
+            self.gtids = gtids
+        self.at = time.monotonic()
+
+
+_session_writes = ContextVar("financehub_session_writes", default=None)
+
+
+def bind_session(writes):
+    """Track this context's writes in ``writes`` (a SessionWrites) and route its reads by them."""
+    _session_writes.set(writes)
+    return writes
+
+
+class Replica:
+    def __init__(self, address):
+        host, _, port = address.partition(":")
+        self.name = address
+        self.pool = ConnectionPool(
+            name=f"replica {address}", host=host, port=int(port or 3306),
+            user=DB_REPLICA_USER, password=DB_REPLICA_PASS, database=DB_NAME,
+            timeout=min(DB_POOL_TIMEOUT, 2.0),
+        )
+        self.healthy = False
+        self.lag = None
+        self.max_lag_seen = 0
+        self.executed = GtidSet()
+        self.checked_at = None
+        self.error = "not checked yet"
+        self.reads = self.gtid_waits = self.gtid_wait_timeouts = 0
+
+    def check(self):
+        """Refresh health, lag and gtid_executed from the replica itself."""
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor(dictionary=True) as cur:
+                    try:
+                        cur.execute("SHOW REPLICA STATUS")
+                    except Error:  # before 8.0.22
+                        cur.execute("SHOW SLAVE STATUS")
+                    status = {k.replace("Slave", "Replica").replace("Master", "Source"): v
+                              for k, v in (cur.fetchone() or {}).items()}
+                    cur.fetchall()
+                    cur.execute("SELECT @@GLOBAL.gtid_executed AS gtids")
+                    executed = GtidSet(cur.fetchone()["gtids"])
+                conn.rollback()
+        except Error as e:
+            self.healthy, self.lag, self.error = False, None, str(e)
+        else:
+            self.lag = status.get("Seconds_Behind_Source")
+            running = status.get("Replica_IO_Running") == "Yes" and status.get("Replica_SQL_Running") == "Yes"
+            if not status:
+                self.error = "replication is not configured"
+            elif not running:
+                self.error = status.get("Last_Error") or "replication threads are stopped"
+            elif self.lag is None or self.lag > DB_REPLICA_MAX_LAG:
+                self.error = f"lagging {self.lag}s"
+            else:
+                self.error = None
+            self.healthy = self.error is None
+            self.executed = executed
+            self.max_lag_seen = max(self.max_lag_seen, self.lag or 0)
+        self.checked_at = time.time()
+
+    def acquire(self):
+        try:
+            return self.pool.acquire()
+        except Error as e:
+            self.healthy, self.error = False, str(e)
+            return None
+
+    def wait_for(self, conn, gtids):
+        """Wait up to DB_GTID_WAIT seconds for ``gtids`` to be applied here."""
+        self.gtid_waits += 1
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT WAIT_FOR_EXECUTED_GTID_SET(%s, %s)", (gtids.text, DB_GTID_WAIT))
+                caught_up = cur.fetchone()[0] == 0
+        except Error:
+            caught_up = False
+        if not caught_up:
+            self.gtid_wait_timeouts += 1
+        return caught_up
+
+    def stats(self):
+        pool = self.pool.stats()
+        return {
+            "replica": self.name, "healthy": self.healthy, "lag_s": self.lag,
+            "max_lag_s": self.max_lag_seen, "reads": self.reads, "gtid_waits": self.gtid_waits,
+            "gtid_wait_timeouts": self.gtid_wait_timeouts, "in_use": pool["in_use"], "open": pool["open"],
+            "checked": time.strftime("%H:%M:%S", time.localtime(self.checked_at)) if self.checked_at else None,
+            "error": self.error,
+        }
+
+
+class ReplicaSet:
+    """The configured replicas, a background health check, and read routing."""
+
+    def __init__(self, addresses, interval=DB_REPLICA_CHECK_INTERVAL):
+        self.replicas = [Replica(a) for a in addresses]
+        self.interval = interval
+        self.written = GtidSet()  # everything this process has written
+        self._turn = count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._checker = threading.Thread(target=self._watch, name="db-replica-check", daemon=True)
+        self._checker.start()
+
+    def _watch(self):
+        while True:
+            for replica in self.replicas:
+                replica.check()
+            if self._stop.wait(self.interval):
+                return
+
+    def note_write(self, gtids):
+        with self._lock:
+            if gtids.size >= self.written.size:
+                self.written = gtids
+
+    def route(self, session):
+        """``(replica, gtids_to_wait_for, cacheable)`` for one read, or ``None`` for the primary.
+
+        Results are cacheable only from a replica known to have everything
+        this process wrote, so the shared cache never goes back in time.
+        """
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        start = next(self._turn) % len(healthy)
+        healthy = healthy[start:] + healthy[:start]
+        need = session.gtids if session is not None else None
+        if session is not None and session.at is not None and not need:
+            # No GTIDs on the primary (gtid_mode=OFF): stay there until any replica could have caught up.
+            if time.monotonic() - session.at < DB_REPLICA_MAX_LAG + self.interval:
+                return None
+        written = self.written
+        for replica in healthy:
+            if not need or need <= replica.executed:
+                return replica, None, written <= replica.executed
+        return healthy[0], need, False
+
+    def stats(self):
+        return [r.stats() for r in self.replicas]
+
+    def close(self):
+        self._stop.set()
+        for replica in self.replicas:
+            replica.pool.dispose()
+
+
+_replicas = None
+_replicas_lock = threading.Lock()
+
+
+def get_replicas():
+    """The process-wide ReplicaSet, or ``None`` when DB_REPLICA_HOSTS is empty."""
+    global _replicas
+    if _replicas is None and DB_REPLICA_HOSTS:
+        with _replicas_lock:
+            if _replicas is None:
+                _replicas = ReplicaSet(DB_REPLICA_HOSTS)
+    return _replicas
+
+
+def replica_stats():
+    replicas = get_replicas()
+    return replicas.stats() if replicas else []
+
+
+def record_write(conn):
+    """Note the GTIDs a just-committed write on the primary ``conn`` produced.
+
+    The current session's reads then only go to replicas that have applied
+    them. A no-op (and no extra round trip) without replicas.
+    """
+    replicas = get_replicas()
+    if replicas is None:
+        return
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT @@GLOBAL.gtid_executed")
+            gtids = GtidSet(cur.fetchone()[0])
+    except Error as e:
+        # The write itself is committed; without its GTIDs the session
+        # stays on the primary for a while instead.
+        log.warning("Could not read gtid_executed after a write: %s", e)
+        gtids = GtidSet()
+    replicas.note_write(gtids)
+    session = _session_writes.get()
+    if session is not None:
+        session.note(gtids)
+
+
+@contextmanager
+def read_conn(primary=False):
+    """Yield ``(conn, cacheable)`` for a read, from a replica when one can serve this session.
+
+    ``conn`` is ``None`` if the database is unreachable. A replica that
+    cannot be reached, or does not catch up with the session's writes in
+    time, is passed over for the primary.
+    """
+    replicas = None if primary else get_replicas()
+    route = replicas.route(_session_writes.get()) if replicas else None
+    if route is not None:
+        replica, wait_for, cacheable = route
+        conn = replica.acquire()
+        if conn is not None:
+            with replica.pool.lease(conn):
+                if wait_for is None or replica.wait_for(conn, wait_for):
+                    replica.reads += 1
+                    yield conn, cacheable
+                    return
+    with get_conn() as conn:
+        yield conn, True
+
+
+# ---------- Statement Timeouts ----------
+ER_QUERY_TIMEOUT = 3024  # "maximum statement execution time exceeded"
+_SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+_read_timeout_ms = ContextVar("financehub_read_timeout_ms", default=None)
+
+
+def _bounded(query):
+    """``query`` with a MAX_EXECUTION_TIME hint when a read timeout is in effect.
+
+    Only the executed text changes; the cache key and the metrics keep the
+    original statement.
+    """
+    ms = _read_timeout_ms.get()
+    if not ms:
+        return query
+    return _SELECT.sub(lambda m: f"{m.group(0)} /*+ MAX_EXECUTION_TIME({ms}) */", query, count=1)
+
+
+@contextmanager
+def read_timeout(seconds):
+    """Bound every fetch_one/fetch_all in the block to ``seconds`` on the server."""
+    token = _read_timeout_ms.set(max(1, int(seconds * 1000)) if seconds else None)
+    try:
+        yield
+    finally:
+        _read_timeout_ms.reset(token)
+
+
+# ---------- DB Utility Functions ----------
+@contextmanager
+def get_conn(required=False):
+    """Yield a pooled connection, or ``None`` if the database is unreachable.
+
+    Reads degrade to an empty result that way; writes pass ``required=True``
+    so PoolExhausted or a connect error reaches the caller instead of the
+    write being dropped.
+    """
+    pool = get_pool()
+    try:
+        conn = pool.acquire()
+    except Error as e:
+        log.error("Database connection failed: %s", e)
+        if required:
+            raise
+        yield None
+        return
+    with pool.lease(conn):
+        yield conn
+
+
+def ping():
+    """Cheap connectivity check used by the app on every rerun."""
+    with get_conn() as conn:
+        return conn is not None
+
+
+def fetch_one(query, params=None, cache=True, primary=False):
+    def run():
+        with timed("one", query) as t, read_conn(primary) as (conn, cacheable):
+            t.connected()
+            if not conn: return None, False
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(_bounded(query), params or ())
+                t.executed()
+                row = cur.fetchone()
+                cur.fetchall()
+            t.fetched(1 if row else 0)
+        return row, cacheable
+    return _cached_read("one", query, params, cache, run)
+
+
+def fetch_all(query, params=None, cache=True, primary=False):
+    def run():
+        with timed("all", query) as t, read_conn(primary) as (conn, cacheable):
+            t.connected()
+            if not conn: return [], False
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(_bounded(query), params or ())
+                t.executed()
+                rows = cur.fetchall()
+            t.fetched(len(rows))
+        return rows, cacheable
+    return _cached_read("all", query, params, cache, run)
+
+
+def exec_write(query, params=None):
+    with timed("write", query) as t, get_conn(required=True) as conn:
+        t.connected()
+        with conn.cursor() as cur:
+            cur.execute(query, params or ())
+            t.executed()
+            conn.commit()
+            t.fetched(cur.rowcount)
+        record_write(conn)
+    query_cache.invalidate(written_tables(query))
+
+
+def exec_many(query, rows):
+    """Run one INSERT/UPDATE for every params tuple in ``rows`` in a single transaction."""
+    with timed("write", query) as t, get_conn(required=True) as conn:
+        t.connected()
+        with conn.cursor() as cur:
+            cur.executemany(query, rows)
+            t.executed()
+            conn.commit()
+            t.fetched(cur.rowcount)
+        record_write(conn)
+    query_cache.invalidate(written_tables(query))
+
+
+def call_proc(name, args):
+    with timed("proc", f"CALL {name}") as t, get_conn(required=True) as conn:
+        t.connected()
+        with conn.cursor() as cur:
+            cur.callproc(name, args)
+            t.executed()
+            conn.commit()
+        record_write(conn)
+    query_cache.invalidate(PROC_TABLES.get(name))
+
+
+def call_scalar_function(function_sql, params=None):
+    with timed("scalar", function_sql) as t, get_conn() as conn:
+        t.connected()
+        if not conn: return None
+        with conn.cursor() as cur:
+            cur.execute(function_sql, params or ())
+            t.executed()
+            row = cur.fetchone()
+            cur.fetchall()
+        t.fetched(1 if row else 0)
+    return row[0] if row else None
+
+
+# ---------- Keyset Pagination ----------
+def like_prefix(value):
+    """A LIKE pattern matching strings that start with ``value``, wildcards escaped."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def page_query(source, columns, key, sort=None, descending=False, filters=None,
+               where=None, params=None, after=None, limit=50):
+    """Build the keyset ("seek") query for one page of a listing.
+
+    ``source`` is the FROM clause and ``columns`` maps output names to SQL
+    expressions; both come from code, never from user input. ``key`` names
+    the unique column that breaks ties, ``sort`` an optional other column
+    to order by. ``filters`` maps column names to ``(op, value)`` pairs
+    with op one of ``prefix``, ``=``, ``>=`` or ``<=``. ``after`` is the
+    cursor returned for the previous page.
+
+    Returns ``(query, args)``. The query asks for ``limit + 1`` rows so the
+    caller can tell whether another page follows.
+    """
+    sort = sort or key
+    key_expr, sort_expr = columns[key], columns[sort]
+    clauses = [f"({where})"] if where else []
+    args = list(params or ())
+
+    for name, (op, value) in (filters or {}).items():
+        if value in (None, ""):
+            continue
+        expr = columns[name]
+        if op == "prefix":
+            clauses.append(f"{expr} LIKE %s")
+            args.append(like_prefix(str(value)))
+        elif op in ("=", ">=", "<="):
+            clauses.append(f"{expr} {op} %s")
+            args.append(value)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+    cmp = "<" if descending else ">"
+    if after is not None:
+        sort_value, key_value = after
+        if sort == key:
+            clauses.append(f"{key_expr} {cmp} %s")
+            args.append(key_value)
+        else:
+            clauses.append(f"({sort_expr} {cmp} %s OR ({sort_expr} = %s AND {key_expr} {cmp} %s))")
+            args.extend([sort_value, sort_value, key_value])
+
+    direction = "DESC" if descending else "ASC"
+    order = f"{sort_expr} {direction}" if sort == key else f"{sort_expr} {direction}, {key_expr} {direction}"
+    select = ", ".join(f"{expr} AS {name}" for name, expr in columns.items())
+    query = f"SELECT {select} FROM {source}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += f" ORDER BY {order} LIMIT %s"
+    args.append(limit + 1)
+    return query, args
+
+
+def fetch_page(source, columns, key, sort=None, limit=50, **options):
+    """Fetch one page of a listing using keyset pagination (see ``page_query``).
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the
+    last page. Each page is a bounded index range scan, so the cost of page
+    N does not grow with N the way ``OFFSET`` does.
+    """
+    query, args = page_query(source, columns, key, sort=sort, limit=limit, **options)
+    rows = fetch_all(query, args)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    sort = sort or key
+    return rows, (rows[-1][sort], rows[-1][key])
+
+
+# ---------- Concurrent Reads ----------
+_fanout = None
+_fanout_lock = threading.Lock()
+
+
+def fanout_executor():
+    global _fanout
+    if _fanout is None:
+        with _fanout_lock:
+            if _fanout is None:
+                _fanout = ThreadPoolExecutor(max_workers=DB_FANOUT_WORKERS, thread_name_prefix="db-read")
+    return _fanout
+
+
+def _run_bounded(seconds, fn, args, kwargs):
+    with read_timeout(seconds):
+        return fn(*args, **kwargs)
+
+
+class PendingRead:
+    """One read submitted to a ReadBatch; ``result()`` waits for it until its deadline."""
+
+    def __init__(self, future, deadline, then, failed):
+        self.future = future
+        self.deadline = deadline
+        self.then = then
+        self.failed = failed
+        self.consumed = False
+
+    def result(self):
+        """The read's return value; raises QueryTimeout past the deadline or ``Error`` if it failed."""
+        self.consumed = True
+        try:
+            return self.future.result(timeout=max(0.0, self.deadline - time.monotonic()))
+        except FutureTimeout:
+            self.future.cancel()
+            raise QueryTimeout(msg="Query did not finish in time") from None
+        except Error as e:
+            if e.errno == ER_QUERY_TIMEOUT:
+                raise QueryTimeout(msg="Query did not finish in time", errno=e.errno) from e
+            raise
+
+
+class ReadBatch:
+    """Run a page's independent reads concurrently on the fan-out pool.
+
+        with ReadBatch() as reads:
+            reads.submit(fetch_one, SUMMARY_SQL, then=show_summary)
+            reads.submit(fetch_page, ..., then=show_grid, failed=show_retry)
+
+    Every read starts as soon as it is submitted, on its own pooled
+    connection, and carries the submitting thread's context (the page tag
+    used by the metrics). On leaving the block the ``then`` callbacks get
+    each result in submission order, on the calling thread. A read still
+    running after ``timeout`` seconds is abandoned and its ``failed``
+    callback (or ``on_failure``) gets a QueryTimeout; the statement itself
+    is stopped by the server through MAX_EXECUTION_TIME. Database errors
+    go to the same callback; anything else propagates.
+    """
+
+    GRACE = 0.25  # client-side slack over the server-side limit
+
+    def __init__(self, timeout=DB_READ_TIMEOUT, on_failure=None):
+        self.timeout = timeout
+        self.on_failure = on_failure
+        self.reads = []
+
+    def submit(self, fn, *args, then=None, failed=None, timeout=None, **kwargs):
+        seconds = self.timeout if timeout is None else timeout
+        future = fanout_executor().submit(copy_context().run, _run_bounded, seconds, fn, args, kwargs)
+        read = PendingRead(future, time.monotonic() + seconds + self.GRACE, then, failed)
+        self.reads.append(read)
+        return read
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            for read in self.reads:
+                read.future.cancel()
+            return False
+        for read in self.reads:
+            if read.consumed:
+                continue
+            try:
+                value = read.result()
+            except Error as e:
+                handler = read.failed or self.on_failure
+                if handler is None:
+                    raise
+                handler(e)
+            else:
+                if read.then is not None:
+                    read.then(value)
+        return False
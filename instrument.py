@@ -0,0 +1,250 @@
+# instrument.py — per-query and per-page timing, rolling histograms and the slow-query log
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+# Calls slower than SLOW_QUERY_MS (connect + execute + fetch) go to the
+# slow-query log once the app enables it; SLOW_QUERY_LOG="" keeps them in
+# memory only.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "slow_queries.log")
+# Histograms cover the last METRICS_WINDOW seconds in one-minute slots;
+# at most METRICS_MAX_STATEMENTS distinct statements are tracked.
+METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "900"))
+METRICS_MAX_STATEMENTS = int(os.getenv("METRICS_MAX_STATEMENTS", "500"))
+
+SLOT_SECONDS = 60
+NO_PAGE = "-"
+# Bucket upper bounds in milliseconds, roughly x1.5 apart from 0.1ms to 60s.
+BUCKETS = [round(0.1 * 1.5 ** i, 3) for i in range(34)]
+
+slow_log = logging.getLogger("financehub.slow")
+current_page = ContextVar("financehub_page", default=NO_PAGE)
+
+
+class RollingHistogram:
+    """Latency histogram over a sliding window, kept as per-minute slots."""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.slots = deque(maxlen=max(1, window // SLOT_SECONDS))  # (slot, counts)
+
+    def add(self, ms, now=None):
+        slot = int((now or time.time()) // SLOT_SECONDS)
+        if not self.slots or self.slots[-1][0] != slot:
+            self.slots.append((slot, [0] * (len(BUCKETS) + 1)))
+        self.slots[-1][1][bisect_left(BUCKETS, ms)] += 1
+
+    def merged(self, now=None):
+        oldest = int((now or time.time()) // SLOT_SECONDS) - self.slots.maxlen + 1
+        totals = [0] * (len(BUCKETS) + 1)
+        for slot, counts in self.slots:
+            if slot >= oldest:
+                for i, n in enumerate(counts):
+                    totals[i] += n
+        return totals
+
+    def percentile(self, pct, now=None):
+        """Upper bound of the bucket holding the ``pct``th percentile, in ms."""
+        counts = self.merged(now)
+        total = sum(counts)
+        if not total:
+            return None
+        rank, seen = pct / 100 * total, 0
+        for i, n in enumerate(counts):
+            seen += n
+            if seen >= rank and n:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+    def count(self, now=None):
+        return sum(self.merged(now))
+
+
+class _Stat:
+    __slots__ = ("calls", "cache_hits", "errors", "rows", "total_ms", "connect_ms", "execute_ms",
+                 "fetch_ms", "max_ms", "histogram")
+
+    def __init__(self):
+        self.calls = self.cache_hits = self.errors = self.rows = 0
+        self.total_ms = self.connect_ms = self.execute_ms = self.fetch_ms = self.max_ms = 0.0
+        self.histogram = RollingHistogram()
+
+
+class Metrics:
+    """Process-wide statement and page statistics. Thread-safe."""
+
+    def __init__(self, max_statements=METRICS_MAX_STATEMENTS, slow_ms=SLOW_QUERY_MS):
+        self.max_statements = max_statements
+        self.slow_ms = slow_ms
+        self._statements = OrderedDict()  # (page, kind, sql) -> _Stat, LRU order
+        self._pages = {}                  # page -> RollingHistogram of render times
+        self._slow = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def _stat(self, key):
+        stat = self._statements.get(key)
+        if stat is None:
+            stat = self._statements[key] = _Stat()
+            if len(self._statements) > self.max_statements:
+                self._statements.popitem(last=False)
+        else:
+            self._statements.move_to_end(key)
+        return stat
+
+    def record(self, kind, sql, connect_ms, execute_ms, fetch_ms, rows, error=None):
+        page = current_page.get()
+        total = connect_ms + execute_ms + fetch_ms
+        with self._lock:
+            stat = self._stat((page, kind, sql))
+            stat.calls += 1
+            stat.rows += rows
+            stat.total_ms += total
+            stat.connect_ms += connect_ms
+            stat.execute_ms += execute_ms
+            stat.fetch_ms += fetch_ms
+            stat.max_ms = max(stat.max_ms, total)
+            stat.histogram.add(total)
+            if error:
+                stat.errors += 1
+            if total >= self.slow_ms:
+                entry = {"at": time.strftime("%Y-%m-%d %H:%M:%S"), "page": page, "kind": kind,
+                         "ms": round(total, 1), "connect_ms": round(connect_ms, 1),
+                         "execute_ms": round(execute_ms, 1), "fetch_ms": round(fetch_ms, 1),
+                         "rows": rows, "sql": sql}
+                self._slow.append(entry)
+        if total >= self.slow_ms:
+            slow_log.warning("%.1fms page=%s kind=%s connect=%.1f execute=%.1f fetch=%.1f rows=%d%s | %s",
+                             total, page, kind, connect_ms, execute_ms, fetch_ms, rows,
+                             " error" if error else "", sql)
+
+    def record_cache_hit(self, kind, sql):
+        with self._lock:
+            self._stat((current_page.get(), kind, sql)).cache_hits += 1
+
+    def record_page(self, page, ms):
+        with self._lock:
+            self._pages.setdefault(page, RollingHistogram()).add(ms)
+
+    def top_statements(self, limit=20):
+        """Statements ordered by total time spent, heaviest first."""
+        with self._lock:
+            items = list(self._statements.items())
+        rows = []
+        for (page, kind, sql), s in items:
+            rows.append({
+                "page": page, "kind": kind, "calls": s.calls, "cache_hits": s.cache_hits,
+                "errors": s.errors, "total_ms": round(s.total_ms, 1),
+                "avg_ms": round(s.total_ms / s.calls, 2) if s.calls else 0.0,
+                "p95_ms": s.histogram.percentile(95), "max_ms": round(s.max_ms, 1),
+                "connect_ms": round(s.connect_ms, 1), "execute_ms": round(s.execute_ms, 1),
+                "fetch_ms": round(s.fetch_ms, 1), "rows": s.rows, "sql": sql,
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows[:limit]
+
+    def page_stats(self):
+        """Render-time percentiles and database time per page over the window."""
+        with self._lock:
+            pages = dict(self._pages)
+            db_ms = {}
+            for (page, _, _), s in self._statements.items():
+                db_ms[page] = db_ms.get(page, 0.0) + s.total_ms
+        rows = []
+        for page, histogram in sorted(pages.items()):
+            rows.append({"page": page, "renders": histogram.count(), "p50_ms": histogram.percentile(50),
+                         "p95_ms": histogram.percentile(95), "p99_ms": histogram.percentile(99),
+                         "db_total_ms": round(db_ms.get(page, 0.0), 1)})
+        return rows
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._pages.clear()
+            self._slow.clear()
+            self.started = time.time()
+
+
+metrics = Metrics()
+
+
+def enable_slow_log(path=SLOW_QUERY_LOG):
+    """Write slow calls to the rotating file ``path``; a no-op when already enabled.
+
+    Only the app calls this, so importing instrument from the CLI tools and
+    benchmarks leaves no log file behind. The file is opened on the first
+    slow call.
+    """
+    if not path or slow_log.handlers:
+        return
+    handler = RotatingFileHandler(path, maxBytes=10 * 1024 * 1024, backupCount=3, delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_log.addHandler(handler)
+    slow_log.setLevel(logging.WARNING)
+    slow_log.propagate = False
+
+
+# ---------- Timing Helpers ----------
+class QueryTimer:
+    """Marks the phase boundaries of one database call; see ``timed``."""
+    __slots__ = ("started", "t_connect", "t_execute", "rows")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.t_connect = self.t_execute = None
+        self.rows = 0
+
+    def connected(self):
+        self.t_connect = time.perf_counter()
+
+    def executed(self):
+        self.t_execute = time.perf_counter()
+
+    def fetched(self, rows):
+        self.rows = rows
+
+
+@contextmanager
+def timed(kind, sql):
+    """Time one call as connect / execute / fetch and record it under the current page."""
+    timer = QueryTimer()
+    error = None
+    try:
+        yield timer
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        end = time.perf_counter()
+        t_connect = timer.t_connect or end
+        t_execute = timer.t_execute or end
+        metrics.record(kind, " ".join(sql.split()),
+                       (t_connect - timer.started) * 1000,
+                       (t_execute - t_connect) * 1000,
+                       (end - t_execute) * 1000,
+                       timer.rows, error)
+
+
+def page(func):
+    """Tag every query issued while ``func`` runs with its name and time the render."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_page.set(func.__name__)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.record_page(func.__name__, (time.perf_counter() - started) * 1000)
+            current_page.reset(token)
+    return wrapper
@@ -0,0 +1,221 @@
+# migrate.py — versioned schema migrations and query-plan checks
+"""
+Usage:
+    python migrate.py                  apply pending migrations
+    python migrate.py status           list applied and pending migrations
+    python migrate.py check-plans      EXPLAIN the hot queries; exit 1 on a
+                                       full table scan or unexpected filesort
+
+Migrations are the files in migrations/ named NNNN_description.sql, applied
+in version order on top of DBMSmini.sql and recorded in SCHEMA_MIGRATIONS.
+They may use DELIMITER like the mysql client does. MySQL DDL is not
+transactional, so a migration that fails part-way has to be finished by
+hand before it is re-run.
+"""
+import os
+import re
+import sys
+import hashlib
+import argparse
+
+from mysql.connector import Error
+
+import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE_RE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+LOCK_NAME = "financehub_migrate"
+
+
+# ---------- Migration Files ----------
+def discover():
+    """Return ``[(version, name, path)]`` for every migration file, in order."""
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        m = MIGRATION_FILE_RE.match(filename)
+        if m:
+            found.append((int(m.group(1)), m.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    versions = [v for v, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise SystemExit("Duplicate migration version numbers in migrations/")
+    return found
+
+
+def checksum(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def split_statements(sql):
+    """Split a script into statements, honouring DELIMITER directives."""
+    delimiter = ";"
+    statements, buf = [], []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not buf and (not stripped or stripped.startswith("--")):
+            continue
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        buf.append(line)
+        if stripped.endswith(delimiter):
+            statement = "\n".join(buf).rstrip()
+            statements.append(statement[: -len(delimiter)].strip())
+            buf = []
+    if "".join(buf).strip():
+        statements.append("\n".join(buf).strip())
+    return statements
+
+
+# ---------- Runner ----------
+def ensure_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS SCHEMA_MIGRATIONS (
+          version INT PRIMARY KEY,
+          name VARCHAR(200) NOT NULL,
+          checksum CHAR(64) NOT NULL,
+          applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cur):
+    cur.execute("SELECT version, checksum FROM SCHEMA_MIGRATIONS")
+    return {version: digest for version, digest in cur.fetchall()}
+
+
+def migrate(target=None):
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT GET_LOCK(%s, 60)", (LOCK_NAME,))
+            if cur.fetchone()[0] != 1:
+                raise SystemExit("Another migration run holds the lock; try again later.")
+            try:
+                ensure_table(cur)
+                done = applied_versions(cur)
+                pending = [m for m in discover() if m[0] not in done and (target is None or m[0] <= target)]
+                if not pending:
+                    print("Schema is up to date.")
+                for version, name, path in pending:
+                    with open(path, encoding="utf-8") as f:
+                        statements = split_statements(f.read())
+                    print(f"Applying {version:04d}_{name} ({len(statements)} statements)...")
+                    for i, statement in enumerate(statements, 1):
+                        try:
+                            cur.execute(statement)
+                            if cur.with_rows:
+                                cur.fetchall()
+                        except Error as e:
+                            conn.rollback()
+                            raise SystemExit(f"  statement {i} of {version:04d}_{name} failed: {e}")
+                    cur.execute(
+                        "INSERT INTO SCHEMA_MIGRATIONS (version, name, checksum) VALUES (%s,%s,%s)",
+                        (version, name, checksum(path)),
+                    )
+                    conn.commit()
+            finally:
+                cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+                cur.fetchall()
+    db.query_cache.clear()
+
+
+def status():
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            ensure_table(cur)
+            done = applied_versions(cur)
+    for version, name, path in discover():
+        if version not in done:
+            state = "pending"
+        elif done[version] != checksum(path):
+            state = "applied (file changed since!)"
+        else:
+            state = "applied"
+        print(f"{version:04d}  {name:<40} {state}")
+
+
+# ---------- Query Plan Checks ----------
+def check_plans(min_rows=1000):
+    """EXPLAIN every query in queries.HOT_QUERIES against the live schema.
+
+    Fails a query whose plan reads a base table with ``type=ALL``, sorts
+    with ``Using filesort`` (unless the query is marked as a bounded merge),
+    or reads a monthly partition that ended before the recent-activity
+    window (migration 0011).
+    Plans on near-empty tables say nothing about production, so queries
+    touching a table with fewer than ``min_rows`` rows are skipped; seed the
+    database (e.g. with datagen.py) before relying on this check.
+    """
+    import queries
+
+    failures = 0
+    with db.get_pool().connection() as conn:
+        with conn.cursor(dictionary=True) as cur:
+            sizes = {}
+            for table in db.TABLES:
+                cur.execute(f"SELECT COUNT(*) AS n FROM `{table}`")
+                sizes[table] = cur.fetchone()["n"]
+            cur.execute("""
+                SELECT a.cif FROM ACCOUNTS a JOIN `TRANSACTION` t ON t.accno = a.accno
+                GROUP BY a.cif ORDER BY COUNT(*) DESC LIMIT 1
+            """)
+            row = cur.fetchone()
+            samples = {"cif": row["cif"] if row else ""}
+            cur.execute("SELECT user_id FROM AUDIT_LOGS ORDER BY timestamp DESC LIMIT 1")
+            row = cur.fetchone()
+            samples["user_id"] = row["user_id"] if row else ""
+            samples["recent"] = queries.recent_since()
+            cur.execute("""
+                SELECT TABLE_NAME AS tbl, PARTITION_NAME AS part FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE() AND PARTITION_DESCRIPTION <> 'MAXVALUE'
+                  AND CAST(PARTITION_DESCRIPTION AS UNSIGNED) <= UNIX_TIMESTAMP(%s)
+            """, (samples["recent"],))
+            cold = {(row["tbl"].upper(), row["part"]) for row in cur.fetchall()}
+
+            for name, sql, params, bounded_sort in queries.HOT_QUERIES:
+                small = [t for t in db.tables_in(sql) if sizes.get(t, 0) < min_rows]
+                if small:
+                    print(f"SKIP  {name}: {', '.join(sorted(small))} below {min_rows} rows")
+                    continue
+                args = [samples.get(p, p) if isinstance(p, str) else p for p in params]
+                cur.execute("EXPLAIN " + sql, args)
+                problems = []
+                for step in cur.fetchall():
+                    table = step["table"] or ""
+                    extra = step["Extra"] or ""
+                    if step["type"] == "ALL" and not table.startswith("<"):
+                        problems.append(f"full scan of {table}")
+                    if "Using filesort" in extra and not bounded_sort:
+                        problems.append(f"filesort on {table or 'result'}")
+                    old = [p for p in (step.get("partitions") or "").split(",") if (table.upper(), p) in cold]
+                    if old:
+                        problems.append(f"{len(old)} partitions of {table} older than the recent window")
+                if problems:
+                    failures += 1
+                    print(f"FAIL  {name}: {'; '.join(problems)}")
+                else:
+                    print(f"ok    {name}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FinanceHub schema migrations")
+    sub = parser.add_subparsers(dest="command")
+    up = sub.add_parser("up", help="apply pending migrations (default)")
+    up.add_argument("--to", type=int, help="stop after this version")
+    sub.add_parser("status", help="list applied and pending migrations")
+    plans = sub.add_parser("check-plans", help="EXPLAIN the hot queries")
+    plans.add_argument("--min-rows", type=int, default=1000,
+                       help="skip queries over tables smaller than this")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        status()
+    elif args.command == "check-plans":
+        sys.exit(1 if check_plans(args.min_rows) else 0)
+    else:
+        migrate(getattr(args, "to", None))
+
+
+if __name__ == "__main__":
+    main()
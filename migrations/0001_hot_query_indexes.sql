@@ -0,0 +1,144 @@
+-- ======================================
+-- 0001: Indexes for the hot query predicates, and the dashboard summary
+-- ======================================
+-- One ALTER per table so each table is rebuilt at most once, online.
+
+-- "Recent Transactions" (ORDER BY transactiondate DESC LIMIT 50) and the
+-- per-account history seeks (accno = ? ORDER BY transactiondate DESC).
+-- idx_txn_acc_date also replaces the implicit foreign-key index on accno.
+ALTER TABLE `TRANSACTION`
+  ADD INDEX idx_txn_date (transactiondate),
+  ADD INDEX idx_txn_acc_date (accno, transactiondate),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- "Recent Transfers" plus the outgoing/incoming history per account.
+ALTER TABLE TRANSFERS
+  ADD INDEX idx_tr_date (transferdate),
+  ADD INDEX idx_tr_from_date (from_accno, transferdate),
+  ADD INDEX idx_tr_to_date (to_accno, transferdate),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- audit_logs_page: ORDER BY timestamp DESC LIMIT 200.
+ALTER TABLE AUDIT_LOGS
+  ADD INDEX idx_audit_ts (timestamp),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Covering indexes: the per-customer account lists read only
+-- accno/accttype/balance by cif (accno rides along as the primary key),
+-- and the high-value report resolves balance > ? to cifs from the index.
+ALTER TABLE ACCOUNTS
+  ADD INDEX idx_acc_cif_cover (cif, balance, accttype),
+  ADD INDEX idx_acc_balance (balance, cif),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- LOANS.cif is already served by the index MySQL creates for its foreign
+-- key; "My Loans" orders by loan_id, which that index carries as the PK.
+
+
+-- ---------- Bank summary (dashboard metrics) ----------
+-- Customer/account counts and the total book balance, kept current by
+-- triggers so the staff dashboard never scans CUSTOMER or ACCOUNTS.
+-- The totals are striped over 16 slots picked by CONNECTION_ID(), so
+-- concurrent deposits and transfers do not all queue on one row lock;
+-- readers add the slots up with one primary-key range read.
+
+CREATE TABLE BANK_SUMMARY (
+  slot TINYINT UNSIGNED PRIMARY KEY,
+  customer_count BIGINT NOT NULL DEFAULT 0,
+  account_count BIGINT NOT NULL DEFAULT 0,
+  total_balance DECIMAL(20,2) NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+DROP PROCEDURE IF EXISTS sp_rebuild_bank_summary;
+DELIMITER $$
+
+CREATE PROCEDURE sp_rebuild_bank_summary()
+BEGIN
+    DECLARE v_slot INT DEFAULT 0;
+
+    START TRANSACTION;
+    DELETE FROM BANK_SUMMARY;
+    WHILE v_slot < 16 DO
+        INSERT INTO BANK_SUMMARY (slot) VALUES (v_slot);
+        SET v_slot = v_slot + 1;
+    END WHILE;
+
+    UPDATE BANK_SUMMARY
+    SET customer_count = (SELECT COUNT(*) FROM CUSTOMER),
+        account_count = (SELECT COUNT(*) FROM ACCOUNTS),
+        total_balance = (SELECT IFNULL(SUM(balance), 0) FROM ACCOUNTS)
+    WHERE slot = 0;
+    COMMIT;
+END$$
+
+DELIMITER ;
+
+CALL sp_rebuild_bank_summary();
+
+DELIMITER $$
+
+CREATE TRIGGER trg_summary_customer_insert
+AFTER INSERT ON CUSTOMER
+FOR EACH ROW
+BEGIN
+    UPDATE BANK_SUMMARY
+    SET customer_count = customer_count + 1
+    WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+-- ACCOUNTS rows removed by ON DELETE CASCADE do not fire ACCOUNTS
+-- triggers, so the customer's accounts are taken off the totals here.
+CREATE TRIGGER trg_summary_customer_delete
+BEFORE DELETE ON CUSTOMER
+FOR EACH ROW
+BEGIN
+    DECLARE v_accounts BIGINT;
+    DECLARE v_balance DECIMAL(20,2);
+
+    SELECT COUNT(*), IFNULL(SUM(balance), 0) INTO v_accounts, v_balance
+    FROM ACCOUNTS
+    WHERE cif = OLD.cif;
+
+    UPDATE BANK_SUMMARY
+    SET customer_count = customer_count - 1,
+        account_count = account_count - v_accounts,
+        total_balance = total_balance - v_balance
+    WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+CREATE TRIGGER trg_summary_account_insert
+AFTER INSERT ON ACCOUNTS
+FOR EACH ROW
+BEGIN
+    UPDATE BANK_SUMMARY
+    SET account_count = account_count + 1,
+        total_balance = total_balance + IFNULL(NEW.balance, 0)
+    WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+-- Every balance-moving path (trg_after_transaction_insert,
+-- trg_after_transfer_insert, sp_transfer_amount, sp_approve_loan) ends in
+-- an UPDATE of ACCOUNTS.balance, so one trigger here covers all of them.
+CREATE TRIGGER trg_summary_account_update
+AFTER UPDATE ON ACCOUNTS
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.balance <=> OLD.balance) THEN
+        UPDATE BANK_SUMMARY
+        SET total_balance = total_balance + IFNULL(NEW.balance, 0) - IFNULL(OLD.balance, 0)
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_summary_account_delete
+AFTER DELETE ON ACCOUNTS
+FOR EACH ROW
+BEGIN
+    UPDATE BANK_SUMMARY
+    SET account_count = account_count - 1,
+        total_balance = total_balance - IFNULL(OLD.balance, 0)
+    WHERE slot = CONNECTION_ID() % 16;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,233 @@
+-- ======================================
+-- 0002: Collision-free, batched audit logging
+-- ======================================
+-- Triggers and procedures used to insert straight into AUDIT_LOGS with
+-- logid = 'LG' + RAND()*999, so money movement failed on duplicate keys
+-- and paid for the audit insert inside every balance-changing transaction.
+-- They now append to AUDIT_STAGING (an AUTO_INCREMENT heap, cheap to insert)
+-- and sp_flush_audit_logs moves staged rows into AUDIT_LOGS in bulk, with
+-- logid = 'LG' + the zero-padded staging id, so keys only ever grow.
+
+CREATE TABLE AUDIT_STAGING (
+  id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  user_id VARCHAR(20),
+  user_type VARCHAR(20),
+  action TEXT,
+  ip_address VARCHAR(50),
+  user_agent VARCHAR(100),
+  timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  status_code VARCHAR(10)
+);
+
+-- Per-user audit trails, newest first; (timestamp) exists since 0001.
+ALTER TABLE AUDIT_LOGS
+  ADD INDEX idx_audit_user_ts (user_id, timestamp),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+DROP PROCEDURE IF EXISTS sp_flush_audit_logs;
+DELIMITER $$
+
+CREATE PROCEDURE sp_flush_audit_logs(IN p_batch_size INT, OUT p_flushed INT)
+BEGIN
+    DECLARE v_hwm BIGINT UNSIGNED;
+    DECLARE v_rows INT DEFAULT 0;
+
+    SET p_flushed = 0;
+    flush_loop: LOOP
+        SELECT MAX(id) INTO v_hwm
+        FROM (SELECT id FROM AUDIT_STAGING ORDER BY id LIMIT p_batch_size) AS batch;
+
+        IF v_hwm IS NULL THEN
+            LEAVE flush_loop;
+        END IF;
+
+        START TRANSACTION;
+        -- INSERT IGNORE keeps a re-run after a crash between the two
+        -- statements harmless: the logid derived from the id is stable.
+        INSERT IGNORE INTO AUDIT_LOGS
+            (logid, user_id, user_type, action, ip_address, user_agent, timestamp, status_code)
+        SELECT CONCAT('LG', LPAD(id, 18, '0')), user_id, user_type, action,
+               ip_address, user_agent, timestamp, status_code
+        FROM AUDIT_STAGING
+        WHERE id <= v_hwm;
+        SET v_rows = ROW_COUNT();
+
+        DELETE FROM AUDIT_STAGING WHERE id <= v_hwm;
+        COMMIT;
+
+        SET p_flushed = p_flushed + v_rows;
+        IF v_rows < p_batch_size THEN
+            LEAVE flush_loop;
+        END IF;
+    END LOOP;
+END$$
+
+DELIMITER ;
+
+-- Background writer. Needs event_scheduler=ON (the MySQL 8 default);
+-- otherwise run audit_writer.py alongside the app.
+DROP EVENT IF EXISTS ev_flush_audit_logs;
+CREATE EVENT ev_flush_audit_logs
+  ON SCHEDULE EVERY 2 SECOND
+  DO CALL sp_flush_audit_logs(5000, @audit_flushed);
+
+-- ---------- Writers now stage their audit rows ----------
+
+DROP TRIGGER IF EXISTS trg_after_transaction_insert;
+DELIMITER $$
+
+CREATE TRIGGER trg_after_transaction_insert
+AFTER INSERT ON `TRANSACTION`
+FOR EACH ROW
+BEGIN
+  DECLARE current_balance DECIMAL(15,2);
+
+  SELECT balance INTO current_balance
+  FROM ACCOUNTS
+  WHERE accno = NEW.accno
+  FOR UPDATE;
+
+  IF NEW.transactiontype = 'DEPOSIT' THEN
+    UPDATE ACCOUNTS
+    SET balance = current_balance + NEW.amount
+    WHERE accno = NEW.accno;
+
+  ELSEIF NEW.transactiontype = 'WITHDRAW' THEN
+    IF current_balance >= NEW.amount THEN
+      UPDATE ACCOUNTS
+      SET balance = current_balance - NEW.amount
+      WHERE accno = NEW.accno;
+    ELSE
+      SIGNAL SQLSTATE '45000'
+      SET MESSAGE_TEXT = 'Insufficient funds for withdrawal';
+    END IF;
+  END IF;
+
+  INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+  VALUES (
+    NEW.accno,
+    'Customer',
+    CONCAT('Transaction ', NEW.transactiontype, ' of amount ', NEW.amount),
+    '127.0.0.1',
+    'System',
+    '200'
+  );
+END$$
+
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS trg_after_transfer_insert;
+DELIMITER $$
+
+CREATE TRIGGER trg_after_transfer_insert
+AFTER INSERT ON TRANSFERS
+FOR EACH ROW
+BEGIN
+    DECLARE from_balance DECIMAL(15,2);
+    DECLARE to_balance DECIMAL(15,2);
+
+    SELECT balance INTO from_balance FROM ACCOUNTS WHERE accno = NEW.from_accno;
+    SELECT balance INTO to_balance FROM ACCOUNTS WHERE accno = NEW.to_accno;
+
+    IF from_balance >= NEW.amount THEN
+        UPDATE ACCOUNTS
+        SET balance = from_balance - NEW.amount
+        WHERE accno = NEW.from_accno;
+
+        UPDATE ACCOUNTS
+        SET balance = to_balance + NEW.amount
+        WHERE accno = NEW.to_accno;
+
+        INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+        VALUES (
+            NEW.from_accno,
+            'Customer',
+            CONCAT('Transferred ₹', NEW.amount, ' from ', NEW.from_accno, ' to ', NEW.to_accno),
+            '127.0.0.1',
+            'System',
+            '200'
+        );
+    ELSE
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Insufficient funds for transfer';
+    END IF;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_transfer_amount;
+DELIMITER $$
+
+CREATE PROCEDURE sp_transfer_amount(
+    IN p_from_acc VARCHAR(20),
+    IN p_to_acc VARCHAR(20),
+    IN p_amount DECIMAL(12,2),
+    IN p_emp_id VARCHAR(20)
+)
+BEGIN
+    START TRANSACTION;
+
+    UPDATE ACCOUNTS
+    SET balance = balance - p_amount
+    WHERE accno = p_from_acc;
+
+    UPDATE ACCOUNTS
+    SET balance = balance + p_amount
+    WHERE accno = p_to_acc;
+
+    INSERT INTO TRANSFERS (transferid, from_accno, to_accno, amount)
+    VALUES (CONCAT('TR', LPAD(FLOOR(RAND()*99999), 5, '0')), p_from_acc, p_to_acc, p_amount);
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    VALUES (
+        p_emp_id,
+        'Employee',
+        CONCAT('Transferred ', p_amount, ' from ', p_from_acc, ' to ', p_to_acc),
+        '127.0.0.1',
+        'System',
+        '200'
+    );
+
+    COMMIT;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_approve_loan;
+DELIMITER $$
+
+CREATE PROCEDURE sp_approve_loan(
+    IN p_loan_id VARCHAR(50),
+    IN p_admin_id VARCHAR(50)
+)
+BEGIN
+    DECLARE v_accno VARCHAR(50);
+    DECLARE v_amount DECIMAL(15,2);
+
+    SELECT accno, loan_amount
+    INTO v_accno, v_amount
+    FROM LOANS
+    WHERE loan_id = p_loan_id;
+
+    UPDATE LOANS
+    SET status = 'APPROVED',
+        approval_date = NOW(),
+        approved_by = p_admin_id
+    WHERE loan_id = p_loan_id;
+
+    UPDATE ACCOUNTS
+    SET balance = balance + v_amount
+    WHERE accno = v_accno;
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    VALUES (
+        v_accno,
+        'Customer',
+        CONCAT('Loan Approved for ', v_accno, ' Amount: ', v_amount),
+        '127.0.0.1',
+        'System',
+        '200'
+    );
+END$$
+
+DELIMITER ;
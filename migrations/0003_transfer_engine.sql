@@ -0,0 +1,102 @@
+-- ======================================
+-- 0003: Contention-safe transfers
+-- ======================================
+-- trg_after_transfer_insert read both balances with plain SELECTs and wrote
+-- back from_balance - amount / to_balance + amount, so two concurrent
+-- transfers on one account lost an update. It now moves money with
+-- conditional single-statement updates that cannot overdraw or overwrite.
+-- sp_transfer_amount used to move the money itself *and* insert a TRANSFERS
+-- row that fired the trigger, debiting twice; it now only locks and inserts.
+--
+-- Writers lock both ACCOUNTS rows in accno order before inserting into
+-- TRANSFERS (see transfers.py). Without that, the foreign-key checks take
+-- shared locks that two transfers on the same pair both upgrade, which is
+-- a guaranteed deadlock.
+
+DROP TRIGGER IF EXISTS trg_after_transfer_insert;
+DELIMITER $$
+
+CREATE TRIGGER trg_after_transfer_insert
+AFTER INSERT ON TRANSFERS
+FOR EACH ROW
+BEGIN
+    IF NEW.from_accno = NEW.to_accno THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Cannot transfer to the same account';
+    END IF;
+
+    UPDATE ACCOUNTS
+    SET balance = balance - NEW.amount
+    WHERE accno = NEW.from_accno AND balance >= NEW.amount;
+
+    IF ROW_COUNT() = 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Insufficient funds for transfer';
+    END IF;
+
+    UPDATE ACCOUNTS
+    SET balance = balance + NEW.amount
+    WHERE accno = NEW.to_accno;
+
+    IF ROW_COUNT() = 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Destination account not found';
+    END IF;
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    VALUES (
+        NEW.from_accno,
+        'Customer',
+        CONCAT('Transferred ₹', NEW.amount, ' from ', NEW.from_accno, ' to ', NEW.to_accno),
+        '127.0.0.1',
+        'System',
+        '200'
+    );
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_transfer_amount;
+DELIMITER $$
+
+CREATE PROCEDURE sp_transfer_amount(
+    IN p_from_acc VARCHAR(20),
+    IN p_to_acc VARCHAR(20),
+    IN p_amount DECIMAL(12,2),
+    IN p_emp_id VARCHAR(20)
+)
+BEGIN
+    DECLARE v_locked INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    -- An IN-list on the primary key is scanned in key order, so this
+    -- locks both accounts in accno order, like transfers.py does.
+    SELECT COUNT(*) INTO v_locked
+    FROM ACCOUNTS
+    WHERE accno IN (p_from_acc, p_to_acc)
+    FOR UPDATE;
+
+    -- The trigger moves the money.
+    INSERT INTO TRANSFERS (transferid, from_accno, to_accno, amount)
+    VALUES (UUID(), p_from_acc, p_to_acc, p_amount);
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    VALUES (
+        p_emp_id,
+        'Employee',
+        CONCAT('Transferred ', p_amount, ' from ', p_from_acc, ' to ', p_to_acc),
+        '127.0.0.1',
+        'System',
+        '200'
+    );
+
+    COMMIT;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,198 @@
+-- ======================================
+-- 0004: Balance checkpoints
+-- ======================================
+-- fn_get_balance summed the whole TRANSACTION history of an account (and
+-- ignored transfers and loan credits). BALANCE_CHECKPOINTS stores every
+-- account's balance at each month end, built incrementally by
+-- sp_build_balance_checkpoints (driven by checkpoints.py), so balance
+-- lookups read one checkpoint and add only the ledger rows after it.
+--
+-- Ledger movements, one sign per source:
+--   TRANSACTION  -amount for WITHDRAW/WITHDRAWAL, +amount for anything else
+--   TRANSFERS    -amount on from_accno, +amount on to_accno
+--   LOANS        +loan_amount on accno once APPROVED, dated approval_date
+-- A checkpoint for period_end D covers every movement before D + 1 day.
+
+CREATE TABLE BALANCE_CHECKPOINTS (
+  accno VARCHAR(20) NOT NULL,
+  period_end DATE NOT NULL,
+  balance DECIMAL(15,2) NOT NULL,
+  built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (accno, period_end),
+  KEY idx_checkpoint_period (period_end),
+  FOREIGN KEY (accno) REFERENCES ACCOUNTS(accno) ON DELETE CASCADE
+);
+
+-- Per-account loan credits, and the set-based builder's date range scan.
+ALTER TABLE LOANS
+  ADD INDEX idx_loans_acc_approval (accno, status, approval_date),
+  ADD INDEX idx_loans_status_approval (status, approval_date),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+DROP FUNCTION IF EXISTS fn_ledger_delta;
+DELIMITER $$
+
+-- Net ledger movement of one account with p_from <= ts < p_to. Each source
+-- is a range seek on an (account, date) index.
+CREATE FUNCTION fn_ledger_delta(p_accno VARCHAR(20), p_from DATETIME, p_to DATETIME)
+RETURNS DECIMAL(15,2)
+READS SQL DATA
+BEGIN
+    DECLARE v_txn DECIMAL(15,2);
+    DECLARE v_out DECIMAL(15,2);
+    DECLARE v_in DECIMAL(15,2);
+    DECLARE v_loans DECIMAL(15,2);
+
+    SELECT IFNULL(SUM(CASE WHEN transactiontype IN ('WITHDRAW', 'WITHDRAWAL') THEN -amount ELSE amount END), 0)
+    INTO v_txn
+    FROM `TRANSACTION`
+    WHERE accno = p_accno AND transactiondate >= p_from AND transactiondate < p_to;
+
+    SELECT IFNULL(SUM(amount), 0) INTO v_out
+    FROM TRANSFERS
+    WHERE from_accno = p_accno AND transferdate >= p_from AND transferdate < p_to;
+
+    SELECT IFNULL(SUM(amount), 0) INTO v_in
+    FROM TRANSFERS
+    WHERE to_accno = p_accno AND transferdate >= p_from AND transferdate < p_to;
+
+    SELECT IFNULL(SUM(loan_amount), 0) INTO v_loans
+    FROM LOANS
+    WHERE accno = p_accno AND status = 'APPROVED'
+      AND approval_date >= p_from AND approval_date < p_to;
+
+    RETURN v_txn - v_out + v_in + v_loans;
+END$$
+
+DELIMITER ;
+
+DROP FUNCTION IF EXISTS fn_get_balance_asof;
+DELIMITER $$
+
+-- Balance of an account including every movement up to and including p_ts:
+-- the nearest checkpoint at or before p_ts plus the ledger rows since. With
+-- no earlier checkpoint (history before the first build), walk back from
+-- the next checkpoint, or from the live balance if there is none yet.
+CREATE FUNCTION fn_get_balance_asof(p_accno VARCHAR(20), p_ts DATETIME)
+RETURNS DECIMAL(15,2)
+READS SQL DATA
+BEGIN
+    DECLARE v_to DATETIME DEFAULT p_ts + INTERVAL 1 SECOND;
+    DECLARE v_end DATE DEFAULT NULL;
+    DECLARE v_balance DECIMAL(15,2) DEFAULT NULL;
+
+    SELECT period_end, balance INTO v_end, v_balance
+    FROM BALANCE_CHECKPOINTS
+    WHERE accno = p_accno AND period_end < DATE(v_to)
+    ORDER BY period_end DESC
+    LIMIT 1;
+
+    IF v_end IS NOT NULL THEN
+        RETURN v_balance + fn_ledger_delta(p_accno, v_end + INTERVAL 1 DAY, v_to);
+    END IF;
+
+    SELECT period_end, balance INTO v_end, v_balance
+    FROM BALANCE_CHECKPOINTS
+    WHERE accno = p_accno AND period_end >= DATE(v_to)
+    ORDER BY period_end
+    LIMIT 1;
+
+    IF v_end IS NOT NULL THEN
+        RETURN v_balance - fn_ledger_delta(p_accno, v_to, v_end + INTERVAL 1 DAY);
+    END IF;
+
+    SELECT balance INTO v_balance FROM ACCOUNTS WHERE accno = p_accno;
+    RETURN IFNULL(v_balance, 0) - fn_ledger_delta(p_accno, v_to, '9999-12-31');
+END$$
+
+DELIMITER ;
+
+DROP FUNCTION IF EXISTS fn_get_balance;
+DELIMITER $$
+
+CREATE FUNCTION fn_get_balance(p_accno VARCHAR(20))
+RETURNS DECIMAL(15,2)
+READS SQL DATA
+BEGIN
+    RETURN fn_get_balance_asof(p_accno, NOW());
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_build_balance_checkpoints;
+DELIMITER $$
+
+-- Build (or rebuild) the checkpoints for one completed period end.
+-- Accounts with an earlier checkpoint roll it forward by the period's
+-- movements: one range scan per ledger table over the period only.
+-- Accounts without one (first build, or opened since) are anchored on the
+-- live balance minus everything that happened after p_period_end.
+-- Run with READ COMMITTED so the INSERT ... SELECTs read without locking
+-- the ledger; each statement still sees one consistent snapshot.
+CREATE PROCEDURE sp_build_balance_checkpoints(IN p_period_end DATE, OUT p_accounts INT)
+BEGIN
+    DECLARE v_prev DATE DEFAULT NULL;
+    DECLARE v_from DATETIME;
+    DECLARE v_to DATETIME DEFAULT p_period_end + INTERVAL 1 DAY;
+
+    IF v_to > NOW() THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Checkpoint period has not ended yet';
+    END IF;
+
+    SELECT MAX(period_end) INTO v_prev
+    FROM BALANCE_CHECKPOINTS
+    WHERE period_end < p_period_end;
+    SET v_from = IFNULL(v_prev + INTERVAL 1 DAY, '1000-01-01');
+
+    INSERT INTO BALANCE_CHECKPOINTS (accno, period_end, balance)
+    SELECT c.accno, p_period_end, c.balance + IFNULL(d.delta, 0)
+    FROM BALANCE_CHECKPOINTS c
+    LEFT JOIN (
+        SELECT accno, SUM(delta) AS delta
+        FROM (
+            SELECT accno, CASE WHEN transactiontype IN ('WITHDRAW', 'WITHDRAWAL') THEN -amount ELSE amount END AS delta
+            FROM `TRANSACTION`
+            WHERE transactiondate >= v_from AND transactiondate < v_to
+            UNION ALL
+            SELECT from_accno, -amount FROM TRANSFERS
+            WHERE transferdate >= v_from AND transferdate < v_to
+            UNION ALL
+            SELECT to_accno, amount FROM TRANSFERS
+            WHERE transferdate >= v_from AND transferdate < v_to
+            UNION ALL
+            SELECT accno, loan_amount FROM LOANS
+            WHERE status = 'APPROVED' AND approval_date >= v_from AND approval_date < v_to
+        ) AS m
+        GROUP BY accno
+    ) AS d ON d.accno = c.accno
+    WHERE c.period_end = v_prev
+    ON DUPLICATE KEY UPDATE balance = VALUES(balance);
+    SET p_accounts = ROW_COUNT();
+
+    INSERT INTO BALANCE_CHECKPOINTS (accno, period_end, balance)
+    SELECT a.accno, p_period_end, IFNULL(a.balance, 0) - IFNULL(d.delta, 0)
+    FROM ACCOUNTS a
+    LEFT JOIN BALANCE_CHECKPOINTS prev
+      ON prev.accno = a.accno AND prev.period_end = v_prev
+    LEFT JOIN (
+        SELECT accno, SUM(delta) AS delta
+        FROM (
+            SELECT accno, CASE WHEN transactiontype IN ('WITHDRAW', 'WITHDRAWAL') THEN -amount ELSE amount END AS delta
+            FROM `TRANSACTION` WHERE transactiondate >= v_to
+            UNION ALL
+            SELECT from_accno, -amount FROM TRANSFERS WHERE transferdate >= v_to
+            UNION ALL
+            SELECT to_accno, amount FROM TRANSFERS WHERE transferdate >= v_to
+            UNION ALL
+            SELECT accno, loan_amount FROM LOANS
+            WHERE status = 'APPROVED' AND approval_date >= v_to
+        ) AS m
+        GROUP BY accno
+    ) AS d ON d.accno = a.accno
+    WHERE prev.accno IS NULL
+    ON DUPLICATE KEY UPDATE balance = VALUES(balance);
+    SET p_accounts = p_accounts + ROW_COUNT();
+END$$
+
+DELIMITER ;
@@ -0,0 +1,163 @@
+-- ======================================
+-- 0005: Bulk-load switch for the per-row triggers
+-- ======================================
+-- datagen.py loads tens of millions of ledger rows that already carry
+-- their final balances. Firing the balance, audit and summary triggers for
+-- every row would turn a minutes-long load into hours, so these triggers
+-- now do nothing in a session that has SET @financehub_bulk_load = 1.
+-- Such a session must reconcile afterwards: ACCOUNTS.balance written
+-- directly, CALL sp_rebuild_bank_summary(). Application code never sets
+-- the variable.
+
+DROP TRIGGER IF EXISTS trg_after_transaction_insert;
+DELIMITER $$
+
+CREATE TRIGGER trg_after_transaction_insert
+AFTER INSERT ON `TRANSACTION`
+FOR EACH ROW
+BEGIN
+  DECLARE current_balance DECIMAL(15,2);
+
+  IF @financehub_bulk_load IS NULL THEN
+    SELECT balance INTO current_balance
+    FROM ACCOUNTS
+    WHERE accno = NEW.accno
+    FOR UPDATE;
+
+    IF NEW.transactiontype = 'DEPOSIT' THEN
+      UPDATE ACCOUNTS
+      SET balance = current_balance + NEW.amount
+      WHERE accno = NEW.accno;
+
+    ELSEIF NEW.transactiontype = 'WITHDRAW' THEN
+      IF current_balance >= NEW.amount THEN
+        UPDATE ACCOUNTS
+        SET balance = current_balance - NEW.amount
+        WHERE accno = NEW.accno;
+      ELSE
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Insufficient funds for withdrawal';
+      END IF;
+    END IF;
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    VALUES (
+      NEW.accno,
+      'Customer',
+      CONCAT('Transaction ', NEW.transactiontype, ' of amount ', NEW.amount),
+      '127.0.0.1',
+      'System',
+      '200'
+    );
+  END IF;
+END$$
+
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS trg_after_transfer_insert;
+DELIMITER $$
+
+CREATE TRIGGER trg_after_transfer_insert
+AFTER INSERT ON TRANSFERS
+FOR EACH ROW
+BEGIN
+    IF @financehub_bulk_load IS NULL THEN
+        IF NEW.from_accno = NEW.to_accno THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Cannot transfer to the same account';
+        END IF;
+
+        UPDATE ACCOUNTS
+        SET balance = balance - NEW.amount
+        WHERE accno = NEW.from_accno AND balance >= NEW.amount;
+
+        IF ROW_COUNT() = 0 THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Insufficient funds for transfer';
+        END IF;
+
+        UPDATE ACCOUNTS
+        SET balance = balance + NEW.amount
+        WHERE accno = NEW.to_accno;
+
+        IF ROW_COUNT() = 0 THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Destination account not found';
+        END IF;
+
+        INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+        VALUES (
+            NEW.from_accno,
+            'Customer',
+            CONCAT('Transferred ₹', NEW.amount, ' from ', NEW.from_accno, ' to ', NEW.to_accno),
+            '127.0.0.1',
+            'System',
+            '200'
+        );
+    END IF;
+END$$
+
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS trg_summary_customer_insert;
+DROP TRIGGER IF EXISTS trg_summary_customer_delete;
+DROP TRIGGER IF EXISTS trg_summary_account_insert;
+DROP TRIGGER IF EXISTS trg_summary_account_delete;
+DELIMITER $$
+
+CREATE TRIGGER trg_summary_customer_insert
+AFTER INSERT ON CUSTOMER
+FOR EACH ROW
+BEGIN
+    IF @financehub_bulk_load IS NULL THEN
+        UPDATE BANK_SUMMARY
+        SET customer_count = customer_count + 1
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_summary_customer_delete
+BEFORE DELETE ON CUSTOMER
+FOR EACH ROW
+BEGIN
+    DECLARE v_accounts BIGINT;
+    DECLARE v_balance DECIMAL(20,2);
+
+    IF @financehub_bulk_load IS NULL THEN
+        SELECT COUNT(*), IFNULL(SUM(balance), 0) INTO v_accounts, v_balance
+        FROM ACCOUNTS
+        WHERE cif = OLD.cif;
+
+        UPDATE BANK_SUMMARY
+        SET customer_count = customer_count - 1,
+            account_count = account_count - v_accounts,
+            total_balance = total_balance - v_balance
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_summary_account_insert
+AFTER INSERT ON ACCOUNTS
+FOR EACH ROW
+BEGIN
+    IF @financehub_bulk_load IS NULL THEN
+        UPDATE BANK_SUMMARY
+        SET account_count = account_count + 1,
+            total_balance = total_balance + IFNULL(NEW.balance, 0)
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_summary_account_delete
+AFTER DELETE ON ACCOUNTS
+FOR EACH ROW
+BEGIN
+    IF @financehub_bulk_load IS NULL THEN
+        UPDATE BANK_SUMMARY
+        SET account_count = account_count - 1,
+            total_balance = total_balance - IFNULL(OLD.balance, 0)
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+DELIMITER ;
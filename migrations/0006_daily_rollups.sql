@@ -0,0 +1,222 @@
+-- ======================================
+-- 0006: Daily ledger rollups for the Reports page
+-- ======================================
+-- Reports used to GROUP BY the whole TRANSACTION table on every rerun.
+-- sp_refresh_daily_rollups folds ledger rows newer than a high-water mark
+-- into per-account-per-day totals (DAILY_ACCOUNT_ROLLUP) and into running
+-- per-account and per-customer totals, so reports read rows proportional
+-- to the accounts shown, not to the history.
+--
+-- The high-water mark is a timestamp. Each refresh stops ROLLUP_LAG_SECONDS
+-- short of NOW() so rows of transactions still in flight (stamped before
+-- they commit) are not skipped. Loads that backdate rows (datagen.py) must
+-- CALL sp_rebuild_daily_rollups() afterwards.
+
+CREATE TABLE DAILY_ACCOUNT_ROLLUP (
+  accno VARCHAR(20) NOT NULL,
+  day DATE NOT NULL,
+  deposits DECIMAL(18,2) NOT NULL DEFAULT 0,
+  withdrawals DECIMAL(18,2) NOT NULL DEFAULT 0,
+  other_credits DECIMAL(18,2) NOT NULL DEFAULT 0,
+  transfers_in DECIMAL(18,2) NOT NULL DEFAULT 0,
+  transfers_out DECIMAL(18,2) NOT NULL DEFAULT 0,
+  entries INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (accno, day),
+  KEY idx_rollup_day (day),
+  FOREIGN KEY (accno) REFERENCES ACCOUNTS(accno) ON DELETE CASCADE
+);
+
+CREATE TABLE ACCOUNT_LEDGER_TOTALS (
+  accno VARCHAR(20) PRIMARY KEY,
+  cif VARCHAR(20),
+  deposits DECIMAL(18,2) NOT NULL DEFAULT 0,
+  withdrawals DECIMAL(18,2) NOT NULL DEFAULT 0,
+  other_credits DECIMAL(18,2) NOT NULL DEFAULT 0,
+  transfers_in DECIMAL(18,2) NOT NULL DEFAULT 0,
+  transfers_out DECIMAL(18,2) NOT NULL DEFAULT 0,
+  net DECIMAL(18,2) NOT NULL DEFAULT 0,
+  KEY idx_totals_net (net, accno),
+  KEY idx_totals_cif (cif),
+  FOREIGN KEY (accno) REFERENCES ACCOUNTS(accno) ON DELETE CASCADE
+);
+
+CREATE TABLE CUSTOMER_LEDGER_TOTALS (
+  cif VARCHAR(20) PRIMARY KEY,
+  deposits DECIMAL(18,2) NOT NULL DEFAULT 0,
+  withdrawals DECIMAL(18,2) NOT NULL DEFAULT 0,
+  net DECIMAL(18,2) NOT NULL DEFAULT 0,
+  KEY idx_cust_totals_net (net, cif),
+  FOREIGN KEY (cif) REFERENCES CUSTOMER(cif) ON DELETE CASCADE
+);
+
+CREATE TABLE ROLLUP_STATE (
+  name VARCHAR(50) PRIMARY KEY,
+  high_water DATETIME NOT NULL,
+  refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+DROP PROCEDURE IF EXISTS sp_apply_rollup_window;
+DELIMITER $$
+
+-- Fold ledger rows with p_from <= ts < p_to into all three rollups.
+CREATE PROCEDURE sp_apply_rollup_window(IN p_from DATETIME, IN p_to DATETIME, OUT p_rows INT)
+BEGIN
+    DROP TEMPORARY TABLE IF EXISTS tmp_rollup_delta;
+    CREATE TEMPORARY TABLE tmp_rollup_delta (
+      accno VARCHAR(20) NOT NULL,
+      day DATE NOT NULL,
+      deposits DECIMAL(18,2) NOT NULL,
+      withdrawals DECIMAL(18,2) NOT NULL,
+      other_credits DECIMAL(18,2) NOT NULL,
+      transfers_in DECIMAL(18,2) NOT NULL,
+      transfers_out DECIMAL(18,2) NOT NULL,
+      entries INT NOT NULL,
+      PRIMARY KEY (accno, day)
+    );
+
+    INSERT INTO tmp_rollup_delta
+    SELECT accno, day, SUM(dep), SUM(wd), SUM(oth), SUM(tin), SUM(tout), COUNT(*)
+    FROM (
+        SELECT accno, DATE(transactiondate) AS day,
+               IF(transactiontype = 'DEPOSIT', amount, 0) AS dep,
+               IF(transactiontype IN ('WITHDRAW', 'WITHDRAWAL'), amount, 0) AS wd,
+               IF(transactiontype IN ('DEPOSIT', 'WITHDRAW', 'WITHDRAWAL'), 0, amount) AS oth,
+               0 AS tin, 0 AS tout
+        FROM `TRANSACTION`
+        WHERE transactiondate >= p_from AND transactiondate < p_to
+        UNION ALL
+        SELECT to_accno, DATE(transferdate), 0, 0, 0, amount, 0
+        FROM TRANSFERS
+        WHERE transferdate >= p_from AND transferdate < p_to
+        UNION ALL
+        SELECT from_accno, DATE(transferdate), 0, 0, 0, 0, amount
+        FROM TRANSFERS
+        WHERE transferdate >= p_from AND transferdate < p_to
+    ) AS m
+    WHERE accno IS NOT NULL
+    GROUP BY accno, day;
+    SET p_rows = ROW_COUNT();
+
+    -- Ledger rows of an account deleted since are skipped (its rollups went
+    -- with it through the foreign keys).
+    DELETE d FROM tmp_rollup_delta d
+    LEFT JOIN ACCOUNTS a ON a.accno = d.accno
+    WHERE a.accno IS NULL;
+
+    INSERT INTO DAILY_ACCOUNT_ROLLUP
+      (accno, day, deposits, withdrawals, other_credits, transfers_in, transfers_out, entries)
+    SELECT accno, day, deposits, withdrawals, other_credits, transfers_in, transfers_out, entries
+    FROM tmp_rollup_delta
+    ON DUPLICATE KEY UPDATE
+      deposits = deposits + VALUES(deposits),
+      withdrawals = withdrawals + VALUES(withdrawals),
+      other_credits = other_credits + VALUES(other_credits),
+      transfers_in = transfers_in + VALUES(transfers_in),
+      transfers_out = transfers_out + VALUES(transfers_out),
+      entries = entries + VALUES(entries);
+
+    INSERT INTO ACCOUNT_LEDGER_TOTALS
+      (accno, cif, deposits, withdrawals, other_credits, transfers_in, transfers_out, net)
+    SELECT d.accno, a.cif, SUM(d.deposits), SUM(d.withdrawals), SUM(d.other_credits),
+           SUM(d.transfers_in), SUM(d.transfers_out),
+           SUM(d.deposits - d.withdrawals + d.other_credits + d.transfers_in - d.transfers_out)
+    FROM tmp_rollup_delta d
+    JOIN ACCOUNTS a ON a.accno = d.accno
+    GROUP BY d.accno, a.cif
+    ON DUPLICATE KEY UPDATE
+      cif = VALUES(cif),
+      deposits = deposits + VALUES(deposits),
+      withdrawals = withdrawals + VALUES(withdrawals),
+      other_credits = other_credits + VALUES(other_credits),
+      transfers_in = transfers_in + VALUES(transfers_in),
+      transfers_out = transfers_out + VALUES(transfers_out),
+      net = net + VALUES(net);
+
+    -- Deposits net of withdrawals, as in the DBMSmini.sql customer report.
+    INSERT INTO CUSTOMER_LEDGER_TOTALS (cif, deposits, withdrawals, net)
+    SELECT a.cif, SUM(d.deposits), SUM(d.withdrawals), SUM(d.deposits - d.withdrawals)
+    FROM tmp_rollup_delta d
+    JOIN ACCOUNTS a ON a.accno = d.accno
+    WHERE a.cif IS NOT NULL
+    GROUP BY a.cif
+    ON DUPLICATE KEY UPDATE
+      deposits = deposits + VALUES(deposits),
+      withdrawals = withdrawals + VALUES(withdrawals),
+      net = net + VALUES(net);
+
+    DROP TEMPORARY TABLE tmp_rollup_delta;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_refresh_daily_rollups;
+DELIMITER $$
+
+-- Fold everything between the high-water mark and NOW() - p_lag_seconds
+-- into the rollups and advance the mark, atomically. The transaction runs
+-- READ COMMITTED so its ledger scans take no locks that would hold up
+-- postings.
+CREATE PROCEDURE sp_refresh_daily_rollups(IN p_lag_seconds INT, OUT p_rows INT)
+BEGIN
+    DECLARE v_from DATETIME;
+    DECLARE v_to DATETIME DEFAULT NOW() - INTERVAL p_lag_seconds SECOND;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    SET p_rows = 0;
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+    START TRANSACTION;
+    SELECT high_water INTO v_from FROM ROLLUP_STATE WHERE name = 'daily' FOR UPDATE;
+    IF v_from IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Rollups not initialised; CALL sp_rebuild_daily_rollups()';
+    END IF;
+    IF v_to > v_from THEN
+        CALL sp_apply_rollup_window(v_from, v_to, p_rows);
+        UPDATE ROLLUP_STATE SET high_water = v_to, refreshed_at = NOW() WHERE name = 'daily';
+    ELSE
+        UPDATE ROLLUP_STATE SET refreshed_at = NOW() WHERE name = 'daily';
+    END IF;
+    COMMIT;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_rebuild_daily_rollups;
+DELIMITER $$
+
+-- Recompute every rollup from the full ledger (first install, or after a
+-- load that wrote backdated rows).
+CREATE PROCEDURE sp_rebuild_daily_rollups()
+BEGIN
+    DECLARE v_to DATETIME DEFAULT NOW() - INTERVAL 60 SECOND;
+    DECLARE v_rows INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+    START TRANSACTION;
+    INSERT INTO ROLLUP_STATE (name, high_water) VALUES ('daily', '1000-01-01 00:00:00')
+    ON DUPLICATE KEY UPDATE high_water = high_water;
+    DELETE FROM DAILY_ACCOUNT_ROLLUP;
+    DELETE FROM ACCOUNT_LEDGER_TOTALS;
+    DELETE FROM CUSTOMER_LEDGER_TOTALS;
+    CALL sp_apply_rollup_window('1000-01-01 00:00:00', v_to, v_rows);
+    UPDATE ROLLUP_STATE SET high_water = v_to, refreshed_at = NOW() WHERE name = 'daily';
+    COMMIT;
+END$$
+
+DELIMITER ;
+
+CALL sp_rebuild_daily_rollups();
+
+DROP EVENT IF EXISTS ev_refresh_daily_rollups;
+CREATE EVENT ev_refresh_daily_rollups
+  ON SCHEDULE EVERY 1 MINUTE
+  DO CALL sp_refresh_daily_rollups(60, @rollup_rows);
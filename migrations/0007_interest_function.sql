@@ -0,0 +1,22 @@
+-- ======================================
+-- 0007: fn_calculate_interest
+-- ======================================
+-- The Reports page has always offered an interest calculator, but the
+-- function it called was never part of the schema. Interest is simple
+-- interest on the principal, rounded half away from zero to the paisa:
+--   principal * annual_rate% * months / 1200
+-- amortization.py computes the same figure (and EMI schedules) in the app;
+-- `python amortization.py --verify` checks the two agree for every loan.
+
+DROP FUNCTION IF EXISTS fn_calculate_interest;
+DELIMITER $$
+
+CREATE FUNCTION fn_calculate_interest(p_principal DECIMAL(15,2), p_rate DECIMAL(5,2), p_months INT)
+RETURNS DECIMAL(15,2)
+DETERMINISTIC
+NO SQL
+BEGIN
+    RETURN ROUND(p_principal * p_rate * p_months / 1200, 2);
+END$$
+
+DELIMITER ;
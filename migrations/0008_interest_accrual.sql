@@ -0,0 +1,117 @@
+-- ======================================
+-- 0008: Month-end interest accrual
+-- ======================================
+-- Interest-bearing accounts (interest_rate > 0) are credited once per
+-- month with ROUND(balance * interest_rate / 1200, 2) on their month-end
+-- checkpoint balance, i.e. fn_calculate_interest(balance, rate, 1).
+-- accrual.py splits ACCOUNTS into accno ranges and runs
+-- sp_accrue_interest_chunk over them from parallel workers.
+--
+-- Each credit is an INTEREST row in `TRANSACTION` whose id is derived from
+-- the period and the account ('INT' || yyyymm || '-' || accno), so
+-- re-running a period only posts what is missing, and a duplicate posting
+-- fails on the primary key. ACCRUAL_RUNS records each period's totals.
+
+CREATE TABLE ACCRUAL_RUNS (
+  period_end DATE PRIMARY KEY,
+  status VARCHAR(10) NOT NULL DEFAULT 'RUNNING',
+  accounts INT NOT NULL DEFAULT 0,
+  interest DECIMAL(20,2) NOT NULL DEFAULT 0,
+  workers INT,
+  started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  finished_at TIMESTAMP NULL
+);
+
+-- The chunk procedure moves balances set-based and adds its total to
+-- BANK_SUMMARY itself, so the per-row summary trigger honours the
+-- bulk-load switch like the others (migration 0005).
+DROP TRIGGER IF EXISTS trg_summary_account_update;
+DELIMITER $$
+
+CREATE TRIGGER trg_summary_account_update
+AFTER UPDATE ON ACCOUNTS
+FOR EACH ROW
+BEGIN
+    IF @financehub_bulk_load IS NULL AND NOT (NEW.balance <=> OLD.balance) THEN
+        UPDATE BANK_SUMMARY
+        SET total_balance = total_balance + IFNULL(NEW.balance, 0) - IFNULL(OLD.balance, 0)
+        WHERE slot = CONNECTION_ID() % 16;
+    END IF;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_accrue_interest_chunk;
+DELIMITER $$
+
+-- Credit one period's interest to the accounts with p_after < accno <= p_upto
+-- in one transaction. Accounts without a checkpoint for the period did not
+-- exist at its end and earn nothing.
+CREATE PROCEDURE sp_accrue_interest_chunk(
+    IN p_period_end DATE,
+    IN p_after VARCHAR(20),
+    IN p_upto VARCHAR(20),
+    OUT p_accounts INT,
+    OUT p_interest DECIMAL(20,2)
+)
+BEGIN
+    DECLARE v_prefix VARCHAR(12) DEFAULT CONCAT('INT', DATE_FORMAT(p_period_end, '%Y%m'), '-');
+    DECLARE v_bulk_load INT DEFAULT @financehub_bulk_load;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        SET @financehub_bulk_load = v_bulk_load;
+        RESIGNAL;
+    END;
+
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+    DROP TEMPORARY TABLE IF EXISTS tmp_interest_accrual;
+    CREATE TEMPORARY TABLE tmp_interest_accrual (
+      accno VARCHAR(20) PRIMARY KEY,
+      amount DECIMAL(12,2) NOT NULL
+    );
+
+    START TRANSACTION;
+
+    INSERT INTO tmp_interest_accrual (accno, amount)
+    SELECT a.accno, ROUND(cp.balance * a.interest_rate / 1200, 2)
+    FROM ACCOUNTS a
+    JOIN BALANCE_CHECKPOINTS cp ON cp.accno = a.accno AND cp.period_end = p_period_end
+    WHERE a.accno > p_after AND a.accno <= p_upto
+      AND a.interest_rate > 0
+      AND ROUND(cp.balance * a.interest_rate / 1200, 2) > 0
+      AND NOT EXISTS (
+          SELECT 1 FROM `TRANSACTION` t WHERE t.transactionid = CONCAT(v_prefix, a.accno)
+      );
+
+    -- The triggers would post one audit row and lock one balance per credit.
+    SET @financehub_bulk_load = 1;
+
+    INSERT INTO `TRANSACTION` (transactionid, accno, transactiontype, amount)
+    SELECT CONCAT(v_prefix, accno), accno, 'INTEREST', amount
+    FROM tmp_interest_accrual;
+
+    UPDATE ACCOUNTS a
+    JOIN tmp_interest_accrual i ON i.accno = a.accno
+    SET a.balance = a.balance + i.amount;
+
+    SELECT COUNT(*), IFNULL(SUM(amount), 0) INTO p_accounts, p_interest
+    FROM tmp_interest_accrual;
+
+    UPDATE BANK_SUMMARY
+    SET total_balance = total_balance + p_interest
+    WHERE slot = CONNECTION_ID() % 16;
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    SELECT accno, 'Customer',
+           CONCAT('Interest credit of amount ', amount, ' for ', DATE_FORMAT(p_period_end, '%Y-%m')),
+           '127.0.0.1', 'System', '200'
+    FROM tmp_interest_accrual;
+
+    COMMIT;
+    SET @financehub_bulk_load = v_bulk_load;
+    DROP TEMPORARY TABLE tmp_interest_accrual;
+END$$
+
+DELIMITER ;
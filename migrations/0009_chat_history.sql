@@ -0,0 +1,17 @@
+-- ======================================
+-- 0009: Banking Assistant chat history
+-- ======================================
+-- The assistant keeps only the latest turns in the Streamlit session and
+-- appends them here in batches (chat_history.py). "Show earlier" pages
+-- backwards through a customer's turns on (cif, created_at); created_at is
+-- set by the app with microseconds and strictly increases within a session.
+
+CREATE TABLE CHAT_HISTORY (
+  id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  cif VARCHAR(20) NOT NULL,
+  role VARCHAR(10) NOT NULL,
+  content TEXT NOT NULL,
+  created_at DATETIME(6) NOT NULL,
+  KEY idx_chat_cif_created (cif, created_at),
+  FOREIGN KEY (cif) REFERENCES CUSTOMER(cif) ON DELETE CASCADE
+);
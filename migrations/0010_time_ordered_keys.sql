@@ -0,0 +1,281 @@
+-- ======================================
+-- 0010: Time-ordered BINARY(16) keys for TRANSACTION and TRANSFERS
+-- ======================================
+-- transactionid and transferid were random UUIDv4 strings in VARCHAR(50)
+-- primary keys, so every insert landed on a random clustered-index page
+-- (page splits, a buffer pool full of half-empty pages) and every
+-- secondary index carried up to 50 bytes of key. They become UUIDv7 keys
+-- in BINARY(16): made by ids.uuid7() in the app and fn_uuid7() in SQL,
+-- increasing with time, so new rows append to the right edge of the index.
+--
+-- The old string ids move to a new `reference` column. It also carries
+-- idempotency keys such as the interest accrual's 'INTyyyymm-accno', and
+-- datagen's 'GT...'/'GX...' markers. Existing rows get a key dated by
+-- their transactiondate/transferdate, so history sorts the same way.
+--
+-- Online: the columns are added instantly; temporary triggers key rows
+-- inserted meanwhile; the backfill commits every 5000 rows, walking the
+-- old primary key; the swap is one in-place rebuild per table that allows
+-- concurrent DML. Stop the old app before the swap step, since it still
+-- inserts string ids; `python migrate.py` at deploy time does that anyway.
+
+-- ---------- Key functions ----------
+DROP FUNCTION IF EXISTS fn_uuid7_at;
+DELIMITER $$
+
+-- A version-7 UUID for Unix time p_ms (milliseconds), with random bits.
+CREATE FUNCTION fn_uuid7_at(p_ms BIGINT)
+RETURNS BINARY(16)
+NOT DETERMINISTIC
+NO SQL
+BEGIN
+    DECLARE v_rand CHAR(20) DEFAULT HEX(RANDOM_BYTES(10));
+    RETURN UNHEX(CONCAT(
+        LPAD(HEX(p_ms), 12, '0'),
+        '7', SUBSTRING(v_rand, 1, 3),
+        HEX(128 | (CONV(SUBSTRING(v_rand, 4, 2), 16, 10) & 63)),
+        SUBSTRING(v_rand, 6, 14)
+    ));
+END$$
+
+DELIMITER ;
+
+DROP FUNCTION IF EXISTS fn_uuid7;
+DELIMITER $$
+
+CREATE FUNCTION fn_uuid7()
+RETURNS BINARY(16)
+NOT DETERMINISTIC
+NO SQL
+BEGIN
+    RETURN fn_uuid7_at(FLOOR(UNIX_TIMESTAMP(NOW(3)) * 1000));
+END$$
+
+DELIMITER ;
+
+-- ---------- New columns ----------
+ALTER TABLE `TRANSACTION`
+  ADD COLUMN txn_key BINARY(16) NULL,
+  ADD COLUMN reference VARCHAR(50) NULL,
+  ALGORITHM=INSTANT;
+
+ALTER TABLE TRANSFERS
+  ADD COLUMN transfer_key BINARY(16) NULL,
+  ADD COLUMN reference VARCHAR(50) NULL,
+  ALGORITHM=INSTANT;
+
+DROP TRIGGER IF EXISTS trg_transaction_key_backfill;
+DROP TRIGGER IF EXISTS trg_transfer_key_backfill;
+DELIMITER $$
+
+CREATE TRIGGER trg_transaction_key_backfill
+BEFORE INSERT ON `TRANSACTION`
+FOR EACH ROW
+BEGIN
+    SET NEW.txn_key = IFNULL(NEW.txn_key, fn_uuid7()),
+        NEW.reference = IFNULL(NEW.reference, NEW.transactionid);
+END$$
+
+CREATE TRIGGER trg_transfer_key_backfill
+BEFORE INSERT ON TRANSFERS
+FOR EACH ROW
+BEGIN
+    SET NEW.transfer_key = IFNULL(NEW.transfer_key, fn_uuid7()),
+        NEW.reference = IFNULL(NEW.reference, NEW.transferid);
+END$$
+
+DELIMITER ;
+
+-- ---------- Backfill ----------
+DROP PROCEDURE IF EXISTS sp_backfill_time_ordered_keys;
+DELIMITER $$
+
+CREATE PROCEDURE sp_backfill_time_ordered_keys(IN p_batch INT)
+BEGIN
+    DECLARE v_after VARCHAR(50) DEFAULT '';
+    DECLARE v_upto VARCHAR(50);
+
+    keys_loop: LOOP
+        SELECT MAX(transactionid) INTO v_upto FROM (
+            SELECT transactionid FROM `TRANSACTION`
+            WHERE transactionid > v_after ORDER BY transactionid LIMIT p_batch
+        ) AS batch;
+        IF v_upto IS NULL THEN
+            LEAVE keys_loop;
+        END IF;
+        START TRANSACTION;
+        UPDATE `TRANSACTION`
+        SET txn_key = fn_uuid7_at(FLOOR(UNIX_TIMESTAMP(IFNULL(transactiondate, NOW())) * 1000)),
+            reference = transactionid
+        WHERE transactionid > v_after AND transactionid <= v_upto AND txn_key IS NULL;
+        COMMIT;
+        SET v_after = v_upto;
+    END LOOP;
+
+    SET v_after = '';
+    transfers_loop: LOOP
+        SELECT MAX(transferid) INTO v_upto FROM (
+            SELECT transferid FROM TRANSFERS
+            WHERE transferid > v_after ORDER BY transferid LIMIT p_batch
+        ) AS batch;
+        IF v_upto IS NULL THEN
+            LEAVE transfers_loop;
+        END IF;
+        START TRANSACTION;
+        UPDATE TRANSFERS
+        SET transfer_key = fn_uuid7_at(FLOOR(UNIX_TIMESTAMP(IFNULL(transferdate, NOW())) * 1000)),
+            reference = transferid
+        WHERE transferid > v_after AND transferid <= v_upto AND transfer_key IS NULL;
+        COMMIT;
+        SET v_after = v_upto;
+    END LOOP;
+END$$
+
+DELIMITER ;
+
+CALL sp_backfill_time_ordered_keys(5000);
+DROP PROCEDURE sp_backfill_time_ordered_keys;
+
+-- ---------- Swap keys ----------
+DROP TRIGGER trg_transaction_key_backfill;
+DROP TRIGGER trg_transfer_key_backfill;
+
+ALTER TABLE `TRANSACTION`
+  MODIFY txn_key BINARY(16) NOT NULL,
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (txn_key),
+  DROP COLUMN transactionid,
+  ADD UNIQUE KEY uq_txn_reference (reference),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE `TRANSACTION` RENAME COLUMN txn_key TO transactionid, ALGORITHM=INSTANT;
+
+ALTER TABLE TRANSFERS
+  MODIFY transfer_key BINARY(16) NOT NULL,
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (transfer_key),
+  DROP COLUMN transferid,
+  ADD UNIQUE KEY uq_tr_reference (reference),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE TRANSFERS RENAME COLUMN transfer_key TO transferid, ALGORITHM=INSTANT;
+
+-- ---------- Procedures that insert ledger rows ----------
+DROP PROCEDURE IF EXISTS sp_transfer_amount;
+DELIMITER $$
+
+CREATE PROCEDURE sp_transfer_amount(
+    IN p_from_acc VARCHAR(20),
+    IN p_to_acc VARCHAR(20),
+    IN p_amount DECIMAL(12,2),
+    IN p_emp_id VARCHAR(20)
+)
+BEGIN
+    DECLARE v_locked INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    -- An IN-list on the primary key is scanned in key order, so this
+    -- locks both accounts in accno order, like transfers.py does.
+    SELECT COUNT(*) INTO v_locked
+    FROM ACCOUNTS
+    WHERE accno IN (p_from_acc, p_to_acc)
+    FOR UPDATE;
+
+    -- The trigger moves the money.
+    INSERT INTO TRANSFERS (transferid, from_accno, to_accno, amount)
+    VALUES (fn_uuid7(), p_from_acc, p_to_acc, p_amount);
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    VALUES (
+        p_emp_id,
+        'Employee',
+        CONCAT('Transferred ', p_amount, ' from ', p_from_acc, ' to ', p_to_acc),
+        '127.0.0.1',
+        'System',
+        '200'
+    );
+
+    COMMIT;
+END$$
+
+DELIMITER ;
+
+-- As in 0008, except that the per-period id is the row's reference (unique)
+-- and the key is a fresh fn_uuid7().
+DROP PROCEDURE IF EXISTS sp_accrue_interest_chunk;
+DELIMITER $$
+
+CREATE PROCEDURE sp_accrue_interest_chunk(
+    IN p_period_end DATE,
+    IN p_after VARCHAR(20),
+    IN p_upto VARCHAR(20),
+    OUT p_accounts INT,
+    OUT p_interest DECIMAL(20,2)
+)
+BEGIN
+    DECLARE v_prefix VARCHAR(12) DEFAULT CONCAT('INT', DATE_FORMAT(p_period_end, '%Y%m'), '-');
+    DECLARE v_bulk_load INT DEFAULT @financehub_bulk_load;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        SET @financehub_bulk_load = v_bulk_load;
+        RESIGNAL;
+    END;
+
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+    DROP TEMPORARY TABLE IF EXISTS tmp_interest_accrual;
+    CREATE TEMPORARY TABLE tmp_interest_accrual (
+      accno VARCHAR(20) PRIMARY KEY,
+      amount DECIMAL(12,2) NOT NULL
+    );
+
+    START TRANSACTION;
+
+    INSERT INTO tmp_interest_accrual (accno, amount)
+    SELECT a.accno, ROUND(cp.balance * a.interest_rate / 1200, 2)
+    FROM ACCOUNTS a
+    JOIN BALANCE_CHECKPOINTS cp ON cp.accno = a.accno AND cp.period_end = p_period_end
+    WHERE a.accno > p_after AND a.accno <= p_upto
+      AND a.interest_rate > 0
+      AND ROUND(cp.balance * a.interest_rate / 1200, 2) > 0
+      AND NOT EXISTS (
+          SELECT 1 FROM `TRANSACTION` t WHERE t.reference = CONCAT(v_prefix, a.accno)
+      );
+
+    -- The triggers would post one audit row and lock one balance per credit.
+    SET @financehub_bulk_load = 1;
+
+    INSERT INTO `TRANSACTION` (transactionid, reference, accno, transactiontype, amount)
+    SELECT fn_uuid7(), CONCAT(v_prefix, accno), accno, 'INTEREST', amount
+    FROM tmp_interest_accrual;
+
+    UPDATE ACCOUNTS a
+    JOIN tmp_interest_accrual i ON i.accno = a.accno
+    SET a.balance = a.balance + i.amount;
+
+    SELECT COUNT(*), IFNULL(SUM(amount), 0) INTO p_accounts, p_interest
+    FROM tmp_interest_accrual;
+
+    UPDATE BANK_SUMMARY
+    SET total_balance = total_balance + p_interest
+    WHERE slot = CONNECTION_ID() % 16;
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    SELECT accno, 'Customer',
+           CONCAT('Interest credit of amount ', amount, ' for ', DATE_FORMAT(p_period_end, '%Y-%m')),
+           '127.0.0.1', 'System', '200'
+    FROM tmp_interest_accrual;
+
+    COMMIT;
+    SET @financehub_bulk_load = v_bulk_load;
+    DROP TEMPORARY TABLE tmp_interest_accrual;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,29 @@
+-- ======================================
+-- 0012: Search indexes on CUSTOMER
+-- ======================================
+-- search.py looks customers up by CIF, identification_no, contact_no and
+-- name. CIF (primary key) and identification_no (unique) already have
+-- indexes; these add the rest, so every branch of a search is a short
+-- range seek that stops at the result limit:
+--
+--   idx_cust_name      fname prefix, and fname + lname prefix ('ravi ku')
+--   idx_cust_lname     lname prefix
+--   idx_cust_contact   contact_no prefix
+--   ft_cust_name       word prefixes in any order ('kumar ravi')
+--
+-- Account numbers are the ACCOUNTS primary key, and a customer's accounts
+-- come from idx_acc_cif_cover (0001).
+--
+-- The B-tree indexes build online. The first FULLTEXT index on a table
+-- adds a hidden FTS_DOC_ID column, a rebuild that allows reads but blocks
+-- writes to CUSTOMER while it runs.
+
+ALTER TABLE CUSTOMER
+  ADD INDEX idx_cust_name (fname, lname),
+  ADD INDEX idx_cust_lname (lname),
+  ADD INDEX idx_cust_contact (contact_no),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE CUSTOMER
+  ADD FULLTEXT INDEX ft_cust_name (fname, lname),
+  ALGORITHM=INPLACE, LOCK=SHARED;
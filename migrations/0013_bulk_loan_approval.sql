@@ -0,0 +1,129 @@
+-- ======================================
+-- 0013: Set-based loan approval
+-- ======================================
+-- sp_approve_loan approved one loan per call (a SELECT, two UPDATEs and
+-- an audit row) and never checked the loan's status, so approving a loan
+-- twice credited its account twice. sp_approve_loans_chunk approves a JSON
+-- array of loan ids in one transaction: loans that are no longer PENDING
+-- (or have no linked account) are skipped, the chosen rows are locked
+-- before their status is read, and the linked accounts are credited with
+-- one UPDATE ... JOIN over the per-account totals. BANK_SUMMARY gets the
+-- chunk's total in one update, as in sp_accrue_interest_chunk (0008).
+-- approvals.py feeds it the Loans page's approval queue in chunks.
+-- sp_approve_loan is now that procedure for a single loan, and refuses a
+-- loan that is not PENDING.
+
+-- The approval queue lists PENDING loans in loan_id order.
+ALTER TABLE LOANS
+  ADD INDEX idx_loans_status (status),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+DROP PROCEDURE IF EXISTS sp_approve_loans_chunk;
+DELIMITER $$
+
+CREATE PROCEDURE sp_approve_loans_chunk(
+    IN p_loan_ids JSON,
+    IN p_admin_id VARCHAR(20),
+    OUT p_approved INT,
+    OUT p_skipped INT,
+    OUT p_amount DECIMAL(20,2)
+)
+BEGIN
+    DECLARE v_requested INT;
+    DECLARE v_locked INT;
+    DECLARE v_bulk_load INT DEFAULT @financehub_bulk_load;
+
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        SET @financehub_bulk_load = v_bulk_load;
+        RESIGNAL;
+    END;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_loan_approval;
+    CREATE TEMPORARY TABLE tmp_loan_approval (
+      loan_id VARCHAR(20) PRIMARY KEY,
+      accno VARCHAR(20) NULL,
+      amount DECIMAL(12,2) NULL
+    );
+
+    INSERT IGNORE INTO tmp_loan_approval (loan_id)
+    SELECT loan_id
+    FROM JSON_TABLE(p_loan_ids, '$[*]' COLUMNS (loan_id VARCHAR(20) PATH '$')) AS j
+    WHERE loan_id IS NOT NULL;
+    SET v_requested = ROW_COUNT();
+
+    START TRANSACTION;
+
+    -- Lock the requested loans first, so the status read below is final.
+    SELECT COUNT(*) INTO v_locked
+    FROM tmp_loan_approval t
+    JOIN LOANS l ON l.loan_id = t.loan_id
+    FOR UPDATE OF l;
+
+    UPDATE tmp_loan_approval t
+    JOIN LOANS l ON l.loan_id = t.loan_id
+    SET t.accno = l.accno,
+        t.amount = l.loan_amount
+    WHERE l.status = 'PENDING' AND l.accno IS NOT NULL;
+
+    DELETE FROM tmp_loan_approval WHERE accno IS NULL;
+
+    UPDATE LOANS l
+    JOIN tmp_loan_approval t ON t.loan_id = l.loan_id
+    SET l.status = 'APPROVED',
+        l.approval_date = CURDATE(),
+        l.approved_by = p_admin_id;
+
+    SELECT COUNT(*), IFNULL(SUM(amount), 0) INTO p_approved, p_amount
+    FROM tmp_loan_approval;
+    SET p_skipped = v_requested - p_approved;
+
+    -- BANK_SUMMARY gets the chunk's total below instead of one update per account.
+    SET @financehub_bulk_load = 1;
+
+    -- A multi-table UPDATE changes each account once, however many of its
+    -- loans matched, so the credits are summed per account first. A
+    -- deadlock with a concurrent transfer rolls the whole chunk back, and
+    -- approvals.py runs it again.
+    UPDATE ACCOUNTS a
+    JOIN (
+        SELECT accno, SUM(amount) AS amount FROM tmp_loan_approval GROUP BY accno
+    ) AS c ON c.accno = a.accno
+    SET a.balance = a.balance + c.amount;
+
+    UPDATE BANK_SUMMARY
+    SET total_balance = total_balance + p_amount
+    WHERE slot = CONNECTION_ID() % 16;
+
+    INSERT INTO AUDIT_STAGING (user_id, user_type, action, ip_address, user_agent, status_code)
+    SELECT accno, 'Customer', CONCAT('Loan Approved for ', accno, ' Amount: ', amount),
+           '127.0.0.1', 'System', '200'
+    FROM tmp_loan_approval;
+
+    COMMIT;
+    SET @financehub_bulk_load = v_bulk_load;
+    DROP TEMPORARY TABLE tmp_loan_approval;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_approve_loan;
+DELIMITER $$
+
+CREATE PROCEDURE sp_approve_loan(
+    IN p_loan_id VARCHAR(50),
+    IN p_admin_id VARCHAR(50)
+)
+BEGIN
+    DECLARE v_approved INT;
+    DECLARE v_skipped INT;
+    DECLARE v_amount DECIMAL(20,2);
+
+    CALL sp_approve_loans_chunk(JSON_ARRAY(p_loan_id), p_admin_id, v_approved, v_skipped, v_amount);
+    IF v_approved = 0 THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Loan not found or not PENDING';
+    END IF;
+END$$
+
+DELIMITER ;
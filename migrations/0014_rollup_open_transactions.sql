@@ -0,0 +1,105 @@
+-- ======================================
+-- 0014: Rollup high-water mark held back by open transactions
+-- ======================================
+-- sp_refresh_daily_rollups (0006) advanced its high-water mark to
+-- NOW() - 60s. A ledger row is stamped when its INSERT starts but only
+-- becomes visible when its transaction commits, so a transaction open for
+-- longer than the lag (a large bulk-ingest chunk, say) committed rows
+-- below the mark, and no later refresh read them again.
+--
+-- fn_rollup_horizon() now stops the mark at the start of the oldest open
+-- read-write transaction (information_schema.INNODB_TRX), less a few
+-- seconds. Any row still to commit was stamped after its transaction
+-- started, so it lands in a later window however long that transaction
+-- runs; the lag only covers a row stamped in the second before its
+-- transaction shows up in INNODB_TRX. Reading INNODB_TRX needs the
+-- PROCESS privilege, for the event's definer and for rollups.py's user.
+
+DROP FUNCTION IF EXISTS fn_rollup_horizon;
+DELIMITER $$
+
+-- Ledger rows stamped before this time are all committed (or rolled back).
+-- Read-only transactions never write ledger rows, and the caller's own
+-- transaction is not waited for.
+CREATE FUNCTION fn_rollup_horizon(p_lag_seconds INT)
+RETURNS DATETIME
+READS SQL DATA
+BEGIN
+    DECLARE v_oldest DATETIME;
+
+    SELECT MIN(trx_started) INTO v_oldest
+    FROM information_schema.INNODB_TRX
+    WHERE trx_mysql_thread_id <> CONNECTION_ID() AND trx_is_read_only = 0;
+    RETURN LEAST(NOW(), IFNULL(v_oldest, NOW())) - INTERVAL p_lag_seconds SECOND;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_refresh_daily_rollups;
+DELIMITER $$
+
+-- As in 0006, up to fn_rollup_horizon() instead of NOW() - p_lag_seconds.
+CREATE PROCEDURE sp_refresh_daily_rollups(IN p_lag_seconds INT, OUT p_rows INT)
+BEGIN
+    DECLARE v_from DATETIME;
+    DECLARE v_to DATETIME;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    SET p_rows = 0;
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+    START TRANSACTION;
+    SELECT high_water INTO v_from FROM ROLLUP_STATE WHERE name = 'daily' FOR UPDATE;
+    IF v_from IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Rollups not initialised; CALL sp_rebuild_daily_rollups()';
+    END IF;
+    SET v_to = fn_rollup_horizon(p_lag_seconds);
+    IF v_to > v_from THEN
+        CALL sp_apply_rollup_window(v_from, v_to, p_rows);
+        UPDATE ROLLUP_STATE SET high_water = v_to, refreshed_at = NOW() WHERE name = 'daily';
+    ELSE
+        UPDATE ROLLUP_STATE SET refreshed_at = NOW() WHERE name = 'daily';
+    END IF;
+    COMMIT;
+END$$
+
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS sp_rebuild_daily_rollups;
+DELIMITER $$
+
+-- As in 0006, up to fn_rollup_horizon(), so a rebuild during a long bulk
+-- load does not skip that load's rows either.
+CREATE PROCEDURE sp_rebuild_daily_rollups()
+BEGIN
+    DECLARE v_to DATETIME;
+    DECLARE v_rows INT;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+    START TRANSACTION;
+    INSERT INTO ROLLUP_STATE (name, high_water) VALUES ('daily', '1000-01-01 00:00:00')
+    ON DUPLICATE KEY UPDATE high_water = high_water;
+    SET v_to = fn_rollup_horizon(5);
+    DELETE FROM DAILY_ACCOUNT_ROLLUP;
+    DELETE FROM ACCOUNT_LEDGER_TOTALS;
+    DELETE FROM CUSTOMER_LEDGER_TOTALS;
+    CALL sp_apply_rollup_window('1000-01-01 00:00:00', v_to, v_rows);
+    UPDATE ROLLUP_STATE SET high_water = v_to, refreshed_at = NOW() WHERE name = 'daily';
+    COMMIT;
+END$$
+
+DELIMITER ;
+
+DROP EVENT IF EXISTS ev_refresh_daily_rollups;
+CREATE EVENT ev_refresh_daily_rollups
+  ON SCHEDULE EVERY 1 MINUTE
+  DO CALL sp_refresh_daily_rollups(5, @rollup_rows);
@@ -0,0 +1,260 @@
+# partitions.py — monthly partitions of the ledger and audit tables, and their archival
+"""
+Usage:
+    python partitions.py ensure [--ahead 3] [--since 2022-01-01]
+    python partitions.py status
+    python partitions.py archive [--retention 24] [--export-dir /backups/financehub] [--dry-run]
+
+TRANSACTION, TRANSFERS and AUDIT_LOGS are RANGE-partitioned by month
+(migration 0011): pYYYYMM holds the rows dated in that month, p_future
+everything after the last one. `ensure` splits p_future so that --ahead
+months beyond the current one always exist; run it from cron at least
+monthly. --since splits the oldest partition back to that date, for loads
+of backdated history (datagen.py does this itself).
+
+`archive` detaches every month older than --retention whole months with
+ALTER TABLE ... EXCHANGE PARTITION, a metadata swap with an empty table
+that leaves the live table's other partitions untouched, copies the
+detached rows into the compressed *_ARCHIVE table (or, with --export-dir,
+into one gzipped CSV file per month), then drops the emptied partition. No
+row is deleted from a live table. Archived months are recorded in
+ARCHIVE_LOG, and a run that stopped halfway picks up where it left off.
+Months exported to files are no longer queryable; months in the archive
+tables still are (statements.py, the Audit Logs page).
+"""
+import os
+import csv
+import gzip
+import argparse
+from datetime import date, datetime, time, timedelta
+
+import db
+import ids
+import checkpoints
+
+PARTITIONED = {"TRANSACTION": "transactiondate", "TRANSFERS": "transferdate", "AUDIT_LOGS": "timestamp"}
+ARCHIVES = {table: f"{table}_ARCHIVE" for table in PARTITIONED}
+DEFAULT_AHEAD = 3
+DEFAULT_RETENTION = 24
+FUTURE = "PARTITION p_future VALUES LESS THAN MAXVALUE"
+
+PARTITIONS_SQL = """
+    SELECT PARTITION_NAME, TABLE_ROWS, DATA_LENGTH + INDEX_LENGTH
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+LOG_SQL = "INSERT INTO ARCHIVE_LOG (table_name, month, row_count, destination) VALUES (%s,%s,%s,%s)"
+
+
+# ---------- Months ----------
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first, last):
+    """First days of the months ``first`` through ``last``, inclusive."""
+    out, month = [], first.replace(day=1)
+    while month <= last:
+        out.append(month)
+        month = add_months(month, 1)
+    return out
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def definition(month):
+    return (f"PARTITION {partition_name(month)} "
+            f"VALUES LESS THAN (UNIX_TIMESTAMP('{add_months(month, 1)} 00:00:00'))")
+
+
+def partitions(cur, table):
+    """``[(name, estimated rows, bytes)]`` of ``table`` in range order; empty if it is not partitioned."""
+    cur.execute(PARTITIONS_SQL, (table,))
+    return cur.fetchall()
+
+
+def monthly(cur, table):
+    """The months ``table`` has a pYYYYMM partition for, oldest first."""
+    return [datetime.strptime(name[1:], "%Y%m").date()
+            for name, _, _ in partitions(cur, table) if name != "p_future"]
+
+
+# ---------- Future Partitions ----------
+def ensure(ahead=DEFAULT_AHEAD, since=None, progress=print):
+    """Partition every month through ``ahead`` months from now (and back to ``since``); returns how many were added.
+
+    Splitting p_future is quick while it is empty, which is what running
+    this ahead of time guarantees.
+    """
+    last = add_months(date.today().replace(day=1), ahead)
+    added = 0
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            for table in PARTITIONED:
+                months = monthly(cur, table)
+                if not months:
+                    progress(f"{table}: not partitioned; run python migrate.py first")
+                    continue
+                new = months_between(add_months(months[-1], 1), last)
+                if new:
+                    cur.execute(f"ALTER TABLE `{table}` REORGANIZE PARTITION p_future INTO ("
+                                + ", ".join(definition(m) for m in new) + f", {FUTURE})")
+                    progress(f"{table}: added {partition_name(new[0])}..{partition_name(new[-1])}")
+                older = months_between(since, add_months(months[0], -1)) if since else []
+                if older:
+                    first = months[0]
+                    cur.execute(f"ALTER TABLE `{table}` REORGANIZE PARTITION {partition_name(first)} INTO ("
+                                + ", ".join(definition(m) for m in older + [first]) + ")")
+                    progress(f"{table}: split {partition_name(first)} back to {partition_name(older[0])}")
+                added += len(new) + len(older)
+    return added
+
+
+# ---------- Archival ----------
+def _has_rows(cur, table, partition=None):
+    where = f" PARTITION ({partition})" if partition else ""
+    cur.execute(f"SELECT 1 FROM `{table}`{where} LIMIT 1")
+    return bool(cur.fetchall())
+
+
+def _logged(cur, table, month):
+    cur.execute("SELECT 1 FROM ARCHIVE_LOG WHERE table_name=%s AND month=%s", (table, month))
+    return bool(cur.fetchall())
+
+
+def _detach(cur, table, month, staging):
+    """Swap the month's partition with the empty ``staging`` table, creating it if needed."""
+    name = partition_name(month)
+    cur.execute("SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (staging,))
+    if not cur.fetchall():
+        cur.execute(f"CREATE TABLE `{staging}` LIKE `{table}`")
+    if partitions(cur, staging):
+        cur.execute(f"ALTER TABLE `{staging}` REMOVE PARTITIONING")
+    if not _has_rows(cur, table, name):
+        return  # already swapped by an earlier run, or an empty month
+    if _has_rows(cur, staging):
+        raise RuntimeError(f"{staging} and {table}.{name} both hold rows; resolve by hand")
+    cur.execute(f"ALTER TABLE `{table}` EXCHANGE PARTITION {name} WITH TABLE `{staging}`")
+
+
+def _export(cur, staging, path):
+    """Stream ``staging`` into a gzipped CSV at ``path``; returns the row count."""
+    rows = 0
+    partial = path + ".part"
+    cur.execute(f"SELECT * FROM `{staging}`")
+    with gzip.open(partial, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(cur.column_names)
+        for row in cur:
+            writer.writerow([ids.to_text(v) if isinstance(v, (bytes, bytearray)) and len(v) == 16 else v
+                             for v in row])
+            rows += 1
+    os.replace(partial, path)
+    return rows
+
+
+def archive_month(conn, table, month, export_dir=None, progress=print):
+    """Move one month of ``table`` out of the live table; returns the rows moved."""
+    name = partition_name(month)
+    staging = f"{table}_X{name}"
+    with conn.cursor() as cur:
+        _detach(cur, table, month, staging)
+        rows = 0
+        if not _logged(cur, table, month):
+            if export_dir:
+                path = os.path.join(export_dir, f"{table}_{name}.csv.gz")
+                with conn.cursor(buffered=False) as reader:
+                    rows = _export(reader, staging, path)
+                cur.execute(LOG_SQL, (table, month, rows, path))
+            else:
+                cur.execute(f"INSERT INTO `{ARCHIVES[table]}` SELECT * FROM `{staging}`")
+                rows = cur.rowcount
+                cur.execute(LOG_SQL, (table, month, rows, ARCHIVES[table]))
+            conn.commit()
+        cur.execute(f"DROP TABLE `{staging}`")
+        cur.execute(f"ALTER TABLE `{table}` DROP PARTITION {name}")
+    progress(f"{table}.{name}: {rows:,} rows archived")
+    return rows
+
+
+def archive(retention=DEFAULT_RETENTION, export_dir=None, dry_run=False, progress=print):
+    """Archive every month that ended more than ``retention`` whole months ago; returns the rows moved.
+
+    Balance checkpoints are brought up to the cutoff first, so later
+    checkpoint builds never need the archived rows.
+    """
+    if retention < 1:
+        raise ValueError("Retention must be at least one month")
+    cutoff = add_months(date.today().replace(day=1), -retention)
+    if not dry_run:
+        checkpoints.build_through(cutoff - timedelta(days=1), progress=progress)
+    if export_dir:
+        os.makedirs(export_dir, exist_ok=True)
+    moved = 0
+    with db.get_pool().connection() as conn:
+        for table in PARTITIONED:
+            with conn.cursor() as cur:
+                months = [m for m in monthly(cur, table) if add_months(m, 1) <= cutoff]
+            for month in months:
+                if dry_run:
+                    progress(f"{table}.{partition_name(month)} would be archived")
+                else:
+                    moved += archive_month(conn, table, month, export_dir, progress)
+    if moved:
+        db.query_cache.invalidate(set(PARTITIONED) | set(ARCHIVES.values()) | {"ARCHIVE_LOG"})
+    return moved
+
+
+# ---------- Lookups ----------
+def archived_until(*tables):
+    """Start of the oldest month still live in ``tables``: rows before it are archived. None if nothing is."""
+    placeholders = ",".join(["%s"] * len(tables))
+    row = db.fetch_one(f"SELECT MAX(month) AS month FROM ARCHIVE_LOG WHERE table_name IN ({placeholders})",
+                       tables)
+    if not row or row["month"] is None:
+        return None
+    return datetime.combine(add_months(row["month"], 1), time.min)
+
+
+def status(progress=print):
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            for table in PARTITIONED:
+                parts = partitions(cur, table)
+                progress(f"{table}: {len(parts)} partitions")
+                for name, rows, size in parts:
+                    progress(f"  {name:<10} ~{rows or 0:>12,} rows {(size or 0) / 2**20:>10,.1f} MB")
+            cur.execute("SELECT table_name, MIN(month), MAX(month), SUM(row_count) FROM ARCHIVE_LOG "
+                        "GROUP BY table_name ORDER BY table_name")
+            for table, first, last, rows in cur.fetchall():
+                progress(f"{table}: {first:%Y-%m}..{last:%Y-%m} archived, {rows:,} rows")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of the ledger and audit tables")
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("ensure", help="create future monthly partitions")
+    up.add_argument("--ahead", type=int, default=DEFAULT_AHEAD, help="months beyond the current one")
+    up.add_argument("--since", type=date.fromisoformat, help="also split the oldest partition back to this date")
+    sub.add_parser("status", help="list partitions and archived months")
+    arch = sub.add_parser("archive", help="move months past the retention window out of the live tables")
+    arch.add_argument("--retention", type=int, default=DEFAULT_RETENTION, help="whole months kept live")
+    arch.add_argument("--export-dir", help="write gzipped CSV files here instead of the *_ARCHIVE tables")
+    arch.add_argument("--dry-run", action="store_true", help="only list the months that would move")
+    args = parser.parse_args(argv)
+
+    if args.command == "ensure":
+        print(f"{ensure(args.ahead, args.since)} partitions added")
+    elif args.command == "status":
+        status()
+    else:
+        print(f"{archive(args.retention, args.export_dir, args.dry_run):,} rows archived")
+
+
+if __name__ == "__main__":
+    main()
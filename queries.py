@@ -0,0 +1,172 @@
+# queries.py — SQL for the hot read paths, shared by the app and the plan checks in migrate.py
+import os
+from datetime import date, datetime, time, timedelta
+
+from db import page_query
+import search
+
+# Recent-activity listings only look this far back, so they read the newest
+# monthly partitions of TRANSACTION, TRANSFERS and AUDIT_LOGS and no others.
+RECENT_DAYS = int(os.getenv("RECENT_DAYS", "90"))
+
+
+def recent_since(days=RECENT_DAYS):
+    """Start of the recent-activity window: midnight ``days`` ago, the same all day so cache keys are too."""
+    return datetime.combine(date.today() - timedelta(days=days), time.min)
+
+
+# Employees and customers share the login form; one round trip fetches
+# both candidate rows (two primary-key lookups).
+PRINCIPAL_LOOKUP = """
+    SELECT 'employee' AS kind, pfno AS id, empname AS name, designation,
+           NULL AS fname, NULL AS lname, password_hash
+    FROM EMPLOYEE WHERE pfno = %s
+    UNION ALL
+    SELECT 'customer', cif, NULL, NULL, fname, lname, password_hash
+    FROM CUSTOMER WHERE cif = %s
+"""
+
+DASHBOARD_SUMMARY = """
+    SELECT SUM(customer_count) AS customers, SUM(account_count) AS accounts, SUM(total_balance) AS total
+    FROM BANK_SUMMARY
+"""
+
+CUSTOMER_ACCOUNTS = "SELECT accno, accttype, balance FROM ACCOUNTS WHERE cif=%s"
+
+# Report aggregates read the rollups maintained by sp_refresh_daily_rollups
+# (migrations/0006), never the raw ledger.
+ACCOUNT_TOTALS_COLUMNS = {c: c for c in ("accno", "cif", "deposits", "withdrawals", "transfers_in",
+                                          "transfers_out", "net")}
+CUSTOMER_TOTALS_COLUMNS = {"cif": "t.cif", "fname": "c.fname", "lname": "c.lname",
+                           "deposits": "t.deposits", "withdrawals": "t.withdrawals", "net": "t.net"}
+
+DAILY_ACTIVITY = """
+    SELECT day, SUM(deposits) AS deposits, SUM(withdrawals) AS withdrawals,
+           SUM(transfers_in) AS transfers, SUM(entries) AS entries
+    FROM DAILY_ACCOUNT_ROLLUP
+    WHERE day >= %s
+    GROUP BY day
+    ORDER BY day
+"""
+
+ROLLUP_FRESHNESS = "SELECT high_water, refreshed_at FROM ROLLUP_STATE WHERE name = 'daily'"
+
+RECENT_TRANSACTIONS = """
+    SELECT BIN_TO_UUID(transactionid) AS transactionid, accno, transactiontype, amount, transactiondate, makerid
+    FROM `TRANSACTION`
+    WHERE transactiondate >= %s
+    ORDER BY transactiondate DESC
+    LIMIT 50
+"""
+
+# One backward index seek per account (idx_txn_acc_date) instead of an
+# IN-subquery over the whole ledger; only accounts x 50 rows are merged.
+# Parameters: (recent_since(), cif).
+CUSTOMER_RECENT_TRANSACTIONS = """
+    SELECT BIN_TO_UUID(t.transactionid) AS transactionid, t.accno, t.transactiontype, t.amount, t.transactiondate
+    FROM ACCOUNTS a,
+    LATERAL (
+        SELECT transactionid, accno, transactiontype, amount, transactiondate
+        FROM `TRANSACTION`
+        WHERE accno = a.accno AND transactiondate >= %s
+        ORDER BY transactiondate DESC
+        LIMIT 50
+    ) AS t
+    WHERE a.cif = %s
+    ORDER BY t.transactiondate DESC
+    LIMIT 50
+"""
+
+RECENT_TRANSFERS = """
+    SELECT BIN_TO_UUID(transferid) AS transferid, from_accno, to_accno, amount, transferdate
+    FROM TRANSFERS
+    WHERE transferdate >= %s
+    ORDER BY transferdate DESC
+    LIMIT 50
+"""
+
+# The OR across two IN-subqueries becomes a UNION ALL of two index seeks
+# (idx_tr_from_date, idx_tr_to_date) per account. DISTINCT folds transfers
+# between two accounts of the same customer back into one row.
+# Parameters: (recent_since(), recent_since(), cif).
+CUSTOMER_RECENT_TRANSFERS = """
+    SELECT DISTINCT BIN_TO_UUID(t.transferid) AS transferid, t.from_accno, t.to_accno, t.amount, t.transferdate
+    FROM ACCOUNTS a,
+    LATERAL (
+        (SELECT transferid, from_accno, to_accno, amount, transferdate
+         FROM TRANSFERS
+         WHERE from_accno = a.accno AND transferdate >= %s
+         ORDER BY transferdate DESC
+         LIMIT 50)
+        UNION ALL
+        (SELECT transferid, from_accno, to_accno, amount, transferdate
+         FROM TRANSFERS
+         WHERE to_accno = a.accno AND transferdate >= %s
+         ORDER BY transferdate DESC
+         LIMIT 50)
+    ) AS t
+    WHERE a.cif = %s
+    ORDER BY t.transferdate DESC
+    LIMIT 50
+"""
+
+AUDIT_LOG_COLUMNS = {c: c for c in ("logid", "user_id", "user_type", "action", "ip_address",
+                                     "user_agent", "timestamp", "status_code")}
+
+CUSTOMER_LOANS = """
+    SELECT loan_id, accno, loan_amount, loan_type, interest_rate, tenure_months, status, approval_date
+    FROM LOANS
+    WHERE cif=%s
+    ORDER BY loan_id
+"""
+
+HIGH_VALUE_CUSTOMERS = "cif IN (SELECT cif FROM ACCOUNTS WHERE balance > 50000)"
+
+# The Loans page's approval queue (approvals.py approves the selection).
+PENDING_LOANS = "status = 'PENDING'"
+LOAN_QUEUE_COLUMNS = {c: c for c in ("loan_id", "cif", "accno", "loan_amount", "loan_type",
+                                     "interest_rate", "tenure_months")}
+
+# (name, sql, params, bounded_sort). Params name sample values that
+# migrate.py check-plans fills in from the database ("recent" is
+# recent_since()). bounded_sort marks
+# queries whose final ORDER BY only merges a few already-limited per-account
+# (or per-search-branch) seeks, where a small filesort is expected and harmless.
+_high_value_sql, _high_value_args = page_query(
+    "CUSTOMER", {c: c for c in ("cif", "fname", "lname", "contact_no", "homebranch", "opening_date")},
+    key="cif", where=HIGH_VALUE_CUSTOMERS,
+)
+
+# The Audit Logs page bounds its listing the same way.
+AUDIT_RECENT = "timestamp >= %s"
+
+_audit_sql, _audit_args = page_query(
+    "AUDIT_LOGS", AUDIT_LOG_COLUMNS, key="logid", sort="timestamp", descending=True, limit=200,
+    where=AUDIT_RECENT, params=("recent",),
+)
+_user_audit_sql, _user_audit_args = page_query(
+    "AUDIT_LOGS", AUDIT_LOG_COLUMNS, key="logid", sort="timestamp", descending=True, limit=200,
+    where=AUDIT_RECENT, params=("recent",), filters={"user_id": ("=", "user_id")},
+)
+
+_loan_queue_sql, _loan_queue_args = page_query(
+    "LOANS", LOAN_QUEUE_COLUMNS, key="loan_id", where=PENDING_LOANS, limit=200,
+)
+
+# The staff typeahead (search.py): a name search runs every customer branch.
+_customer_search_sql, _customer_search_args = search.customer_query("ravi kumar")
+_account_search_sql, _account_search_args = search.account_query("ravi")
+
+HOT_QUERIES = [
+    ("recent_transactions", RECENT_TRANSACTIONS, ("recent",), False),
+    ("customer_recent_transactions", CUSTOMER_RECENT_TRANSACTIONS, ("recent", "cif"), True),
+    ("recent_transfers", RECENT_TRANSFERS, ("recent",), False),
+    ("customer_recent_transfers", CUSTOMER_RECENT_TRANSFERS, ("recent", "recent", "cif"), True),
+    ("recent_audit_logs", _audit_sql, tuple(_audit_args), False),
+    ("user_audit_logs", _user_audit_sql, tuple(_user_audit_args), False),
+    ("customer_loans", CUSTOMER_LOANS, ("cif",), False),
+    ("high_value_customers", _high_value_sql, tuple(_high_value_args), False),
+    ("loan_approval_queue", _loan_queue_sql, tuple(_loan_queue_args), False),
+    ("customer_search", _customer_search_sql, tuple(_customer_search_args), True),
+    ("account_search", _account_search_sql, tuple(_account_search_args), True),
+]
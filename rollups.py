@@ -0,0 +1,77 @@
+# rollups.py — keep the daily ledger rollups behind the Reports page current
+"""
+Usage:
+    python rollups.py                 refresh continuously every --interval seconds
+    python rollups.py --once          fold in what is new now and exit
+    python rollups.py --rebuild       recompute all rollups from the full ledger
+
+Migration 0006 schedules the same refresh every minute as a MySQL event.
+Run this instead on servers where event_scheduler is OFF. Each refresh only
+reads ledger rows newer than the high-water mark in ROLLUP_STATE, and never
+moves the mark past the start of a transaction still open (migration 0014),
+so rows of a long-running load are folded in once it commits.
+"""
+import time
+import logging
+import argparse
+
+from mysql.connector import Error
+
+import db
+
+log = logging.getLogger("financehub.rollups")
+
+DEFAULT_LAG = 5
+
+
+def refresh(lag_seconds=DEFAULT_LAG):
+    """Fold committed ledger rows into the rollups, ``lag_seconds`` short of the horizon; returns account-days touched."""
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            result = cur.callproc("sp_refresh_daily_rollups", (lag_seconds, 0))
+            conn.commit()
+    db.query_cache.invalidate(db.ROLLUP_TABLES)
+    return result[1] or 0
+
+
+def rebuild():
+    with db.get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.callproc("sp_rebuild_daily_rollups", ())
+            conn.commit()
+    db.query_cache.invalidate(db.ROLLUP_TABLES)
+
+
+def freshness():
+    """``{"high_water", "refreshed_at"}`` of the daily rollups, or None before the first build."""
+    return db.fetch_one("SELECT high_water, refreshed_at FROM ROLLUP_STATE WHERE name = 'daily'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the daily ledger rollups")
+    parser.add_argument("--interval", type=float, default=60.0, help="seconds between refreshes")
+    parser.add_argument("--lag", type=int, default=DEFAULT_LAG,
+                        help="leave N seconds before the oldest open transaction for the next run")
+    parser.add_argument("--once", action="store_true", help="refresh once and exit")
+    parser.add_argument("--rebuild", action="store_true", help="recompute from the full ledger and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.rebuild:
+        rebuild()
+        log.info("rollups rebuilt")
+        return
+    while True:
+        try:
+            touched = refresh(args.lag)
+            if touched:
+                log.info("rolled up %d account-days", touched)
+        except Error as e:
+            log.error("rollup refresh failed: %s", e)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# search.py — customer and account lookup for the staff typeahead
+"""
+Usage:
+    import search
+    search.customers("ravi ku")     # [{cif, name, contact_no, identification_no}], best match first
+    search.accounts("10023")        # [{accno, cif, name, accttype, balance}], best match first
+
+A term is matched by prefix against the CIF, identification_no and
+contact_no, and against the customer's name: one word against fname or
+lname, several words against fname + lname and, through the FULLTEXT
+index, against word prefixes in any order. accounts() also matches the
+account number, and lists the accounts of every matching customer. Each
+branch of the search is an index range seek cut off at the result limit
+(migration 0012), so a search reads a few dozen index entries however
+large CUSTOMER and ACCOUNTS grow.
+
+Terms shorter than MIN_CHARS match nothing. Results are kept in a small
+LRU of their own (SEARCH_CACHE_SIZE entries for SEARCH_CACHE_TTL seconds),
+so typeahead traffic does not evict page queries from the shared read
+cache; an entry is dropped as soon as CUSTOMER or ACCOUNTS is written
+through db.py.
+"""
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+
+import db
+
+MIN_CHARS = 2
+DEFAULT_LIMIT = 10
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "256"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "30"))
+FULLTEXT_MIN_WORD = 3  # innodb_ft_min_token_size: shorter words are not indexed
+SEARCHED = ("ACCOUNTS", "CUSTOMER")
+
+_WORD_RE = re.compile(r"\w+")
+_PHONE_RE = re.compile(r"\+?[\d\s-]+")
+
+CUSTOMER_SQL = """
+    SELECT c.cif, CONCAT_WS(' ', c.fname, c.lname) AS name, c.contact_no, c.identification_no
+    FROM (
+        SELECT cif, MIN(tier) AS tier FROM ({hits}) AS hits
+        GROUP BY cif ORDER BY tier, cif LIMIT %s
+    ) AS top
+    JOIN CUSTOMER c ON c.cif = top.cif
+    ORDER BY top.tier, c.cif
+"""
+
+ACCOUNT_SQL = """
+    SELECT a.accno, a.cif, CONCAT_WS(' ', c.fname, c.lname) AS name, a.accttype, a.balance
+    FROM (
+        SELECT accno, MIN(tier) AS tier FROM ({hits}) AS hits
+        GROUP BY accno ORDER BY tier, accno LIMIT %s
+    ) AS top
+    JOIN ACCOUNTS a ON a.accno = top.accno
+    LEFT JOIN CUSTOMER c ON c.cif = a.cif
+    ORDER BY top.tier, a.accno
+"""
+
+
+# ---------- Result Cache ----------
+class ResultCache:
+    """Small LRU of search results, valid while CUSTOMER and ACCOUNTS are unchanged.
+
+    Entries carry the shared read cache's table versions from before the
+    search ran, so a search racing a write is never served afterwards.
+    """
+
+    def __init__(self, size=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (rows, expires_at, versions)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            rows, expires_at, versions = entry
+            if expires_at <= time.monotonic() or versions != db.query_cache.versions(SEARCHED):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return rows
+
+    def put(self, key, rows, versions):
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (rows, time.monotonic() + self.ttl, versions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+result_cache = ResultCache()
+
+
+# ---------- Queries ----------
+def _customer_hits(term, limit):
+    """UNION ALL branches yielding ``(cif, tier)`` for the customers matching ``term``, and their args.
+
+    Lower tiers are better matches: identifiers before names, exact
+    prefixes before FULLTEXT word matches.
+    """
+    words = _WORD_RE.findall(term)
+    branches, args = [], []
+
+    def add(tier, where, order, *values):
+        order = f" ORDER BY {order}" if order else ""
+        branches.append(f"(SELECT cif, {tier} AS tier FROM CUSTOMER WHERE {where}{order} LIMIT %s)")
+        args.extend(values + (limit,))
+
+    if " " not in term:
+        add(1, "cif LIKE %s", "cif", db.like_prefix(term))
+        add(2, "identification_no LIKE %s", "identification_no", db.like_prefix(term))
+    if _PHONE_RE.fullmatch(term):
+        add(3, "contact_no LIKE %s", "contact_no", db.like_prefix(re.sub(r"[\s-]", "", term)))
+    if any(not w.isdigit() for w in words):
+        if len(words) == 1:
+            add(4, "fname LIKE %s", "fname, lname", db.like_prefix(words[0]))
+            add(4, "lname LIKE %s", "lname", db.like_prefix(words[0]))
+        else:
+            add(4, "fname LIKE %s AND lname LIKE %s", "fname, lname",
+                db.like_prefix(words[0]), db.like_prefix(words[-1]))
+            indexed = [w for w in words if len(w) >= FULLTEXT_MIN_WORD]
+            if indexed:
+                add(5, "MATCH(fname, lname) AGAINST (%s IN BOOLEAN MODE)", None,
+                    " ".join(f"+{w}*" for w in indexed))
+    return branches, args
+
+
+def customer_query(term, limit=DEFAULT_LIMIT):
+    """``(sql, args)`` of the customer search for ``term``, or None if nothing could match."""
+    branches, args = _customer_hits(term, limit)
+    if not branches:
+        return None
+    return CUSTOMER_SQL.format(hits=" UNION ALL ".join(branches)), args + [limit]
+
+
+def account_query(term, limit=DEFAULT_LIMIT):
+    """``(sql, args)`` of the account search for ``term``, or None if nothing could match."""
+    branches, args = [], []
+    if " " not in term:
+        branches.append("(SELECT accno, 0 AS tier FROM ACCOUNTS WHERE accno LIKE %s ORDER BY accno LIMIT %s)")
+        args += [db.like_prefix(term), limit]
+    customers, customer_args = _customer_hits(term, limit)
+    if customers:
+        branches.append("SELECT a.accno, c.tier FROM (" + " UNION ALL ".join(customers) + ") AS c "
+                        "JOIN ACCOUNTS a ON a.cif = c.cif")
+        args += customer_args
+    if not branches:
+        return None
+    return ACCOUNT_SQL.format(hits=" UNION ALL ".join(branches)), args + [limit]
+
+
+# ---------- Search ----------
+def _search(kind, build, term, limit):
+    term = " ".join((term or "").split())
+    if len(term) < MIN_CHARS:
+        return []
+    key = (kind, term.lower(), limit)
+    rows = result_cache.get(key)
+    if rows is not None:
+        return list(rows)
+    query = build(term, limit)
+    if query is None:
+        return []
+    versions = db.query_cache.versions(SEARCHED)
+    rows = db.fetch_all(*query, cache=False)
+    # An empty list is also what fetch_all returns while MySQL is down.
+    if rows:
+        result_cache.put(key, tuple(rows), versions)
+    return rows
+
+
+def customers(term, limit=DEFAULT_LIMIT):
+    """Up to ``limit`` customers matching ``term``, best first."""
+    return _search("customer", customer_query, term, limit)
+
+
+def accounts(term, limit=DEFAULT_LIMIT):
+    """Up to ``limit`` accounts whose number or owner matches ``term``, best first."""
+    return _search("account", account_query, term, limit)
@@ -0,0 +1,204 @@
+# statements.py — stream account statements for any date range as CSV or Parquet
+"""
+Usage:
+    python statements.py A001 --from 2021-01-01 --to 2025-12-31 [-o statement.csv]
+    python statements.py A001 --from 2021-01-01 --to 2025-12-31 --format parquet -o statement.parquet
+
+A statement merges the account's deposits and withdrawals, transfers in both
+directions and approved loan credits into one ledger ordered by time, with
+a running balance that starts from the checkpointed opening balance (see
+checkpoints.py). Ranges reaching back into archived months also read the
+*_ARCHIVE tables (see partitions.py). Rows are read through an unbuffered cursor and written out
+in small batches, so memory use does not depend on the length of the range.
+Parquet output needs pyarrow, which is optional.
+"""
+import io
+import csv
+import sys
+import argparse
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import db
+import partitions
+import checkpoints
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+BATCH_ROWS = 5000
+COLUMNS = ("date", "reference", "type", "description", "debit", "credit", "balance")
+
+# One index range per source (idx_txn_acc_date, idx_tr_from_date,
+# idx_tr_to_date, idx_loans_acc_approval); the merge sort happens in MySQL.
+# Each source takes (accno, from, to).
+LEDGER_SOURCES = """
+        SELECT transactiondate AS ts, BIN_TO_UUID(transactionid) AS ref, transactiontype AS kind,
+               CONCAT('Teller ', IFNULL(makerid, 'self')) AS description,
+               CASE WHEN transactiontype IN ('WITHDRAW', 'WITHDRAWAL') THEN -amount ELSE amount END AS delta
+        FROM {transactions}
+        WHERE accno = %s AND transactiondate >= %s AND transactiondate < %s
+        UNION ALL
+        SELECT transferdate, BIN_TO_UUID(transferid), 'TRANSFER OUT', CONCAT('To ', to_accno), -amount
+        FROM {transfers}
+        WHERE from_accno = %s AND transferdate >= %s AND transferdate < %s
+        UNION ALL
+        SELECT transferdate, BIN_TO_UUID(transferid), 'TRANSFER IN', CONCAT('From ', from_accno), amount
+        FROM {transfers}
+        WHERE to_accno = %s AND transferdate >= %s AND transferdate < %s
+"""
+LOAN_CREDITS = """
+        SELECT approval_date, loan_id, 'LOAN CREDIT', CONCAT(IFNULL(loan_type, ''), ' loan disbursal'), loan_amount
+        FROM LOANS
+        WHERE accno = %s AND status = 'APPROVED' AND approval_date >= %s AND approval_date < %s
+"""
+
+
+def ledger_sql(archived=False):
+    """The statement query and its number of sources; ``archived`` adds the *_ARCHIVE tables."""
+    tables = [("`TRANSACTION`", "TRANSFERS")]
+    if archived:
+        tables.append(("TRANSACTION_ARCHIVE", "TRANSFERS_ARCHIVE"))
+    parts = [LEDGER_SOURCES.format(transactions=t, transfers=tr) for t, tr in tables] + [LOAN_CREDITS]
+    query = ("SELECT ts, ref, kind, description, delta FROM ("
+             + "UNION ALL".join(parts) + ") AS ledger ORDER BY ts, ref")
+    return query, 3 * len(tables) + 1
+
+
+class Statement:
+    """One account's statement for ``start``..``end`` (inclusive dates).
+
+    Iterating yields ``(date, reference, type, description, debit, credit,
+    balance)`` tuples, framed by an OPENING and a CLOSING balance row.
+    """
+
+    def __init__(self, accno, start, end):
+        if end < start:
+            raise ValueError("Statement end date is before its start date")
+        self.accno = accno
+        self.start = start
+        self.end = end
+        self.opening = None
+        self.closing = None
+        self.rows = 0
+
+    def __iter__(self):
+        low = datetime.combine(self.start, time.min)
+        high = datetime.combine(self.end + timedelta(days=1), time.min)
+        self.opening = Decimal(checkpoints.balance_asof(self.accno, low - timedelta(seconds=1)) or 0)
+        balance = self.opening
+        yield (low, "", "OPENING", "Opening balance", None, None, balance)
+        # Months partitions.py has archived are only read when the range reaches them.
+        archived_until = partitions.archived_until("TRANSACTION", "TRANSFERS")
+        query, sources = ledger_sql(archived=archived_until is not None and low < archived_until)
+        with db.get_pool().connection() as conn:
+            with conn.cursor(buffered=False) as cur:
+                cur.execute(query, (self.accno, low, high) * sources)
+                for ts, ref, kind, description, delta in cur:
+                    balance += delta
+                    self.rows += 1
+                    yield (ts, ref, kind, description,
+                           -delta if delta < 0 else None, delta if delta > 0 else None, balance)
+        self.closing = balance
+        yield (high - timedelta(seconds=1), "", "CLOSING", "Closing balance", None, None, balance)
+
+
+def account_exists(accno):
+    return db.fetch_one("SELECT accno FROM ACCOUNTS WHERE accno=%s", (accno,)) is not None
+
+
+# ---------- Writers ----------
+def iter_csv(statement):
+    """Yield the statement as CSV text, a batch of lines at a time."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMNS)
+    for i, row in enumerate(statement, 1):
+        writer.writerow(row)
+        if i % BATCH_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def write_csv(statement, fileobj):
+    for chunk in iter_csv(statement):
+        fileobj.write(chunk)
+
+
+PARQUET_SCHEMA = None if pa is None else pa.schema([
+    ("date", pa.timestamp("s")), ("reference", pa.string()), ("type", pa.string()),
+    ("description", pa.string()), ("debit", pa.decimal128(15, 2)), ("credit", pa.decimal128(15, 2)),
+    ("balance", pa.decimal128(15, 2)),
+])
+
+
+def write_parquet(statement, fileobj):
+    """Write the statement as Parquet, one row group per batch."""
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    with pq.ParquetWriter(fileobj, PARQUET_SCHEMA) as writer:
+        batch = []
+        for row in statement:
+            # Loan credits carry a DATE, everything else a TIMESTAMP.
+            ts = row[0] if isinstance(row[0], datetime) else datetime.combine(row[0], time.min)
+            batch.append((ts,) + row[1:])
+            if len(batch) >= BATCH_ROWS:
+                writer.write_batch(_record_batch(batch))
+                batch = []
+        if batch:
+            writer.write_batch(_record_batch(batch))
+
+
+def _record_batch(rows):
+    columns = list(zip(*rows))
+    return pa.record_batch([pa.array(col, type=field.type) for col, field in zip(columns, PARQUET_SCHEMA)],
+                           schema=PARQUET_SCHEMA)
+
+
+FORMATS = {"csv": ("text/csv", "csv"), "parquet": ("application/vnd.apache.parquet", "parquet")}
+
+
+def available_formats():
+    return ["csv", "parquet"] if pa is not None else ["csv"]
+
+
+def export(accno, start, end, fmt, fileobj):
+    """Stream a statement into ``fileobj`` (text for csv, binary for parquet)."""
+    statement = Statement(accno, start, end)
+    if fmt == "parquet":
+        write_parquet(statement, fileobj)
+    else:
+        write_csv(statement, fileobj)
+    return statement
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export an account statement")
+    parser.add_argument("accno")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, required=True)
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("-o", "--output", help="output file (default stdout, csv only)")
+    args = parser.parse_args(argv)
+
+    if not account_exists(args.accno):
+        sys.exit(f"Account {args.accno} not found")
+    if args.format == "parquet" and not args.output:
+        parser.error("--format parquet needs --output")
+    if args.output:
+        mode = "wb" if args.format == "parquet" else "w"
+        with open(args.output, mode, **({} if mode == "wb" else {"newline": ""})) as f:
+            statement = export(args.accno, args.start, args.end, args.format, f)
+    else:
+        statement = export(args.accno, args.start, args.end, args.format, sys.stdout)
+    print(f"{statement.rows} entries, opening {statement.opening}, closing {statement.closing}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# transfers.py — the single path that moves money between accounts
+import time
+import random
+from collections import namedtuple
+from decimal import Decimal
+
+from mysql.connector import Error
+
+import db
+import ids
+
+# InnoDB errors after which the whole transaction can simply be retried.
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+RETRYABLE_ERRORS = {ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK}
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.02   # seconds; doubled per attempt, with jitter
+BACKOFF_MAX = 1.0
+
+TransferResult = namedtuple("TransferResult", "transfer_id attempts")
+
+
+class TransferError(Exception):
+    """A transfer was refused (unknown account, insufficient funds, ...)."""
+
+
+def transfer(from_accno, to_accno, amount, transfer_id=None, max_retries=MAX_RETRIES):
+    """Move ``amount`` from one account to another; returns a ``TransferResult``.
+
+    Both accounts are locked with one ``SELECT ... FOR UPDATE`` in accno
+    order, so transfers crossing the same pair in opposite directions queue
+    instead of deadlocking, and the balance check sees the final balance.
+    The TRANSFERS insert then fires trg_after_transfer_insert, which moves
+    the money with conditional updates. Deadlocks and lock-wait timeouts
+    are retried with jittered exponential backoff. ``transfer_id`` is a
+    16-byte key (``ids.uuid7()``); the result carries it as text.
+    """
+    amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+    if amount <= 0:
+        raise TransferError("Amount must be positive")
+    if from_accno == to_accno:
+        raise TransferError("Cannot transfer to the same account")
+    transfer_id = transfer_id or ids.uuid7()
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with db.get_pool().connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT accno, balance FROM ACCOUNTS WHERE accno IN (%s,%s) ORDER BY accno FOR UPDATE",
+                        (from_accno, to_accno),
+                    )
+                    balances = dict(cur.fetchall())
+                    for accno in (from_accno, to_accno):
+                        if accno not in balances:
+                            raise TransferError(f"Account {accno} not found")
+                    if (balances[from_accno] or 0) < amount:
+                        raise TransferError("Insufficient funds for transfer")
+                    cur.execute(
+                        "INSERT INTO TRANSFERS (transferid, from_accno, to_accno, amount) VALUES (%s,%s,%s,%s)",
+                        (transfer_id, from_accno, to_accno, amount),
+                    )
+                conn.commit()
+                db.record_write(conn)
+            break
+        except Error as e:
+            if e.errno not in RETRYABLE_ERRORS or attempt > max_retries:
+                raise
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.5))
+
+    db.query_cache.invalidate(db.written_tables("INSERT INTO TRANSFERS"))
+    return TransferResult(ids.to_text(transfer_id), attempt)
@@ -0,0 +1,14 @@
+# ui — the Streamlit app, run through app.py
+"""
+Streamlit re-executes app.py on every interaction, but modules it imports
+stay loaded for the life of the process. So app.py only calls
+ui.main.main(), and everything else lives here:
+
+    ui/main.py      session setup, navigation, lazy page dispatch
+    ui/config.py    page config and the stylesheet (ui/style.css), built on first import
+    ui/widgets.py   grids, search pickers, concurrent sections, statement export
+    ui/login.py     login form
+    ui/<page>.py    one module per nav entry, imported when it is first chosen
+
+Benchmark per-page cold start and rerun time with benchmarks/app_bench.py.
+"""
@@ -0,0 +1,61 @@
+# ui/accounts.py — Accounts page (staff) and My Accounts (customers)
+import streamlit as st
+from mysql.connector import Error
+from datetime import datetime
+from db import fetch_all, exec_write
+from instrument import page as instrumented_page
+import checkpoints
+from ui.widgets import paged_grid, search_picker, statement_export_section
+
+# ---------- Accounts Page ----------
+@instrumented_page
+def accounts_page(employee_mode=True):
+    if employee_mode:
+        st.header("🏦 Accounts Management")
+    else:
+        st.header("💳 My Accounts")
+
+    role = st.session_state["role"]
+    user = st.session_state["user"]
+
+    if role == "customer":
+        rows = fetch_all("SELECT accno, accttype, balance, interest_rate FROM ACCOUNTS WHERE cif=%s", (user["id"],))
+        if rows:
+            st.dataframe(rows, use_container_width=True)
+            st.subheader("📅 Balance as of")
+            c1, c2 = st.columns(2)
+            accno = c1.selectbox("Account", [r["accno"] for r in rows], key="asof_acc")
+            as_of = c2.date_input("Date", value=datetime.now().date(), max_value=datetime.now().date())
+            balance = checkpoints.balance_asof(accno, as_of)
+            if balance is not None:
+                st.metric(f"Closing balance on {as_of}", f"₹{float(balance):,.2f}")
+            statement_export_section([r["accno"] for r in rows])
+        else:
+            st.info("ℹ️ No accounts.")
+        return
+
+    tab1, tab2 = st.tabs(["➕ Open Account", "📊 View All"])
+    
+    with tab1:
+        cif = search_picker("acct_cif", "Customer", "customer")
+        with st.form("acct_open"):
+            st.caption(f"Customer: {cif}" if cif else "Pick the customer above.")
+            accno = st.text_input("Account No")
+            accttype = st.selectbox("Type", ["SAVINGS","CURRENT","RECURRING"])
+            ir = st.number_input("Interest Rate (%)", value=3.50, step=0.25)
+            opening = st.form_submit_button("🏦 Create")
+        if opening and accno and cif:
+            try:
+                exec_write("INSERT INTO ACCOUNTS (accno,cif,accttype,interest_rate) VALUES (%s,%s,%s,%s)",
+                           (accno, cif, accttype, ir))
+                st.success("✅ Created.")
+            except Error as e:
+                st.error(f"❌ Failed: {e}")
+
+    with tab2:
+        paged_grid(
+            "accounts", "ACCOUNTS",
+            {"accno": "accno", "cif": "cif", "accttype": "accttype", "balance": "balance", "interest_rate": "interest_rate"},
+            key="accno", sortable=["accno", "cif", "balance"],
+            filters={"accno": "prefix", "cif": "prefix", "accttype": "prefix", "balance": ">="},
+        )
@@ -0,0 +1,28 @@
+# ui/audit.py — Audit Logs page (admin)
+import streamlit as st
+from datetime import datetime
+from instrument import page as instrumented_page
+import queries
+from ui.widgets import paged_grid
+
+# ---------- Audit Logs ----------
+@instrumented_page
+def audit_logs_page():
+    st.header("🧾 Audit Logs")
+    st.caption("Entries are written in the background and appear within a few seconds.")
+    source = st.radio("Entries", ["Recent", "Archived"], horizontal=True, key="audit_source")
+    if source == "Archived":
+        # Months moved out of AUDIT_LOGS by partitions.py archive.
+        paged_grid(
+            "audit_logs_archive", "AUDIT_LOGS_ARCHIVE", queries.AUDIT_LOG_COLUMNS,
+            key="logid", sortable=["timestamp"], descending=True,
+            filters={"user_id": "=", "user_type": "="}, page_size=200,
+        )
+        return
+    since = st.date_input("Since", value=queries.recent_since().date(), key="audit_since")
+    paged_grid(
+        "audit_logs", "AUDIT_LOGS", queries.AUDIT_LOG_COLUMNS,
+        key="logid", sortable=["timestamp"], descending=True,
+        filters={"user_id": "=", "user_type": "="}, page_size=200,
+        where=queries.AUDIT_RECENT, params=(datetime.combine(since, datetime.min.time()),),
+    )
@@ -0,0 +1,57 @@
+# ui/chatbot.py — Banking Assistant page (customers)
+import streamlit as st
+from mysql.connector import Error
+from instrument import page as instrumented_page
+import assistant
+from chat_history import ChatHistory
+
+# ---------- AI Chatbot Function ----------
+def get_chatbot_response(user_message):
+    """Rule-based answers from assistant.py; live intents read the customer's own data."""
+    return assistant.respond(user_message, st.session_state.get("role"), st.session_state.get("user") or {})
+
+
+# ---------- Chatbot Page ----------
+@instrumented_page
+def chatbot_page():
+    st.header("🤖 Banking Assistant")
+    st.markdown("*Ask me anything about banking services*")
+    
+    user = st.session_state["user"]
+    if not isinstance(st.session_state.get("chat_history"), ChatHistory):
+        st.session_state["chat_history"] = ChatHistory(user["id"])
+    history = st.session_state["chat_history"]
+
+    if not history.exhausted and not history.full:
+        if st.button("⬆️ Show earlier"):
+            if not history.load_earlier():
+                st.info("ℹ️ No earlier messages.")
+
+    st.markdown(history.markup(), unsafe_allow_html=True)
+
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        user_input = st.text_input("", key="chat_input", label_visibility="collapsed", placeholder="Type your message...")
+    with col2:
+        send_button = st.button("Send", use_container_width=True)
+
+    if send_button and user_input:
+        try:
+            history.append("user", user_input)
+
+            with st.spinner("🤔 Thinking..."):
+                bot_response = get_chatbot_response(user_input)
+
+            history.append("assistant", bot_response)
+        except Error as e:
+            st.error(f"❌ Could not save the conversation: {e}")
+        else:
+            st.rerun()
+
+    if st.button("🗑️ Clear Chat"):
+        try:
+            history.clear(forget=True)
+        except Error as e:
+            st.error(f"❌ Could not clear the conversation: {e}")
+        else:
+            st.rerun()
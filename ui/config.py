@@ -0,0 +1,27 @@
+# ui/config.py — page config and stylesheet, built once per process
+import os
+import re
+import streamlit as st
+
+PAGE_CONFIG = dict(
+    page_title="🏦 Bank Management System",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+
+def _stylesheet(path):
+    """``path`` as one minified ``<style>`` tag."""
+    with open(path, encoding="utf-8") as f:
+        css = re.sub(r"\s+", " ", f.read())
+    return "<style>" + re.sub(r"\s*([{};])\s*", r"\1", css).strip() + "</style>"
+
+
+# Read when the module is first imported; reruns reuse the finished tag.
+STYLE = _stylesheet(os.path.join(os.path.dirname(__file__), "style.css"))
+
+
+def apply():
+    """Page config and stylesheet. Streamlit needs both on every run, before any other element."""
+    st.set_page_config(**PAGE_CONFIG)
+    st.markdown(STYLE, unsafe_allow_html=True)
@@ -0,0 +1,65 @@
+# ui/customers.py — Customers page (admin)
+import streamlit as st
+from mysql.connector import Error
+from db import fetch_one, fetch_all, exec_write
+from instrument import page as instrumented_page
+import auth
+from ui.widgets import paged_grid, search_picker
+
+# ---------- Customers Page ----------
+@instrumented_page
+def customers_page():
+    st.header("👤 Customers Management")
+    
+    tab1, tab2 = st.tabs(["📝 Create/Update", "📊 View All"])
+    
+    with tab1:
+        col = st.columns(2)
+        with col[0]:
+            with st.form("cust_form"):
+                cif = st.text_input("CIF")
+                fname = st.text_input("First Name")
+                lname = st.text_input("Last Name")
+                password_hash = st.text_input("Password", type="password")
+                submitted = st.form_submit_button("💾 Save")
+            if submitted and cif and fname and password_hash:
+                try:
+                    password_hash = auth.make_hash(password_hash)
+                    exists = fetch_one("SELECT cif FROM CUSTOMER WHERE cif=%s", (cif,))
+                    if exists:
+                        exec_write("UPDATE CUSTOMER SET fname=%s, lname=%s, password_hash=%s WHERE cif=%s",
+                                   (fname, lname, password_hash, cif))
+                        st.success("✅ Updated.")
+                    else:
+                        exec_write("INSERT INTO CUSTOMER (cif,fname,lname,password_hash) VALUES (%s,%s,%s,%s)",
+                                   (cif, fname, lname, password_hash))
+                        st.success("✅ Created.")
+                except auth.AuthBusy as e:
+                    st.warning(f"⏳ {e}")
+                except Error as e:
+                    st.error(f"❌ Failed: {e}")
+
+        with col[1]:
+            cif_del = search_picker("cust_del", "Customer to delete", "customer")
+            if st.button("🗑️ Delete", disabled=cif_del is None):
+                try:
+                    exec_write("DELETE FROM CUSTOMER WHERE cif=%s", (cif_del,))
+                    st.info("ℹ️ Deleted.")
+                except Error as e:
+                    st.error(f"❌ Failed: {e}")
+    
+    with tab2:
+        found = search_picker("cust_find", "Find customer", "customer")
+        if found:
+            accounts = fetch_all("SELECT accno, accttype, balance, interest_rate FROM ACCOUNTS WHERE cif=%s", (found,))
+            if accounts:
+                st.dataframe(accounts, use_container_width=True)
+            else:
+                st.info("ℹ️ No accounts.")
+            st.markdown("---")
+        paged_grid(
+            "customers", "CUSTOMER",
+            {"cif": "cif", "fname": "fname", "lname": "lname", "homebranch": "homebranch", "opening_date": "opening_date"},
+            key="cif", sortable=["cif", "fname", "opening_date"],
+            filters={"cif": "prefix", "fname": "prefix", "lname": "prefix", "homebranch": "prefix"},
+        )
@@ -0,0 +1,55 @@
+# ui/dashboard.py — Dashboard page
+import streamlit as st
+from db import fetch_one, fetch_all, ReadBatch
+from instrument import page as instrumented_page
+import queries
+from ui.widgets import deferred, paged_grid
+
+# ---------- Dashboard ----------
+@instrumented_page
+def dashboard():
+    st.header("📊 Dashboard")
+    role = st.session_state["role"]
+    user = st.session_state["user"]
+    
+    if role in ("admin", "employee"):
+        st.markdown(f"### Welcome, **{user.get('name','Employee')}** 👋")
+
+        def show_summary(summary):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("👥 Customers", summary["customers"] if summary and summary["customers"] else 0)
+            with col2:
+                st.metric("🏦 Accounts", summary["accounts"] if summary and summary["accounts"] else 0)
+            with col3:
+                st.metric("💰 Total Balance", f"₹{summary['total']:,.2f}" if summary and summary['total'] else "₹0.00")
+
+        with ReadBatch() as reads:
+            deferred(reads, "dashboard_summary", fetch_one, queries.DASHBOARD_SUMMARY, render=show_summary)
+
+            st.markdown("---")
+            st.subheader("📋 All Accounts")
+            paged_grid(
+                "dashboard_accounts", "ACCOUNTS",
+                {"accno": "accno", "cif": "cif", "accttype": "accttype", "balance": "balance"},
+                key="accno", sortable=["accno", "balance"],
+                filters={"cif": "prefix", "accttype": "prefix"}, reads=reads,
+            )
+    else:
+        st.markdown(f"### Welcome, **{user.get('fname','')} {user.get('lname','')}** 👋")
+        
+        accs = fetch_all(queries.CUSTOMER_ACCOUNTS, (user["id"],))
+        total_balance = sum([acc["balance"] for acc in accs])
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("💳 My Accounts", len(accs))
+        with col2:
+            st.metric("💰 Total Balance", f"₹{total_balance:,.2f}")
+        
+        st.markdown("---")
+        st.subheader("💳 My Accounts")
+        if accs:
+            st.dataframe(accs, use_container_width=True)
+        else:
+            st.info("ℹ️ No accounts yet.")
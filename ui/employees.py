@@ -0,0 +1,57 @@
+# ui/employees.py — Employees page (admin)
+import streamlit as st
+from mysql.connector import Error
+from db import fetch_one, exec_write
+from instrument import page as instrumented_page
+import auth
+from ui.widgets import paged_grid
+
+# ---------- Employees Page ----------
+@instrumented_page
+def employees_page():
+    st.header("👔 Employees Management")
+    
+    tab1, tab2 = st.tabs(["📝 Create/Update", "📊 View All"])
+    
+    with tab1:
+        col = st.columns(2)
+        with col[0]:
+            with st.form("emp_form"):
+                pfno = st.text_input("PF No")
+                name = st.text_input("Name")
+                desig = st.selectbox("Designation", ["Manager","Teller","Clerk","Officer"])
+                pwd = st.text_input("Password", type="password")
+                submitted = st.form_submit_button("💾 Save")
+            if submitted and pfno and name and pwd:
+                try:
+                    pwd = auth.make_hash(pwd)
+                    exists = fetch_one("SELECT pfno FROM EMPLOYEE WHERE pfno=%s", (pfno,))
+                    if exists:
+                        exec_write("UPDATE EMPLOYEE SET empname=%s, designation=%s, password_hash=%s WHERE pfno=%s",
+                                   (name, desig, pwd, pfno))
+                        st.success("✅ Updated.")
+                    else:
+                        exec_write("INSERT INTO EMPLOYEE (pfno, empname, designation, password_hash) VALUES (%s,%s,%s,%s)",
+                                   (pfno, name, desig, pwd))
+                        st.success("✅ Created.")
+                except auth.AuthBusy as e:
+                    st.warning(f"⏳ {e}")
+                except Error as e:
+                    st.error(f"❌ Failed: {e}")
+
+        with col[1]:
+            pf_del = st.text_input("PF No to delete")
+            if st.button("🗑️ Delete"):
+                try:
+                    exec_write("DELETE FROM EMPLOYEE WHERE pfno=%s", (pf_del,))
+                    st.info("ℹ️ Deleted.")
+                except Error as e:
+                    st.error(f"❌ Failed: {e}")
+    
+    with tab2:
+        paged_grid(
+            "employees", "EMPLOYEE",
+            {"pfno": "pfno", "empname": "empname", "designation": "designation", "joining_date": "joining_date"},
+            key="pfno", sortable=["pfno", "empname", "joining_date"],
+            filters={"pfno": "prefix", "empname": "prefix", "designation": "prefix"},
+        )
@@ -0,0 +1,147 @@
+# ui/loans.py — Loans page: applications, approval and repayment schedules
+import streamlit as st
+from mysql.connector import Error
+from db import fetch_one, fetch_all, exec_write
+from instrument import page as instrumented_page
+import queries
+import amortization
+import approvals
+from ui.widgets import paged_grid, search_picker
+
+# ---------- Loans ----------
+@instrumented_page
+def loans_page():
+    st.header("🏡 Loans")
+    role = st.session_state["role"]
+    user = st.session_state["user"]
+
+    if role == "customer":
+        customer_accounts = fetch_all("SELECT accno FROM ACCOUNTS WHERE cif=%s", (user["id"],))
+        if not customer_accounts:
+            st.warning("⚠️ No accounts to link loan.")
+            return
+        
+        acc_list = [acc["accno"] for acc in customer_accounts]
+        
+        with st.form("loan_apply_customer"):
+            loan_id = st.text_input("Loan ID")
+            accno = st.selectbox("Account", acc_list)
+            loan_amt = st.number_input("Amount (₹)", min_value=0.01, step=1000.00)
+            loan_type = st.selectbox("Type", ["HOME","AUTO","PERSONAL"])
+            rate = st.number_input("Interest Rate (%)", min_value=0.00, value=9.50, step=0.25)
+            tenure = st.number_input("Tenure (months)", min_value=1, step=1)
+            submitted = st.form_submit_button("Apply")
+        
+        if submitted and loan_id and accno and loan_amt > 0:
+            try:
+                exec_write(
+                    "INSERT INTO LOANS (loan_id,cif,accno,loan_amount,loan_type,interest_rate,tenure_months,status) VALUES (%s,%s,%s,%s,%s,%s,%s,'PENDING')",
+                    (loan_id, user["id"], accno, loan_amt, loan_type, rate, tenure)
+                )
+                st.success("✅ Application submitted.")
+            except Error as e:
+                st.error(f"❌ Failed: {e}")
+
+        st.markdown("---")
+        st.subheader("My Loans")
+        my_loans = fetch_all(queries.CUSTOMER_LOANS, (user["id"],))
+        if my_loans:
+            st.dataframe(my_loans, use_container_width=True)
+            st.markdown("---")
+            loan_schedule_section([loan["loan_id"] for loan in my_loans])
+        else:
+            st.info("ℹ️ No loans yet.")
+    else:
+        # Employee/Admin flow
+        st.subheader("Apply for Loan")
+        cif = search_picker("loan_cif", "Customer", "customer")
+        linked = [r["accno"] for r in fetch_all("SELECT accno FROM ACCOUNTS WHERE cif=%s", (cif,))] if cif else []
+        with st.form("loan_apply"):
+            loan_id = st.text_input("Loan ID")
+            accno = st.selectbox("Linked Account", linked)
+            loan_amt = st.number_input("Loan Amount (₹)", min_value=0.01, step=1000.00)
+            loan_type = st.selectbox("Type", ["HOME","AUTO","PERSONAL"])
+            rate = st.number_input("Interest Rate (%)", min_value=0.00, value=9.50, step=0.25)
+            tenure = st.number_input("Tenure (months)", min_value=1, step=1)
+            submitted = st.form_submit_button("Apply")
+        
+        if submitted and loan_id and cif and accno and loan_amt > 0:
+            try:
+                exec_write(
+                    "INSERT INTO LOANS (loan_id,cif,accno,loan_amount,loan_type,interest_rate,tenure_months,status) VALUES (%s,%s,%s,%s,%s,%s,%s,'PENDING')",
+                    (loan_id, cif, accno, loan_amt, loan_type, rate, tenure)
+                )
+                st.success("✅ Loan application submitted.")
+            except Error as e:
+                st.error(f"❌ Failed: {e}")
+
+        st.markdown("---")
+        st.subheader("All Loans")
+        paged_grid(
+            "loans", "LOANS",
+            {c: c for c in ("loan_id", "cif", "accno", "loan_amount", "loan_type", "interest_rate",
+                            "tenure_months", "status", "approval_date", "approved_by")},
+            key="loan_id", sortable=["loan_id", "loan_amount"],
+            filters={"loan_id": "prefix", "cif": "prefix", "status": "prefix"},
+        )
+
+        st.markdown("---")
+        loan_schedule_section(None)
+
+        if role == "admin":
+            st.markdown("---")
+            approval_queue_section()
+
+def approval_queue_section():
+    st.subheader("Approval Queue")
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Loans per page", [50, 200, 1000], index=1, key="loan_queue_size")
+    with col2:
+        chunk = st.number_input("Loans per transaction", min_value=1, max_value=5000,
+                                value=approvals.DEFAULT_CHUNK, step=100, key="loan_queue_chunk")
+    selected = paged_grid(
+        "loan_queue", "LOANS", queries.LOAN_QUEUE_COLUMNS,
+        key="loan_id", filters={"loan_id": "prefix", "cif": "prefix", "loan_type": "=", "loan_amount": "<="},
+        where=queries.PENDING_LOANS, page_size=page_size, selectable=True,
+    )
+    if not st.button(f"✓ Approve {len(selected):,} selected", disabled=not selected, key="loan_queue_approve"):
+        return
+    status = st.empty()
+    report = approvals.approve(
+        selected, st.session_state["user"]["id"], chunk=int(chunk),
+        progress=lambda r: status.info(f"⏳ {r.approved:,} approved, {r.skipped:,} skipped, {r.failed:,} failed..."),
+    )
+    if report.failed:
+        status.warning(f"⚠️ {report.summary()}")
+        st.dataframe([{"first loan": first, "loans": size, "error": error}
+                      for first, size, error in report.failures], use_container_width=True)
+    else:
+        status.success(f"✅ {report.summary()}")
+
+def loan_schedule_section(loan_ids):
+    st.subheader("Repayment Schedule")
+    loan_id = st.selectbox("Loan", loan_ids, key="schedule_loan") if loan_ids is not None \
+        else st.text_input("Loan ID", key="schedule_loan")
+    if not loan_id:
+        return
+    loan = fetch_one(
+        "SELECT loan_amount, interest_rate, tenure_months, approval_date, status FROM LOANS WHERE loan_id=%s",
+        (loan_id,))
+    if not loan:
+        st.warning("⚠️ Loan not found.")
+        return
+    if not loan["tenure_months"]:
+        st.info("ℹ️ This loan has no tenure set.")
+        return
+    rate = loan["interest_rate"] or 0
+    table = amortization.schedule(loan["loan_amount"], rate, loan["tenure_months"], loan["approval_date"])
+    paid = amortization.instalments_paid(loan["approval_date"], loan["tenure_months"])
+    col1, col2, col3 = st.columns(3)
+    col1.metric("EMI", f"₹ {table['payment'].iloc[0]:,.2f}")
+    col2.metric("Total interest", f"₹ {table['interest'].sum():,.2f}")
+    if loan["status"] == "APPROVED":
+        remaining = table["closing"].iloc[paid - 1] if paid else float(loan["loan_amount"])
+        col3.metric("Outstanding principal", f"₹ {remaining:,.2f}", f"{paid} of {len(table)} paid",
+                    delta_color="off")
+    st.dataframe(table, use_container_width=True, hide_index=True)
@@ -0,0 +1,39 @@
+# ui/login.py — Login form
+import streamlit as st
+from instrument import page as instrumented_page
+import auth
+
+# ---------- Authentication ----------
+def login(user_id, password):
+    try:
+        return auth.authenticate(user_id, password)
+    except auth.AuthBusy as e:
+        st.warning(f"⏳ {e}")
+        return None, None
+
+# ---------- UI Components ----------
+@instrumented_page
+def show_login():
+    st.markdown("<div style='text-align: center; padding: 2rem 0;'>", unsafe_allow_html=True)
+    st.markdown("<h1 style='font-size: 3rem;'>🏦 Bank Management System</h1>", unsafe_allow_html=True)
+    st.markdown("<p style='font-size: 1.2rem; color: #a0a0b0;'>Secure Banking Portal</p>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.markdown("<div class='login-container'>", unsafe_allow_html=True)
+        with st.form("login_form"):
+            st.markdown("### 🔐 Login")
+            user_id = st.text_input("User ID", placeholder="e.g. E001 / C001")
+            pwd = st.text_input("Password", type="password", placeholder="Enter password")
+            submitted = st.form_submit_button("Sign In", use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    if submitted:
+        role, profile = login(user_id.strip(), pwd)
+        if role:
+            st.session_state["role"] = role
+            st.session_state["user"] = profile
+            st.rerun()
+        else:
+            st.error("❌ Invalid credentials.")
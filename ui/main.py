@@ -0,0 +1,95 @@
+# ui/main.py — session setup, navigation and lazy page dispatch
+import importlib
+import streamlit as st
+from mysql.connector import Error
+from db import ping, SessionWrites, bind_session
+from instrument import enable_slow_log
+from chat_history import ChatHistory
+from ui import config
+from ui.login import show_login
+
+# Nav label -> (module in ui, page function, keyword arguments, roles allowed; None for all).
+# A page's module, and whatever it imports, is loaded the first time the
+# page is chosen; later reruns find it in sys.modules.
+PAGES = {
+    "📊 Dashboard": ("dashboard", "dashboard", {}, None),
+    "👤 Customers": ("customers", "customers_page", {}, ("admin",)),
+    "👔 Employees": ("employees", "employees_page", {}, ("admin",)),
+    "🏦 Accounts": ("accounts", "accounts_page", {"employee_mode": True}, None),
+    "💳 My Accounts": ("accounts", "accounts_page", {"employee_mode": False}, None),
+    "💰 Transactions": ("transactions", "transactions_page", {}, None),
+    "🔄 Transfers": ("transfers", "transfers_page", {}, None),
+    "🏡 Loans": ("loans", "loans_page", {}, None),
+    "🧾 Audit Logs": ("audit", "audit_logs_page", {}, ("admin",)),
+    "⚡ Performance": ("performance", "performance_page", {}, ("admin",)),
+    "📈 Reports": ("reports", "reports_page", {}, None),
+    "🤖 Banking Assistant": ("chatbot", "chatbot_page", {}, ("customer",)),
+}
+
+NAV = {
+    "admin": ["📊 Dashboard", "👤 Customers", "👔 Employees", "🏦 Accounts",
+              "💰 Transactions", "🔄 Transfers", "🏡 Loans", "🧾 Audit Logs", "⚡ Performance", "📈 Reports"],
+    "employee": ["📊 Dashboard", "🏦 Accounts", "💰 Transactions",
+                 "🔄 Transfers", "🏡 Loans", "📈 Reports"],
+    "customer": ["📊 Dashboard", "💳 My Accounts", "💰 Transactions",
+                 "🔄 Transfers", "🏡 Loans", "📈 Reports", "🤖 Banking Assistant"],
+}
+
+
+def nav_bar():
+    role = st.session_state["role"]
+    user = st.session_state["user"]
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown(f"### 👤 {user.get('name', user.get('fname', 'User'))}")
+    st.sidebar.markdown(f"**Role:** {role.title()}")
+    st.sidebar.markdown(f"**ID:** {user.get('id', 'N/A')}")
+    st.sidebar.markdown("---")
+
+    st.sidebar.title("📋 Navigation")
+    return st.sidebar.radio("", NAV.get(role, NAV["customer"]), label_visibility="collapsed")
+
+
+def show_page(label, role):
+    module, function, kwargs, roles = PAGES[label]
+    if roles is not None and role not in roles:
+        st.error("Unauthorized")
+        return
+    page = getattr(importlib.import_module(f"ui.{module}"), function)
+    page(**kwargs)
+
+
+def main():
+    config.apply()
+    enable_slow_log()
+    if "role" not in st.session_state:
+        st.session_state["role"] = None
+    if "user" not in st.session_state:
+        st.session_state["user"] = None
+    # Reads after this session's own writes must see them (see db.read_conn).
+    bind_session(st.session_state.setdefault("db_writes", SessionWrites()))
+
+    if not ping():
+        st.error("⚠️ Could not connect to database. Please check MySQL is running.")
+        return
+
+    if not st.session_state["role"]:
+        show_login()
+        return
+
+    with st.sidebar:
+        st.write(f"Logged in as: **{st.session_state['user'].get('id','')}** ({st.session_state['role']})")
+        if st.button("Logout"):
+            # Only customers who opened the Banking Assistant have a history.
+            history = st.session_state.get("chat_history")
+            try:
+                if isinstance(history, ChatHistory):
+                    history.flush()
+            except Error as e:
+                # Unsaved turns stay pending; logging out again retries.
+                st.error(f"❌ Could not save the conversation: {e}")
+            else:
+                st.session_state.clear()
+                st.rerun()
+
+    show_page(nav_bar(), st.session_state["role"])
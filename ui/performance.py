@@ -0,0 +1,48 @@
+# ui/performance.py — Performance page (admin)
+import streamlit as st
+from db import pool_stats, cache_stats, replica_stats
+from instrument import metrics, METRICS_WINDOW
+
+# ---------- Performance ----------
+def performance_page():
+    st.header("⚡ Performance")
+    st.caption("Timings of this app process's database calls over the last "
+               f"{METRICS_WINDOW // 60} minutes; the slow-query log keeps calls over {metrics.slow_ms:.0f} ms.")
+
+    st.subheader("Pages")
+    pages = metrics.page_stats()
+    if pages:
+        st.dataframe(pages, use_container_width=True)
+    else:
+        st.info("ℹ️ No page renders recorded yet.")
+
+    st.subheader("Top Queries by Total Time")
+    top = metrics.top_statements(limit=25)
+    if top:
+        st.dataframe(top, use_container_width=True)
+    else:
+        st.info("ℹ️ No queries recorded yet.")
+
+    st.subheader("Slow Queries")
+    slow = metrics.slow_queries()
+    if slow:
+        st.dataframe(slow, use_container_width=True)
+    else:
+        st.success("✅ No slow queries.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Connection Pool")
+        st.json(pool_stats())
+    with col2:
+        st.subheader("Read Cache")
+        st.json(cache_stats())
+
+    replicas = replica_stats()
+    if replicas:
+        st.subheader("Read Replicas")
+        st.dataframe(replicas, use_container_width=True)
+
+    if st.button("🔄 Reset Statistics"):
+        metrics.reset()
+        st.rerun()
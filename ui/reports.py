@@ -0,0 +1,124 @@
+# ui/reports.py — Reports page
+import streamlit as st
+from datetime import datetime, timedelta
+from db import fetch_one, fetch_all, ReadBatch
+from instrument import page as instrumented_page
+import queries
+import amortization
+from ui.widgets import deferred, paged_grid
+
+# ---------- Reports ----------
+def interest_calculator_result(principal, rate, months):
+    interest = amortization.simple_interest(principal, rate, months)
+    instalment = amortization.emi(principal, rate, months)
+    st.info(f"Calculated Interest: ₹ {interest:,.2f}  ·  EMI on a reducing balance: ₹ {instalment:,.2f}/month")
+
+
+def portfolio_projection_section():
+    st.subheader("Loan Book Projection")
+    horizon = st.select_slider("Horizon", options=[6, 12, 24, 36, 60], value=12,
+                               format_func=lambda m: f"{m} months")
+    if st.button("📊 Project cash flows"):
+        loans = amortization.load_loans()
+        if loans.empty:
+            st.info("ℹ️ No approved loans.")
+            return
+        projection = amortization.project(loans, horizon=horizon)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Approved loans", f"{len(loans):,}")
+        col2.metric(f"Interest over {horizon} months", f"₹ {projection['interest'].sum():,.2f}")
+        col3.metric("Outstanding at horizon", f"₹ {projection['outstanding'].iloc[-1]:,.2f}")
+        st.bar_chart(projection, x="month", y=["principal", "interest"])
+        st.dataframe(projection, use_container_width=True)
+
+
+@instrumented_page
+def reports_page():
+    st.header("📈 Reports")
+    role = st.session_state["role"]
+    
+    if role == "customer":
+        st.subheader("Calculate Interest")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            principal = st.number_input("Principal (₹)", min_value=0.00, value=100000.00, step=1000.00)
+        with col2:
+            rate = st.number_input("Rate (%)", min_value=0.00, value=8.50, step=0.25)
+        with col3:
+            months = st.number_input("Months", min_value=1, value=12, step=1)
+
+        if st.button("Calculate"):
+            interest_calculator_result(principal, rate, months)
+    else:
+        def show_freshness(freshness):
+            if freshness:
+                st.caption(f"Aggregates below include ledger activity up to {freshness['high_water']} "
+                           f"(refreshed {freshness['refreshed_at']}).")
+            else:
+                st.warning("⚠️ Ledger rollups have not been built yet (python rollups.py --rebuild).")
+
+        def show_daily(daily):
+            if daily:
+                series = ("deposits", "withdrawals", "transfers")
+                st.bar_chart([{"day": r["day"], **{k: float(r[k] or 0) for k in series}} for r in daily],
+                             x="day", y=list(series))
+            else:
+                st.info("ℹ️ No activity in this window.")
+
+        # The grids, the freshness line and the chart are independent reads.
+        with ReadBatch() as reads:
+            st.subheader("Customer + Account Details (JOIN)")
+            paged_grid(
+                "report_join", "CUSTOMER c JOIN ACCOUNTS a ON c.cif = a.cif",
+                {"cif": "c.cif", "fname": "c.fname", "accno": "a.accno", "balance": "a.balance"},
+                key="accno", sortable=["cif", "accno", "balance"],
+                filters={"cif": "prefix", "fname": "prefix"}, reads=reads,
+            )
+
+            st.markdown("---")
+            st.subheader("High Value Customers (Nested Query)")
+            paged_grid(
+                "report_high_value", "CUSTOMER",
+                {c: c for c in ("cif", "fname", "lname", "contact_no", "homebranch", "opening_date")},
+                key="cif", where=queries.HIGH_VALUE_CUSTOMERS,
+                filters={"cif": "prefix", "fname": "prefix"}, reads=reads,
+            )
+
+            st.markdown("---")
+            deferred(reads, "report_freshness", fetch_one, queries.ROLLUP_FRESHNESS, render=show_freshness)
+
+            st.subheader("Deposits, Withdrawals and Net per Account (Aggregate)")
+            paged_grid(
+                "report_account_totals", "ACCOUNT_LEDGER_TOTALS", queries.ACCOUNT_TOTALS_COLUMNS,
+                key="accno", sortable=["accno", "net"], filters={"accno": "prefix", "cif": "prefix", "net": ">="},
+                reads=reads,
+            )
+
+            st.subheader("Net Deposits per Customer")
+            paged_grid(
+                "report_customer_totals", "CUSTOMER_LEDGER_TOTALS t JOIN CUSTOMER c ON c.cif = t.cif",
+                queries.CUSTOMER_TOTALS_COLUMNS,
+                key="cif", sortable=["cif", "net"], descending=True, filters={"cif": "prefix", "net": ">="},
+                reads=reads,
+            )
+
+            st.subheader("Daily Activity")
+            days = st.select_slider("Window", options=[7, 30, 90, 365], value=30, format_func=lambda d: f"{d} days")
+            deferred(reads, "report_daily", fetch_all, queries.DAILY_ACTIVITY,
+                     (datetime.now().date() - timedelta(days=days),), render=show_daily)
+
+        st.markdown("---")
+        portfolio_projection_section()
+
+        st.markdown("---")
+        st.subheader("Interest Calculator")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            principal = st.number_input("Principal (₹)", min_value=0.00, value=100000.00, step=1000.00)
+        with col2:
+            rate = st.number_input("Rate (%)", min_value=0.00, value=8.50, step=0.25)
+        with col3:
+            months = st.number_input("Months", min_value=1, value=12, step=1)
+
+        if st.button("Calculate"):
+            interest_calculator_result(principal, rate, months)
@@ -0,0 +1,104 @@
+# ui/transactions.py — Transactions page, with bulk upload for admins
+import streamlit as st
+from mysql.connector import Error
+from db import fetch_all, exec_write
+from instrument import page as instrumented_page
+import queries
+import bulk_ingest
+import ids
+from ui.widgets import search_picker, statement_export_section
+
+# ---------- Transactions ----------
+def bulk_upload_section():
+    st.markdown("---")
+    st.subheader("📥 Bulk Upload")
+    st.caption("CSV with columns accno, type (DEPOSIT/WITHDRAW), amount and optional checkerid.")
+    upload = st.file_uploader("Transactions file", type=["csv"], key="bulk_txn_file")
+    batch_size = st.number_input("Batch size", min_value=1, max_value=50000,
+                                 value=bulk_ingest.DEFAULT_BATCH_SIZE, step=500)
+    if upload and st.button("📥 Post Transactions"):
+        status = st.empty()
+        try:
+            report = bulk_ingest.ingest_upload(
+                upload, batch_size=int(batch_size), maker_id=st.session_state["user"]["id"],
+                progress=lambda r: status.info(f"⏳ {r.total:,} rows read, {r.inserted:,} posted, {r.failed:,} failed..."),
+            )
+        except (ValueError, Error) as e:
+            status.error(f"❌ Upload failed: {e}")
+            return
+        status.success(f"✅ {report.summary()}")
+        if report.failures:
+            st.warning(f"⚠️ {report.failed:,} rows were not posted.")
+            st.dataframe(
+                [{"line": l, "accno": a, "reason": r} for l, a, r in report.failures[:500]],
+                use_container_width=True,
+            )
+
+@instrumented_page
+def transactions_page():
+    st.header("💰 Transactions")
+    role = st.session_state["role"]
+    user = st.session_state["user"]
+
+    if role == "customer":
+        customer_accounts = fetch_all("SELECT accno, balance FROM ACCOUNTS WHERE cif=%s", (user["id"],))
+        if not customer_accounts:
+            st.warning("⚠️ No accounts.")
+            return
+        
+        acc_list = [f"{acc['accno']} (₹{acc['balance']:,.2f})" for acc in customer_accounts]
+        acc_numbers = [acc["accno"] for acc in customer_accounts]
+        
+        with st.form("txn_form_customer"):
+            accno_display = st.selectbox("Account", acc_list)
+            accno = acc_numbers[acc_list.index(accno_display)]
+            ttype = st.selectbox("Type", ["DEPOSIT","WITHDRAW"])
+            amount = st.number_input("Amount (₹)", min_value=0.01, step=100.00)
+            submitted = st.form_submit_button("✓ Process")
+        
+        if submitted and accno and amount > 0:
+            txn_id = ids.uuid7()
+            try:
+                exec_write(
+                    "INSERT INTO `TRANSACTION` (transactionid, accno, transactiontype, amount, makerid, checkerid) VALUES (%s,%s,%s,%s,NULL,NULL)",
+                    (txn_id, accno, ttype, amount)
+                )
+                st.success(f"✅ Success! ID: {ids.to_text(txn_id)}")
+            except Error as e:
+                st.error(f"❌ Failed: {e}")
+
+        st.markdown("---")
+        st.subheader("📜 Recent Transactions")
+        st.caption(f"Last {queries.RECENT_DAYS} days; older entries are in the account statement.")
+        my_txns = fetch_all(queries.CUSTOMER_RECENT_TRANSACTIONS, (queries.recent_since(), user["id"]))
+        if my_txns:
+            st.dataframe(my_txns, use_container_width=True)
+        else:
+            st.info("ℹ️ No transactions.")
+    else:
+        accno = search_picker("txn_acc", "Account")
+        with st.form("txn_form"):
+            ttype = st.selectbox("Type", ["DEPOSIT","WITHDRAW"])
+            amount = st.number_input("Amount (₹)", min_value=0.01, step=100.00)
+            checker = st.text_input("Checker PF No (optional)")
+            submitted = st.form_submit_button("✓ Process")
+        
+        if submitted and accno and amount > 0:
+            txn_id = ids.uuid7()
+            try:
+                exec_write(
+                    "INSERT INTO `TRANSACTION` (transactionid, accno, transactiontype, amount, makerid, checkerid) VALUES (%s,%s,%s,%s,%s,%s)",
+                    (txn_id, accno, ttype, amount, user["id"], checker if checker else None)
+                )
+                st.success(f"✅ Success! ID: {ids.to_text(txn_id)}")
+            except Error as e:
+                st.error(f"❌ Failed: {e}")
+
+        if role == "admin":
+            bulk_upload_section()
+        statement_export_section()
+
+        st.markdown("---")
+        st.subheader("📜 Recent Transactions")
+        txns = fetch_all(queries.RECENT_TRANSACTIONS, (queries.recent_since(),))
+        st.dataframe(txns, use_container_width=True)
@@ -0,0 +1,84 @@
+# ui/transfers.py — Fund Transfers page
+import streamlit as st
+from mysql.connector import Error
+from db import fetch_all, ReadBatch
+from instrument import page as instrumented_page
+import queries
+from transfers import transfer, TransferError
+from ui.widgets import read_failed, search_picker
+
+# ---------- Transfers ----------
+@instrumented_page
+def transfers_page():
+    st.header("🔄 Fund Transfers")
+    role = st.session_state["role"]
+    user = st.session_state["user"]
+
+    if role == "customer":
+        reads = ReadBatch()
+        # The history is read alongside the accounts and only waited for below the form.
+        history_args = (queries.recent_since(), queries.recent_since(), user["id"])
+        recent = reads.submit(fetch_all, queries.CUSTOMER_RECENT_TRANSFERS, history_args)
+        customer_accounts = fetch_all("SELECT accno, balance FROM ACCOUNTS WHERE cif=%s", (user["id"],))
+        if not customer_accounts:
+            st.warning("⚠️ No accounts.")
+            return
+        
+        acc_list = [f"{acc['accno']} (₹{acc['balance']:,.2f})" for acc in customer_accounts]
+        acc_numbers = [acc["accno"] for acc in customer_accounts]
+        
+        with st.form("tr_form_customer"):
+            from_acc_display = st.selectbox("From Account", acc_list)
+            from_acc = acc_numbers[acc_list.index(from_acc_display)]
+            to_acc = st.text_input("To Account")
+            amount = st.number_input("Amount (₹)", min_value=0.01, step=100.00)
+            submitted = st.form_submit_button("✓ Transfer")
+        
+        transferred = False
+        if submitted and from_acc and to_acc and amount > 0:
+            try:
+                result = transfer(from_acc, to_acc.strip(), amount)
+                st.success(f"✅ Success! ID: {result.transfer_id}")
+                transferred = True
+            except TransferError as e:
+                st.error(f"❌ Failed: {e}")
+            except Error as e:
+                st.error(f"❌ Failed: {e}")
+
+        st.markdown("---")
+        st.subheader("📜 Recent Transfers")
+        try:
+            # A transfer made in this run is not in the history read before it.
+            if transferred:
+                my_transfers = fetch_all(queries.CUSTOMER_RECENT_TRANSFERS, history_args)
+            else:
+                my_transfers = recent.result()
+        except Error as e:
+            read_failed(e, "customer_transfers")
+        else:
+            if my_transfers:
+                st.dataframe(my_transfers, use_container_width=True)
+            else:
+                st.info("ℹ️ No transfers.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            from_acc = search_picker("tr_from", "From Account")
+        with col2:
+            to_acc = search_picker("tr_to", "To Account")
+        with st.form("tr_form"):
+            amount = st.number_input("Amount (₹)", min_value=0.01, step=100.00)
+            submitted = st.form_submit_button("✓ Transfer")
+        
+        if submitted and from_acc and to_acc and amount > 0:
+            try:
+                result = transfer(from_acc, to_acc, amount)
+                st.success(f"✅ Success! ID: {result.transfer_id}")
+            except TransferError as e:
+                st.error(f"❌ Failed: {e}")
+            except Error as e:
+                st.error(f"❌ Failed: {e}")
+
+        st.markdown("---")
+        st.subheader("📜 Recent Transfers")
+        st.dataframe(fetch_all(queries.RECENT_TRANSFERS, (queries.recent_since(),)), use_container_width=True)
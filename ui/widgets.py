@@ -0,0 +1,208 @@
+# ui/widgets.py — Shared widgets: concurrent sections, paginated grids, search pickers, statements
+import io
+import tempfile
+import streamlit as st
+from mysql.connector import Error
+from datetime import datetime
+from db import fetch_page, QueryTimeout
+import search
+import statements
+
+# ---------- Concurrent Reads ----------
+def read_failed(error, slot_id):
+    """Stand-in for a section whose read timed out or failed, with a retry button."""
+    if isinstance(error, QueryTimeout):
+        st.warning("⏱️ This section timed out.")
+    else:
+        st.error(f"❌ Could not load this section: {error}")
+    if st.button("🔄 Retry", key=f"retry_{slot_id}"):
+        st.rerun()
+
+
+def deferred(reads, slot_id, fn, *args, render, **kwargs):
+    """Submit ``fn`` to ``reads`` and ``render`` its result here once the batch completes.
+
+    The section's place on the page is reserved now, so sections fetched
+    concurrently still appear in order.
+    """
+    slot = st.container()
+
+    def then(value):
+        with slot:
+            render(value)
+
+    def failed(error):
+        with slot:
+            read_failed(error, slot_id)
+
+    return reads.submit(fn, *args, then=then, failed=failed, **kwargs)
+
+# ---------- Paginated Grid ----------
+GRID_PAGE_SIZE = 50
+
+def paged_grid(grid_id, source, columns, key, sortable=None, filters=None,
+               where=None, params=None, descending=False, page_size=GRID_PAGE_SIZE, reads=None,
+               selectable=False):
+    """Render one page of a listing with filters and sort pushed down to SQL.
+
+    ``filters`` maps column names to an operator: ``prefix`` or ``=`` for
+    text columns, ``>=`` or ``<=`` for numeric ones. Pages are fetched by
+    keyset seek (see ``fetch_page``), so only ``page_size`` rows ever leave
+    MySQL and reach the browser. With a ``reads`` batch the page is fetched
+    concurrently with the page's other reads and rendered when it completes.
+    A ``selectable`` grid (never deferred) gets a checkbox per row and
+    returns the ``key`` values of the checked rows on this page.
+    """
+    filters = filters or {}
+    sortable = sortable or [key]
+    state = st.session_state.setdefault(f"grid_{grid_id}", {"cursors": [None], "spec": None})
+
+    with st.expander("🔍 Filter & Sort"):
+        filter_values = {}
+        if filters:
+            cols = st.columns(len(filters))
+            for col, (name, op) in zip(cols, filters.items()):
+                label = name if op == "prefix" else f"{name} {op}"
+                with col:
+                    raw = st.text_input(label, key=f"{grid_id}_f_{name}").strip()
+                if not raw:
+                    continue
+                if op in ("prefix", "="):
+                    filter_values[name] = (op, raw)
+                else:
+                    try:
+                        filter_values[name] = (op, float(raw))
+                    except ValueError:
+                        st.warning(f"⚠️ '{raw}' is not a number; ignoring the {name} filter.")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            sort = st.selectbox("Sort by", sortable, key=f"{grid_id}_sort")
+        with col2:
+            descending = st.checkbox("Descending", value=descending, key=f"{grid_id}_desc")
+
+    spec = (tuple(sorted(filter_values.items())), sort, descending, where, tuple(params or ()))
+    if state["spec"] != spec:
+        state["spec"] = spec
+        state["cursors"] = [None]
+    cursors = state["cursors"]
+
+    args = (source, columns, key)
+    options = dict(sort=sort, descending=descending, filters=filter_values,
+                   where=where, params=params, after=cursors[-1], limit=page_size)
+    if reads is None:
+        return grid_page(grid_id, cursors, fetch_page(*args, **options), key if selectable else None)
+    else:
+        deferred(reads, grid_id, fetch_page, *args, **options,
+                 render=lambda page: grid_page(grid_id, cursors, page))
+
+
+def grid_page(grid_id, cursors, page, select_key=None):
+    rows, next_cursor = page
+    selected = []
+    if rows and select_key:
+        selected = grid_selection(grid_id, len(cursors), rows, select_key)
+    elif rows:
+        st.dataframe(rows, use_container_width=True)
+    else:
+        st.info("ℹ️ No matching rows.")
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Previous", disabled=len(cursors) == 1, key=f"{grid_id}_prev"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)} · {len(rows)} rows")
+    with col3:
+        if st.button("Next ➡️", disabled=next_cursor is None, key=f"{grid_id}_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+    return selected
+
+
+def grid_selection(grid_id, page_no, rows, key):
+    """The rows with a checkbox each; returns the ``key`` values of the checked ones."""
+    everything = st.checkbox("Select all on this page", key=f"{grid_id}_all")
+    edited = st.data_editor(
+        [{"select": everything, **row} for row in rows],
+        column_config={"select": st.column_config.CheckboxColumn("✓", default=False)},
+        disabled=list(rows[0]), hide_index=True, use_container_width=True,
+        # A new page, or toggling "select all", starts from fresh checkboxes.
+        key=f"{grid_id}_sel_{page_no}_{everything}",
+    )
+    return [row[key] for row in edited if row["select"]]
+
+# ---------- Search ----------
+def match_label(kind, match):
+    if kind == "account":
+        return (f"{match['accno']} · {match['name'] or '—'} ({match['cif']}) · "
+                f"{match['accttype']} · ₹{float(match['balance']):,.2f}")
+    return f"{match['cif']} · {match['name']} · {match['contact_no'] or '—'}"
+
+
+def search_picker(picker_id, label, kind="account"):
+    """Typeahead lookup of an account or (``kind="customer"``) a customer; returns its accno/CIF, or None.
+
+    Matches CIF, account number, name, contact and ID number prefixes (see
+    search.py). Place it outside forms: widgets inside a form do not rerun
+    the page. The text box only submits on Enter or when it loses focus,
+    and terms shorter than ``search.MIN_CHARS`` are not searched, so a
+    search runs per finished term rather than per keystroke; reruns with
+    the same term are served from search.py's result cache.
+    """
+    hint = "CIF, account no, name, phone or ID no" if kind == "account" else "CIF, name, phone or ID no"
+    term = st.text_input(f"🔍 {label}", key=f"{picker_id}_q", placeholder=hint).strip()
+    if len(term) < search.MIN_CHARS:
+        return None
+    matches = search.accounts(term) if kind == "account" else search.customers(term)
+    if not matches:
+        st.caption("No matches.")
+        return None
+    key = "accno" if kind == "account" else "cif"
+    labels = {m[key]: match_label(kind, m) for m in matches}
+    return st.selectbox(label, list(labels), format_func=labels.get, key=f"{picker_id}_pick")
+
+
+# ---------- Statements ----------
+def statement_export_section(accnos=None):
+    """Date-range statement download; ``accnos`` limits the choice to a customer's own accounts."""
+    st.markdown("---")
+    st.subheader("🧾 Account Statement")
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+    with col1:
+        if accnos:
+            accno = st.selectbox("Account", accnos, key="stmt_acc")
+        else:
+            accno = search_picker("stmt_acc", "Account")
+    today = datetime.now().date()
+    with col2:
+        start = st.date_input("From", value=today.replace(day=1), max_value=today, key="stmt_from")
+    with col3:
+        end = st.date_input("To", value=today, max_value=today, key="stmt_to")
+    with col4:
+        fmt = st.selectbox("Format", statements.available_formats(), key="stmt_fmt")
+
+    if not st.button("📄 Prepare Statement"):
+        return
+    if not accno or not statements.account_exists(accno):
+        st.error("❌ Account not found.")
+        return
+    # Rows are streamed from MySQL straight into a temp file on disk; only
+    # the finished file's bytes are handed to the download button.
+    with tempfile.TemporaryFile() as spool:
+        try:
+            if fmt == "parquet":
+                statement = statements.export(accno, start, end, fmt, spool)
+            else:
+                text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+                statement = statements.export(accno, start, end, fmt, text)
+                text.flush()
+                text.detach()
+        except (ValueError, RuntimeError, Error) as e:
+            st.error(f"❌ {e}")
+            return
+        spool.seek(0)
+        data = spool.read()
+    mime, ext = statements.FORMATS[fmt]
+    st.success(f"✅ {statement.rows:,} entries · opening ₹{statement.opening:,.2f} · closing ₹{statement.closing:,.2f}")
+    st.download_button("⬇️ Download", data=data, file_name=f"statement_{accno}_{start}_{end}.{ext}", mime=mime)